@@ -0,0 +1,54 @@
+import argparse
+import json
+import time
+from db.db import init_db
+from utils.job_queue import JobQueue, PRIORITY_BATCH, WORKER_COUNT
+from utils.model_routing import TIERS, normalize_tier
+
+
+def load_batch_file(path, tier=None):
+    """
+    Load batch generation requests from a JSON file
+
+    The file must contain a list of objects with the same fields as the GUI
+    form: company_name, job_offer, language, city, country_code, and
+    optionally adaptation_mode, tier, profile (an inputs/ folder) and
+    profile_tag. Entries without a tier get the given
+    tier (the default tier when None).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        requests = json.load(f)
+
+    if not isinstance(requests, list):
+        raise ValueError("Batch file must contain a JSON list of generation requests")
+
+    for index, form_data in enumerate(requests):
+        if not form_data.get('company_name') or not form_data.get('job_offer'):
+            raise ValueError(f"Batch entry {index} needs a company_name and a job_offer")
+        form_data['tier'] = normalize_tier(form_data.get('tier') or tier)
+    return requests
+
+
+def run_batch(path, workers=WORKER_COUNT, tier=None):
+    """Queue every request of a batch file as background jobs and wait for them"""
+    init_db()
+    requests = load_batch_file(path, tier)
+
+    job_queue = JobQueue(workers=workers, restore=False).start()
+    jobs = [job_queue.submit(form_data, priority=PRIORITY_BATCH) for form_data in requests]
+
+    while not all(job.finished for job in jobs):
+        time.sleep(0.5)
+    job_queue.shutdown()
+
+    for job in jobs:
+        print(f"• Job {job.id} ({job.form_data['company_name']}): {job.status} - {job.result.get('message', '')}")
+    return jobs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the resumes of a batch file")
+    parser.add_argument("path", help="JSON list of generation requests")
+    parser.add_argument("--tier", choices=TIERS, help="Tier for the entries that do not choose one")
+    args = parser.parse_args()
+    run_batch(args.path, tier=args.tier)
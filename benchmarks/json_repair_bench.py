@@ -0,0 +1,96 @@
+"""
+Benchmark of the tolerant JSON extractor on a corpus of bad LLM responses
+
+The corpus (json_repair_corpus.jsonl) is synthetic: a valid adaptation
+response mutated by hand into each failure mode seen with the local
+models (fences, prose around the JSON, the "])]" of the prompt skeleton,
+truncation at max_tokens, ...). generations.db only records whether a
+parse succeeded, not the raw responses, so there is no real sample to
+seed it from. Add real failures to the file as one JSON line each.
+
+Usage: python benchmarks/json_repair_bench.py
+   or: python -m benchmarks.json_repair_bench
+"""
+import json
+import os
+import sys
+import time
+
+if not __package__:
+    # Run as a script: make the repository root importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processors.json_repair import repair_json
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "json_repair_corpus.jsonl")
+REPEATS = 200
+
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def legacy_parse(response_text):
+    """The find('{') / rfind('}') extraction used before the repair engine"""
+    cleaned = response_text.strip()
+    if cleaned.startswith('```json'):
+        cleaned = cleaned[7:]
+    elif cleaned.startswith('```'):
+        cleaned = cleaned[3:]
+    if cleaned.endswith('```'):
+        cleaned = cleaned[:-3]
+    cleaned = cleaned.strip()
+    start, end = cleaned.find('{'), cleaned.rfind('}')
+    if start != -1 and end != -1:
+        cleaned = cleaned[start:end + 1]
+    try:
+        parsed = json.loads(cleaned)
+    except ValueError:
+        return None
+    if not isinstance(parsed, dict) or ('work' not in parsed and 'skills' not in parsed):
+        return None
+    return parsed
+
+
+def _time_per_call(function, argument, repeats=REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function(argument)
+    return (time.perf_counter() - start) / repeats
+
+
+def run_corpus():
+    corpus = load_corpus()
+    legacy_ok = repaired_ok = 0
+
+    print(f"{'response':<32} {'legacy':>7} {'repair':>7} {'µs':>8}  repairs")
+    for entry in corpus:
+        response = entry['response']
+        legacy = legacy_parse(response) is not None
+        result = repair_json(response)
+        micros = _time_per_call(repair_json, response) * 1e6
+        legacy_ok += legacy
+        repaired_ok += result.success
+        print(f"{entry['name']:<32} {'ok' if legacy else '-':>7} {'ok' if result.success else '-':>7} "
+              f"{micros:8.0f}  {', '.join(result.repairs)}")
+
+    print(f"\nRecovered: legacy {legacy_ok}/{len(corpus)}, repair engine {repaired_ok}/{len(corpus)}")
+
+
+def run_scaling():
+    """Time per KB must stay flat as the response grows (linear time)"""
+    job = {"title": "Engineer", "company": "ACME", "startDate": "2020-01", "endDate": "present",
+           "summary": ["Built things", "Fixed things", "Shipped things"]}
+    print(f"\n{'jobs':>6} {'KB':>8} {'ms':>8} {'µs/KB':>8}")
+    for jobs in (10, 100, 1000):
+        # Truncated, comma-damaged output so the whole repair path runs
+        text = json.dumps({"work": [job] * jobs, "skills": []}).replace('"]}', '",]}')[:-40]
+        seconds = _time_per_call(repair_json, text, repeats=5)
+        kilobytes = len(text) / 1024
+        print(f"{jobs:>6} {kilobytes:8.1f} {seconds * 1000:8.2f} {seconds * 1e6 / kilobytes:8.1f}")
+
+
+if __name__ == "__main__":
+    run_corpus()
+    run_scaling()
@@ -0,0 +1,76 @@
+"""
+Benchmark of the single-walk resume renderer on synthetic resumes
+
+Times one render_resume walk feeding only the text writer and one feeding
+the text, HTML and Markdown writers together. Time per entry must stay flat
+as the resume grows (linear time).
+
+Usage: python benchmarks/resume_renderer_bench.py
+   or: python -m benchmarks.resume_renderer_bench
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+if not __package__:
+    # Run as a script: make the repository root importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generators.resume_renderer import HtmlWriter, MarkdownWriter, TextWriter, render_resume
+
+SIZES = (10, 100, 1000)
+REPEATS = 20
+
+
+def synthetic_resume(entries):
+    """Resume with `entries` jobs, skill categories, projects and education entries"""
+    return {
+        'name': "Ana Lopez",
+        'label': "Backend Engineer",
+        'contactInfo': {'email': "ana@example.com", 'phone': "+34 600 000 000",
+                        'location': {'city': "Madrid", 'countryCode': "ES"}},
+        'profiles': [{'linkedIn': "https://linkedin.com/in/ana", 'github': "https://github.com/ana"}],
+        'summary': "Backend engineer with experience in distributed systems.",
+        'work': [{'title': f"Engineer {index}", 'company': f"Company {index}", 'startDate': "2020-01",
+                  'endDate': "2021-01", 'summary': [f"Shipped feature {index}.{point}" for point in range(4)]}
+                 for index in range(entries)],
+        'skills': [{'category': f"Category {index}", 'items': [f"skill-{index}-{item}" for item in range(6)]}
+                   for index in range(entries)],
+        'projects': [{'name': f"Project {index}", 'description': "Side project", 'link': "https://example.com"}
+                     for index in range(entries)],
+        'education': [{'studyType': "BSc", 'course': f"Course {index}", 'institution': "UCM",
+                       'startDate': "2010", 'endDate': "2014"} for index in range(entries)],
+    }
+
+
+def text_only(resume_data):
+    return render_resume(resume_data, [TextWriter()])
+
+
+def single_walk(resume_data):
+    return render_resume(resume_data, [TextWriter(), HtmlWriter(), MarkdownWriter()])
+
+
+def _time_per_call(function, argument, repeats=REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function(argument)
+    return (time.perf_counter() - start) / repeats
+
+
+def run_scaling():
+    print(f"{'entries':>8} {'text ms':>10} {'all ms':>10} {'text µs/entry':>14} {'all µs/entry':>13}")
+    for entries in SIZES:
+        resume_data = synthetic_resume(entries)
+        # The HTML writer logs every job; keep the table readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            text = _time_per_call(text_only, resume_data)
+            walk = _time_per_call(single_walk, resume_data)
+        print(f"{entries:>8} {text * 1000:10.2f} {walk * 1000:10.2f} "
+              f"{text * 1e6 / entries:14.1f} {walk * 1e6 / entries:13.1f}")
+
+
+if __name__ == "__main__":
+    run_scaling()
@@ -1,10 +1,13 @@
 # db.py
 
+import json
 import sqlite3
 
+DB_PATH = "generations.db"
+
 
 def init_db():
-    conn = sqlite3.connect("generations.db")
+    conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
     c.execute("""
         CREATE TABLE IF NOT EXISTS generations (
@@ -17,12 +20,81 @@ def init_db():
             city TEXT
         )
     """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created TEXT,
+            updated TEXT,
+            priority INTEGER,
+            status TEXT,
+            form_data TEXT,
+            result TEXT
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS adaptation_parses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT,
+            language TEXT,
+            structured_output INTEGER,
+            success INTEGER
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS llm_calls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT,
+            stage TEXT,
+            language TEXT,
+            tier TEXT,
+            model TEXT,
+            endpoint TEXT,
+            prompt_tokens INTEGER,
+            completion_tokens INTEGER,
+            usage_source TEXT,
+            ttft_ms REAL,
+            latency_ms REAL,
+            tokens_per_second REAL
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS adaptation_candidates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT,
+            company TEXT,
+            language TEXT,
+            candidate_index INTEGER,
+            chosen INTEGER,
+            valid INTEGER,
+            errors INTEGER,
+            keyword_coverage REAL,
+            bullet_ratio REAL,
+            score REAL
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS offer_digests (
+            offer_hash TEXT PRIMARY KEY,
+            created TEXT,
+            chunks INTEGER,
+            digest TEXT
+        )
+    """)
+    _add_column_if_missing(c, "llm_calls", "endpoint", "TEXT")
+    _add_column_if_missing(c, "llm_calls", "tier", "TEXT")
     conn.commit()
     conn.close()
 
 
+def _add_column_if_missing(c, table, column, column_type):
+    """Migrate databases created before a column was added"""
+    columns = [row[1] for row in c.execute(f"PRAGMA table_info({table})")]
+    if column not in columns:
+        c.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+
 def save_generation(company, job_offer, language, country, city):
-    conn = sqlite3.connect("generations.db")
+    conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
     c.execute("""
         INSERT INTO generations (timestamp, company, job_offer, language, country, city)
@@ -30,3 +102,151 @@ def save_generation(company, job_offer, language, country, city):
     """, (company, job_offer, language, country, city))
     conn.commit()
     conn.close()
+
+
+def save_job(form_data, priority, status):
+    """Persist a new queued job and return its id"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("""
+        INSERT INTO jobs (created, updated, priority, status, form_data)
+        VALUES (datetime('now'), datetime('now'), ?, ?, ?)
+    """, (priority, status, json.dumps(form_data, ensure_ascii=False)))
+    job_id = c.lastrowid
+    conn.commit()
+    conn.close()
+    return job_id
+
+
+def update_job(job_id, status, result=None):
+    """Update the status (and optionally the result) of a job"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    if result is None:
+        c.execute("""
+            UPDATE jobs SET status = ?, updated = datetime('now') WHERE id = ?
+        """, (status, job_id))
+    else:
+        c.execute("""
+            UPDATE jobs SET status = ?, result = ?, updated = datetime('now') WHERE id = ?
+        """, (status, json.dumps(result, ensure_ascii=False), job_id))
+    conn.commit()
+    conn.close()
+
+
+def load_jobs(statuses):
+    """Load the jobs with any of the given statuses, oldest first"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    placeholders = ", ".join("?" for _ in statuses)
+    c.execute(f"""
+        SELECT id, priority, status, form_data FROM jobs
+        WHERE status IN ({placeholders}) ORDER BY id
+    """, tuple(statuses))
+    rows = c.fetchall()
+    conn.close()
+    return [
+        {'id': row[0], 'priority': row[1], 'status': row[2], 'form_data': json.loads(row[3])}
+        for row in rows
+    ]
+
+
+def save_parse_result(language, structured_output, success):
+    """Record whether the adaptation response could be parsed"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("""
+        INSERT INTO adaptation_parses (timestamp, language, structured_output, success)
+        VALUES (datetime('now'), ?, ?, ?)
+    """, (language, int(structured_output), int(success)))
+    conn.commit()
+    conn.close()
+
+
+def load_parse_failure_rates():
+    """Parse attempts, failures and failure rate with and without structured output"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("""
+        SELECT structured_output, COUNT(*), SUM(1 - success)
+        FROM adaptation_parses GROUP BY structured_output ORDER BY structured_output
+    """)
+    rows = c.fetchall()
+    conn.close()
+    return [
+        {'structured_output': bool(row[0]), 'attempts': row[1], 'failures': row[2],
+         'failure_rate': row[2] / row[1] if row[1] else 0.0}
+        for row in rows
+    ]
+
+
+def save_llm_call(stage, language, tier, model, endpoint, prompt_tokens, completion_tokens, usage_source,
+                  ttft_ms, latency_ms, tokens_per_second):
+    """Record token usage and timing of one LLM call"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("""
+        INSERT INTO llm_calls (timestamp, stage, language, tier, model, endpoint, prompt_tokens,
+                               completion_tokens, usage_source, ttft_ms, latency_ms, tokens_per_second)
+        VALUES (datetime('now'), ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (stage, language, tier, model, endpoint, prompt_tokens, completion_tokens, usage_source,
+          ttft_ms, latency_ms, tokens_per_second))
+    conn.commit()
+    conn.close()
+
+
+def load_llm_call_stats(days=30):
+    """Daily averages of the LLM calls of the last days, per tier, model and stage"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("""
+        SELECT date(timestamp), tier, model, stage, COUNT(*), AVG(prompt_tokens), AVG(completion_tokens),
+               AVG(ttft_ms), AVG(latency_ms), AVG(tokens_per_second)
+        FROM llm_calls WHERE timestamp >= datetime('now', ?)
+        GROUP BY date(timestamp), tier, model, stage ORDER BY date(timestamp), tier, model, stage
+    """, (f"-{int(days)} days",))
+    rows = c.fetchall()
+    conn.close()
+    return [
+        {'day': row[0], 'tier': row[1], 'model': row[2], 'stage': row[3], 'calls': row[4],
+         'prompt_tokens': row[5], 'completion_tokens': row[6], 'ttft_ms': row[7],
+         'latency_ms': row[8], 'tokens_per_second': row[9]}
+        for row in rows
+    ]
+
+
+def save_candidate_scores(company, language, candidates, chosen_index):
+    """Record the local scores of the sampled adaptation candidates (dicts from Candidate.to_dict)"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.executemany("""
+        INSERT INTO adaptation_candidates (timestamp, company, language, candidate_index, chosen, valid,
+                                           errors, keyword_coverage, bullet_ratio, score)
+        VALUES (datetime('now'), ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(company, language, candidate['index'], int(candidate['index'] == chosen_index),
+           int(candidate['valid']), candidate['errors'], candidate['keyword_coverage'],
+           candidate['bullet_ratio'], candidate['score']) for candidate in candidates])
+    conn.commit()
+    conn.close()
+
+
+def load_offer_digest(offer_hash):
+    """Return the cached requirements digest of a job offer, or None"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("SELECT digest FROM offer_digests WHERE offer_hash = ?", (offer_hash,))
+    row = c.fetchone()
+    conn.close()
+    return row[0] if row else None
+
+
+def save_offer_digest(offer_hash, chunks, digest):
+    """Cache the requirements digest of a job offer"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("""
+        INSERT OR REPLACE INTO offer_digests (offer_hash, created, chunks, digest)
+        VALUES (?, datetime('now'), ?, ?)
+    """, (offer_hash, chunks, digest))
+    conn.commit()
+    conn.close()
@@ -0,0 +1,53 @@
+import argparse
+from db.db import init_db, load_llm_call_stats, load_parse_failure_rates
+
+
+def print_parse_report():
+    """Print the adaptation parse-failure rate with and without structured output"""
+    rows = load_parse_failure_rates()
+    print("📊 Adaptation JSON parse failures")
+    if not rows:
+        print("   No adaptation calls recorded yet")
+        return
+
+    for row in rows:
+        mode = "JSON schema" if row['structured_output'] else "free text"
+        print(f"   {mode:<12} {row['failures']:>5} / {row['attempts']:<5} failed ({row['failure_rate']:.1%})")
+
+
+def _format_number(value, pattern):
+    return format(value, pattern) if value is not None else "-"
+
+
+def print_llm_call_report(days=30):
+    """Print daily token usage and throughput per tier, model and stage"""
+    rows = load_llm_call_stats(days)
+    print(f"📊 LLM calls over the last {days} days (averages per call)")
+    if not rows:
+        print("   No LLM calls recorded yet")
+        return
+
+    print(f"   {'day':<10} {'tier':<8} {'model':<24} {'stage':<18} {'calls':>5} {'prompt':>7} {'output':>7} "
+          f"{'ttft ms':>8} {'total ms':>9} {'tok/s':>6}")
+    for row in rows:
+        print(f"   {row['day']:<10} {row['tier'] or '-':<8} {row['model']:<24} {row['stage']:<18} {row['calls']:>5} "
+              f"{_format_number(row['prompt_tokens'], '>7.0f')} "
+              f"{_format_number(row['completion_tokens'], '>7.0f')} "
+              f"{_format_number(row['ttft_ms'], '>8.0f')} "
+              f"{_format_number(row['latency_ms'], '>9.0f')} "
+              f"{_format_number(row['tokens_per_second'], '>6.1f')}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reports over generations.db")
+    parser.add_argument("--days", type=int, default=30, help="Days of LLM call history to show")
+    args = parser.parse_args(argv)
+
+    init_db()
+    print_parse_report()
+    print()
+    print_llm_call_report(args.days)
+
+
+if __name__ == "__main__":
+    main()
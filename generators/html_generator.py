@@ -1,9 +1,26 @@
+import hashlib
 import os
 import json
-from utils.file_operations import load_text
+import threading
+from collections.abc import Mapping
+from generators.resume_renderer import HtmlWriter, render_resume
+from processors.resume_model import thaw
+from utils.file_operations import load_template
+from utils.i18n import DEFAULT_LANGUAGE, translate, translate_titles
 
+RESUME_TEMPLATE_PATH = "templates/resume_model.html"
 
-def generate_html_resume(adapted_resume_data, company_name, language, country_code, city, adapt_data):
+# Resume fields rendered in the static sections, identical for every offer
+STATIC_FIELDS = ('name', 'contactInfo', 'profiles', 'projects', 'education')
+MAX_STATIC_SECTIONS = 64
+
+# (profile hash, language, template mtime) -> template with the static sections filled in
+_static_sections_cache = {}
+_static_sections_lock = threading.Lock()
+
+
+def generate_html_resume(adapted_resume_data, company_name, language, country_code, city, profile_hash=None,
+                         fragments=None):
     """
     Generate HTML resume using the template and adapted data
 
@@ -11,35 +28,17 @@ def generate_html_resume(adapted_resume_data, company_name, language, country_co
         adapted_resume_data (dict): Complete resume data with adapted work/skills
         company_name (str): Company name for filename
         language (str): Language for filename
+        profile_hash (str, optional): Content hash of the profile's resume.json,
+            the cache key of its static sections (computed from the data when omitted)
+        fragments (dict, optional): HtmlWriter output of the resume, when it was
+            rendered in the same walk as the other formats
 
     Returns:
         str: Path to generated HTML file
     """
     try:
-        # Load HTML template
-        template_path = "templates/resume_model.html"
-        html_template = load_text(template_path)
-
-        # Generate each section
-        profiles_html = _generate_profiles_html(adapted_resume_data)
-        work_html = _generate_work_html(adapted_resume_data, adapt_data)  # To fix any error by AI.
-        skills_html = _generate_skills_html(adapted_resume_data)
-        projects_html = _generate_projects_html(adapted_resume_data)
-        education_html = _generate_education_html(adapted_resume_data)
-
-        # Replace content in template
-        html_content = _replace_template_content(
-            html_template,
-            adapted_resume_data,
-            profiles_html,
-            work_html,
-            skills_html,
-            projects_html,
-            education_html,
-            language,
-            country_code,
-            city
-        )
+        html_content = render_resume_html(adapted_resume_data, language, country_code, city, profile_hash,
+                                          fragments)
 
         # Save HTML file
         html_filename = _save_html_file(html_content, company_name, language)
@@ -50,328 +49,83 @@ def generate_html_resume(adapted_resume_data, company_name, language, country_co
         return None
 
 
-def _generate_profiles_html(resume_data):
-    """Generate HTML for profiles section"""
-    profiles_html = ""
-    if 'profiles' in resume_data and resume_data['profiles']:
-        for profile in resume_data['profiles']:
-            for key, value in profile.items():
-                if value and key.lower() in ['linkedin', 'github', 'portfolio', 'substack', 'codepen']:
-                    icon_map = {
-                        'linkedin': '💼', 'github': '🐱', 'portfolio': '💻',
-                        'substack': '🗞️', 'codepen': '🎨'
-                    }
-                    icon = icon_map.get(key.lower(), '🔗')
-                    profiles_html += f'''
-                    print(f"👀 Generating profile link for {key}: {value}")
-                <a href="{value}" class="profile-link" data-type="{key.lower()}">
-                    <span>{icon}</span> {key.capitalize()}
-                </a>'''
-    return profiles_html
-
-
-def _generate_work_html(resume_data, adapt_data):
-    """Generate HTML for work experience with consolidation"""
-    work_html = ""
-    if 'work' in resume_data and resume_data['work']:
-        # Consolidate duplicate jobs
-        consolidated_jobs = _consolidate_work_experience(resume_data['work'])
-
-        # Generate HTML for each job
-        for job in consolidated_jobs.values():
-            date_range = _format_date_range(job)  # , adapt_data)
-            summary_html = _format_summary_list(job.get('summary', []))
-
-            work_html += f'''
-                <div class="work-item item">
-                    <div class="work-title titleText">{job.get('title', '')}</div>
-                    <div class="work-company separatedText">
-                        <span class="company-name">{job.get('company', '')}</span>
-                        <span class="company-range">{date_range}</span>
-                    </div>
-                    <ul class="regularText work-summary">
-                        {summary_html}
-                    </ul>
-                </div>'''
-
-            print(f"💼 Generating work experience: {job.get('title', '')} at {job.get('company', '')}")
-    return work_html
-
-
-def _consolidate_work_experience(work_list):
-    """Consolidate jobs with same title and company"""
-    consolidated_jobs = {}
-
-    for job in work_list:
-        job_key = f"{job.get('title', '')}__{job.get('company', '')}"
-
-        if job_key in consolidated_jobs:
-            # Merge summaries
-            existing_summary = consolidated_jobs[job_key].get('summary', [])
-            new_summary = job.get('summary', [])
-            for item in new_summary:
-                if item not in existing_summary:
-                    existing_summary.append(item)
-            consolidated_jobs[job_key]['summary'] = existing_summary
-
-            # Update date range
-            _update_date_range(consolidated_jobs[job_key], job)
-        else:
-            consolidated_jobs[job_key] = job.copy()
-
-    return consolidated_jobs
-
-
-def _generate_skills_html(resume_data):
-    """Generate HTML for skills section, filtering empty categories"""
-    skills_html = ""
-    if 'skills' in resume_data and resume_data['skills']:
-        skills_list_items = []
-
-        for skill_category in resume_data['skills']:
-            if 'category' in skill_category and 'items' in skill_category:
-                items = skill_category['items']
-                if items and len(items) > 0:
-                    # Filter out empty items
-                    filtered_items = [item.strip() for item in items if item and item.strip()]
-
-                    if filtered_items:
-                        skills_items = ' | '.join([f'<span class="keyword">{skill}</span>' for skill in filtered_items])
-                        skills_list_items.append(f'''
-                    <li class="skill-item">
-                        <div class="skill-name allInLine boldText">{skill_category['category']}:</div>
-                        <div class="skill-keywords allInLine regularText">
-                            {skills_items}
-                        </div>
-                    </li>''')
-
-        if skills_list_items:
-            skills_html = '<ul class="skills-list">' + ''.join(skills_list_items) + '</ul>'
-
-    return skills_html
-
-
-def _generate_projects_html(resume_data):
-    """Generate HTML for projects section"""
-    projects_html = ""
-    if 'projects' in resume_data and resume_data['projects']:
-        for project in resume_data['projects']:
-            project_link = ""
-            if 'link' in project and project['link']:
-                project_link = f'<a class="project-link" href="{project["link"]}">View Project →</a>'
-
-            projects_html += f'''
-                <div class="project-item item">
-                    <div class="project-name boldText">{project.get('name', '')}:
-                        {project_link}
-                    </div>
-                    <p class="project-description regularText">• {project.get('description', '')}</p>
-                </div>'''
-    return projects_html
-
-
-def _generate_education_html(resume_data):
-    """Generate HTML for education section"""
-    education_html = ""
-    if 'education' in resume_data and resume_data['education']:
-        for edu in resume_data['education']:
-            location = edu.get('location', {})
-            location_str = ""
-            if isinstance(location, dict):
-                location_str = f"{location.get('city', '')}, {location.get('countryCode', '')}"
-            else:
-                location_str = str(location)
-
-            education_html += f'''
-                <div class="education-item item">
-                    <div class="studyType boldText allInLine">{edu.get('studyType', '')}</div><span> | </span>
-                    <div class="work-title boldText allInLine">{edu.get('course', '')}</div><span> | </span>
-                    <div class="education-institution regularText allInLine">{edu.get('institution', '')}</div><span> | </span>
-                    <div class="date-range regularText allInLine">{edu.get('startDate', '')} - {edu.get('endDate', '')}</div><span> | </span>
-                    <div class="location regularText allInLine">{location_str}</div>
-                </div>'''
-    return education_html
-
-
-def _format_date_range(job):   # , adapt_data = None
-    """Format date range for a job"""
-
-    if 'startDate' in job and 'endDate' in job:
-
-        # Disabled to maintain original dates always
-        # if job['startDate'] or job['endDate'] == "Null" or "None":
-        # if adapt_data and 'work' in adapt_data:
-        #     for adapt_job in adapt_data['work']:
-        #         if adapt_job.get('title') == job.get('title') and adapt_job.get('company') == job.get('company'):
-        #             return f"{adapt_job['startDate']} - {adapt_job['endDate']}"
-
-        return f"{job['startDate']} - {job['endDate']}"
-
-    elif 'dates' in job:
-        return job['dates']
-    return ""
-
-
-def _format_summary_list(summary_items):
-    """Format summary items as HTML list"""
-    return "".join([f"<li>{item}</li>" for item in summary_items])
-
-
-def _update_date_range(existing_job, new_job):
-    """Update date range when consolidating jobs"""
-    existing_start = existing_job.get('startDate', '')
-    existing_end = existing_job.get('endDate', '')
-    new_start = new_job.get('startDate', '')
-    new_end = new_job.get('endDate', '')
-
-    if new_start and (not existing_start or new_start < existing_start):
-        existing_job['startDate'] = new_start
-    if new_end and (not existing_end or new_end > existing_end):
-        existing_job['endDate'] = new_end
-
-
-
-
-def _replace_template_content(
-                              html_template, resume_data, profiles_html,
-                              work_html, skills_html, projects_html,
-                              education_html, language, country_code,
-                              city):
-    """Replace all content in the HTML template"""
-    html_content = html_template
+def render_resume_html(adapted_resume_data, language, country_code, city, profile_hash=None, fragments=None):
+    """
+    Render the resume HTML
 
-    # Basic information
-    html_content = html_content.replace('John Doe', resume_data.get('name', 'John Doe'))
-    html_content = html_content.replace('john.doe@example.com', resume_data.get('contactInfo', {}).get('email', ''))
-    html_content = html_content.replace('+1 (555) 123-4567', resume_data.get('contactInfo', {}).get('phone', ''))
+    Only the work and skills sections and the location are rendered per
+    request; the header, profiles, projects and education come from the
+    cached static sections of the profile and language. The work and skills
+    fragments are taken from fragments when the caller already rendered them.
+    """
+    html_content = _static_sections(adapted_resume_data, language, profile_hash)
 
     # Location
-    location_info = resume_data.get('contactInfo', {}).get('location', {})
-
+    location_info = adapted_resume_data.get('contactInfo', {}).get('location', {})
     if country_code and city:
         location_text = f"{city}, {country_code}"
-    elif isinstance(location_info, dict):
+    elif isinstance(location_info, Mapping):
         location_text = f"{location_info.get('city', '')}, {location_info.get('countryCode', '')}"
     else:
         location_text = str(location_info)
     html_content = html_content.replace('San Francisco, CA', location_text)
 
-    # Replace sections
-    html_content = _replace_section(html_content, 'profiles', profiles_html)
-    html_content = _replace_section(html_content, 'work', work_html)
-    if language != 'English':
-        html_content = _translate_titles(html_content, language)
-        print("💱 Titles translated to: ", language)
+    if fragments is None:
+        fragments = _render_sections(adapted_resume_data, ('work', 'skills'))
+    html_content = _replace_section(html_content, 'work', fragments['work'])
 
-    if skills_html:
-        html_content = _replace_section(html_content, 'skills', skills_html, 'skills-grid')
+    if fragments['skills']:
+        html_content = _replace_section(html_content, 'skills', fragments['skills'], 'skills-grid')
     else:
-        html_content = _remove_skills_section(html_content)
+        html_content = _remove_skills_section(html_content, language)
+    return html_content
 
-    if projects_html:
-        html_content = _replace_section(html_content, 'projects', projects_html)
 
-    if education_html:
-        html_content = _replace_section(html_content, 'education', education_html)
+def static_sections_hash(resume_data):
+    """Content hash of the resume fields rendered in the static sections"""
+    static_data = {field: thaw(resume_data.get(field)) for field in STATIC_FIELDS}
+    return hashlib.sha256(json.dumps(static_data, sort_keys=True).encode("utf-8")).hexdigest()
 
-    return html_content
 
+def _static_sections(resume_data, language, profile_hash=None):
+    """Template with the header, profiles, projects, education and titles filled in, cached per profile"""
+    mtime = os.path.getmtime(RESUME_TEMPLATE_PATH)
+    key = (profile_hash or static_sections_hash(resume_data), language, mtime)
+    with _static_sections_lock:
+        cached = _static_sections_cache.get(key)
+    if cached is not None:
+        return cached
 
-def language_dictionary(word, language):
-    """Return the necessary word translations for the resume"""
-
-    translations = {
-        'Work Experience': {
-            'English': 'Work Experience',
-            'Spanish': 'Experencia Laboral',
-            'German': 'Berufserfahrung'
-        },
-        'Technical Skills': {
-            'English': 'Technical Skills',
-            'Spanish': 'Habilidades Técnicas',
-            'German': 'Technische Fähigkeiten'
-        },
-        'Projects': {
-            'English': 'Projects',
-            'Spanish': 'Proyectos',
-            'German': 'Projekte'
-        },
-        'Education': {
-            'English': 'Education',
-            'Spanish': 'Educación',
-            'German': 'Ausbildung'
-        },
-        'Spain': {
-            'English': 'Spain',
-            'Spanish': 'España',
-            'German': 'Spanien'
-        },
-        'Germany': {
-            'English': 'Germany',
-            'Spanish': 'Alemania',
-            'German': 'Deutschland'
-        },
-        'United States': {
-            'English': 'United States',
-            'Spanish': 'Estados Unidos',
-            'German': 'Vereinigte Staaten'
-        },
-        'United Kingdom': {
-            'English': 'United Kingdom',
-            'Spanish': 'Reino Unido',
-            'German': 'Vereinigtes Königreich'
-        },
-        'Canada': {
-            'English': 'Canada',
-            'Spanish': 'Canadá',
-            'German': 'Kanada'
-        },
-        'Australia': {
-            'English': 'Australia',
-            'Spanish': 'Australia',
-            'German': 'Australien'
-        }
-        # Add more translations as needed
-    }
-
-    return translations.get(word, {}).get(language, word)
-
-
-def _translate_titles(html_content, language):
-    """Translate the <h2> section titles based on language"""
-
-    work_title = language_dictionary('Work Experience', language)
-    skills_title = language_dictionary('Technical Skills', language)
-    projects_title = language_dictionary('Projects', language)
-    education_title = language_dictionary('Education', language)
-
-    html_content = html_content.replace('<h2>Work Experience</h2>', f'<h2>{work_title}</h2>')
-    html_content = html_content.replace('<h2>Technical Skills</h2>', f'<h2>{skills_title}</h2>')
-    html_content = html_content.replace('<h2>Projects</h2>', f'<h2>{projects_title}</h2>')
-    html_content = html_content.replace('<h2>Education</h2>', f'<h2>{education_title}</h2>')
-    return html_content
+    html_content = load_template(RESUME_TEMPLATE_PATH)
 
+    # Basic information
+    html_content = html_content.replace('John Doe', resume_data.get('name', 'John Doe'))
+    html_content = html_content.replace('john.doe@example.com', resume_data.get('contactInfo', {}).get('email', ''))
+    html_content = html_content.replace('+1 (555) 123-4567', resume_data.get('contactInfo', {}).get('phone', ''))
 
-def _translate_location(html_content, country_code, city, language):
-    """Translate the location based on country code and city"""
-    if country_code and city:
-        location_text = f"{city}, {country_code}"
-    else:
-        location_text = f"{city}, {language_dictionary(country_code, language)}"
+    fragments = _render_sections(resume_data, ('profiles', 'projects', 'education'))
+    html_content = _replace_section(html_content, 'profiles', fragments['profiles'])
+    if language != DEFAULT_LANGUAGE:
+        html_content = translate_titles(html_content, language)
+        print("💱 Titles translated to: ", language)
 
-    html_content = html_content.replace('San Francisco, CA', location_text)
+    if fragments['projects']:
+        html_content = _replace_section(html_content, 'projects', fragments['projects'])
+
+    if fragments['education']:
+        html_content = _replace_section(html_content, 'education', fragments['education'])
+
+    with _static_sections_lock:
+        if len(_static_sections_cache) >= MAX_STATIC_SECTIONS:
+            # Oldest entry first (dicts keep insertion order)
+            _static_sections_cache.pop(next(iter(_static_sections_cache)))
+        _static_sections_cache[key] = html_content
     return html_content
 
 
-def _change_title_language(html_content, language):
-    """Change the title based on the language"""
-    title_map = {
-        'English': 'Resume',
-        'Spanish': 'Currículum',
-        'German': 'Lebenslauf'
-    }
-    title = title_map.get(language, 'Resume')
-    return html_content.replace('Resume', title)
+def _render_sections(resume_data, sections):
+    """HTML fragments of some template sections, in one walk of the resume"""
+    return render_resume(resume_data, [HtmlWriter()], sections)[0]
 
 
 def _replace_section(html_content, section_id, section_html, section_class=None):
@@ -391,9 +145,11 @@ def _replace_section(html_content, section_id, section_html, section_class=None)
     return html_content
 
 
-def _remove_skills_section(html_content):
+def _remove_skills_section(html_content, language=DEFAULT_LANGUAGE):
     """Remove the entire skills section if no skills to display"""
-    section_start = html_content.find('<section class="section">\n                    <h2>Technical Skills</h2>')
+    # The titles are already translated in the cached static sections
+    title = translate('Technical Skills', language)
+    section_start = html_content.find(f'<section class="section">\n                    <h2>{title}</h2>')
     if section_start != -1:
         section_end = html_content.find('</section>', section_start) + 10
         if section_end != -1:
@@ -1,34 +1,135 @@
 import asyncio
+import atexit
+import threading
+import time
 from pathlib import Path
-from playwright.async_api import async_playwright
+from utils.pdf_cache import PDF_CACHE_ENABLED, fetch_pdf, pdf_cache_key, store_pdf
 
+# Print options of page.pdf(), also part of the PDF cache key
+PDF_OPTIONS = {
+    "format": "A4",
+    "print_background": True,
+    "margin": {"top": "0", "bottom": "0", "left": "0", "right": "0"},
+}
 
-async def html_to_pdf_async(html_path: str, pdf_path: str):
+
+class PdfRenderer:
+    """
+    Chromium kept running between prints
+
+    Playwright objects belong to the event loop that created them, so the
+    renderer owns one loop in a daemon thread and every print is run there.
+    The browser is launched on first use (or by the warm-up) and relaunched
+    if it crashed; each document gets its own page. Closed at exit.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop = None
+        self._playwright = None
+        self._browser = None
+        self._launching = None
+
+    def _run(self, coroutine):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="pdf-renderer", daemon=True).start()
+                atexit.register(self.close)
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    async def _get_browser(self):
+        if self._launching is None:
+            self._launching = asyncio.Lock()
+        async with self._launching:
+            if self._browser is None or not self._browser.is_connected():
+                # Imported here so that launching the GUI does not load Playwright
+                from playwright.async_api import async_playwright
+
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch()
+            return self._browser
+
+    async def _print(self, load, pdf_path=None):
+        browser = await self._get_browser()
+        page = await browser.new_page()
+        try:
+            await load(page)
+            return await page.pdf(path=pdf_path, **PDF_OPTIONS)
+        finally:
+            await page.close()
+
+    def print_file(self, html_path, pdf_path):
+        """Print an HTML file to a PDF file"""
+        url = f"file://{html_path}"
+        self._run(self._print(lambda page: page.goto(url, wait_until="load"), pdf_path))
+
+    def warm_up(self, html_content):
+        """Launch Chromium and print a document in memory to load the binary and fonts"""
+        self._run(self._print(lambda page: page.set_content(html_content, wait_until="load")))
+
+    async def _close(self):
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+        self._browser = self._playwright = None
+
+    def close(self):
+        """Close the browser and stop the renderer loop"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(), loop).result(timeout=10)
+        except Exception as e:
+            print(f"⚠️ Could not close the PDF renderer: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+
+
+_renderer = PdfRenderer()
+
+
+def _print_html(html_path: str, pdf_path: str):
     html_path = Path(html_path).resolve()
     pdf_path = Path(pdf_path).resolve()
 
     if not html_path.exists():
         raise FileNotFoundError(f"HTML file not found: {html_path}")
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
+    _renderer.print_file(html_path, str(pdf_path))
+    print(f"✅ PDF saved to {pdf_path}")
 
-        # Open the HTML file using file:// URL
-        await page.goto(f"file://{html_path}", wait_until="load")
 
-        await page.pdf(
-            path=str(pdf_path),
-            format="A4",
-            print_background=True,
-            margin={"top": "0", "bottom": "0", "left": "0", "right": "0"},
+def html_to_pdf(html_path: str, pdf_path: str):
+    """
+    Print an HTML file to PDF, reusing the PDF of an identical HTML
 
-        )
-        # margin={"top": "20mm", "bottom": "20mm", "left": "15mm", "right": "15mm"},
+    The PDF cache (utils/pdf_cache.py) is keyed by the HTML bytes and
+    PDF_OPTIONS; on a hit the cached PDF is hard-linked (or copied) to
+    pdf_path and Chromium is not used. Misses are printed by the shared
+    Chromium of PdfRenderer.
+    """
+    if not PDF_CACHE_ENABLED:
+        _print_html(html_path, pdf_path)
+        return
 
-        await browser.close()
-        print(f"✅ PDF saved to {pdf_path}")
+    start = time.perf_counter()
+    with open(html_path, "rb") as f:
+        key = pdf_cache_key(f.read(), PDF_OPTIONS)
+    if fetch_pdf(key, pdf_path):
+        print(f"♻️ Reused the cached PDF for {pdf_path} ({(time.perf_counter() - start) * 1000:.1f} ms)")
+        return
 
+    # A previous hit may have left a hard link to a cached PDF here
+    Path(pdf_path).unlink(missing_ok=True)
+    _print_html(html_path, pdf_path)
+    store_pdf(key, pdf_path)
 
-def html_to_pdf(html_path: str, pdf_path: str):
-    asyncio.run(html_to_pdf_async(html_path, pdf_path))
+
+def warm_up_renderer(html_content: str):
+    """Start the shared Chromium that html_to_pdf prints with, and print one page"""
+    _renderer.warm_up(html_content)
@@ -1,29 +1,52 @@
 
+import json
+import os
 import re
-from local_llm_client import run_llm
-from utils.file_operations import load_json, save_json, save_text, create_folder_if_not_exists
-from utils.prompt_handler import create_adaptation_prompt, create_cover_letter_prompt
+from local_llm_client import is_error_response, run_llm, run_llm_candidates, structured_output_available
+from utils.model_routing import STAGE_ADAPTATION, STAGE_COVER_LETTER, normalize_candidate_count, normalize_tier
+from utils.file_operations import load_json, load_text, save_json, save_text, create_folder_if_not_exists
+from utils.prompt_handler import create_adaptation_prompt, create_adaptation_retry_prompt, create_cover_letter_prompt
+from utils.response_schema import build_adaptation_response_format
+from utils.token_budget import adaptation_output_budget, count_message_tokens, fit_prompt, COVER_LETTER_MAX_TOKENS
 from processors.resume_processor import (
-    load_adapt_info, load_resume_info, adapt_info_to_text, json_to_resume_text,
-    parse_llm_json_response, merge_resume_data, create_safe_filename
+    adapt_info_to_text, json_to_resume_text, merge_resume_data, create_safe_filename
 )
+from processors.profile_registry import get_registry
+from processors.resume_model import thaw
+from processors.candidate_ranking import CANDIDATE_TEMPERATURE, rank_candidates
+from processors.offer_digest import prepare_job_offer
+from processors.relevance_pruning import PRUNING_ENABLED, RESTORE_PRUNED, prune_adapt_data
+from processors.resume_digest import build_resume_digest
+from processors.section_adapter import adapt_sections, ADAPTATION_MODE_SECTIONS, DEFAULT_ADAPTATION_MODE
 from generators.html_generator import generate_html_resume
+from generators.resume_renderer import HtmlWriter, MarkdownWriter, TextWriter, render_resume
 from generators.html_pdf_generator import html_to_pdf
 from generators.txt_pdf_generator import TxtToPDF
-from db.db import save_generation
+from utils.pdf_optimizer import finish_pdf_optimizations, submit_pdf_optimization
+from db.db import save_candidate_scores, save_generation, save_parse_result
+from utils.progress import GenerationCancelled
 
+# Extra adaptation calls when the response fails validation
+MAX_VALIDATION_RETRIES = 1
 
-def generate_resume_and_cover_letter(form_data):
+# Also write the cover letter from the full resume text, next to the digest-based one
+COVER_LETTER_COMPARE = os.environ.get("RESUME_COVER_LETTER_COMPARE", "0") == "1"
+
+
+def generate_resume_and_cover_letter(form_data, progress=None):
     """
     Generate adapted resume and cover letter based on form data
     Only adapts work experience and skills from adapt_info.json
 
     Args:
         form_data (dict): Dictionary with keys: company_name, job_offer, language
+        progress (ProgressReporter, optional): Receives stage and token events,
+            and can cancel the generation between stages
 
     Returns:
         dict: Contains paths to generated files and status
     """
+    adapted_content_json = None
     try:
 
         # Get form data
@@ -34,35 +57,51 @@ def generate_resume_and_cover_letter(form_data):
         country_code = form_data.get('country_code', '')
         name = form_data.get('name', 'Applicant')
 
-        # Select which adaptation data to use based on language
-        # In a future version, use it to choose different resume profiles.
-        if language == 'German':
-            folder = "it_de"
-
-        elif language == 'Spanish':
-            folder = "it_es"
-
-        else:
-            folder = "it_en"
-
-        # Load base resume data
-        resume_data = load_resume_info(folder)
-
-        # Load adaptation data
-        adapt_data = load_adapt_info(folder)
+        # Profile named in the form, or the best one for the language, country and tag
+        _report_stage(progress, "📂 Loading resume profile...")
+        profile = get_registry().resolve(form_data)
+        folder = profile.folder
+        print(f"📂 Using resume profile '{folder}'")
+
+        # Shared immutable profile data; the adapt data is thawed into a copy for this request
+        resume_data = profile.resume_data
+        adapt_data = thaw(profile.adapt_data)
+
+        adaptation_mode = form_data.get('adaptation_mode') or DEFAULT_ADAPTATION_MODE
+        tier = normalize_tier(form_data.get('tier'))
+        candidates = normalize_candidate_count(form_data.get('candidates'))
+
+        # Long offers are replaced by a cached requirements digest in both prompts
+        offer_text = prepare_job_offer(job_offer, progress, tier)
+        failed_sections = []
+        # PDFs being shrunk in worker processes while the pipeline goes on
+        pdf_optimizations = []
+
+        # Only the bullets and skills most relevant to the offer are adapted
+        pruned = None
+        if PRUNING_ENABLED:
+            adapt_data, pruned = prune_adapt_data(adapt_data, offer_text)
         adapt_text = adapt_info_to_text(adapt_data)
 
-        # Create adaptation prompt
-        adaptation_prompt, system_message = create_adaptation_prompt(job_offer, adapt_text, language)
-
-        print("🤖 Sending prompt to LLM...")
-        adapted_content_json = run_llm(adaptation_prompt, system_message)
+        if adaptation_mode == ADAPTATION_MODE_SECTIONS:
+            # One concurrent request per job and skill category
+            _report_stage(progress, "🤖 Adapting each job and skill category in parallel...")
+            adapted_content, failed_sections = adapt_sections(adapt_data, offer_text, language, progress, tier)
+            adapted_content_json = json.dumps(adapted_content, ensure_ascii=False)
+            json_parse_success = True
 
-        print(f"📝 Raw LLM Response (first 200 chars): {repr(adapted_content_json[:200])}")
-        print(f"📏 Response length: {len(adapted_content_json)}")
-
-        # Parse LLM response
-        adapted_content, json_parse_success = parse_llm_json_response(adapted_content_json)
+        else:
+            # Create adaptation prompt, sizing the output from the profile
+            max_tokens = adaptation_output_budget(adapt_text)
+            adaptation_prompt, system_message = fit_prompt(
+                lambda offer: create_adaptation_prompt(offer, adapt_text, language), offer_text, max_tokens
+            )
+
+            _report_stage(progress, "🤖 Sending prompt to LLM...")
+            adapted_content_json, adapted_content, json_parse_success = _run_adaptation(
+                adaptation_prompt, system_message, adapt_data, job_offer, company_name, language, max_tokens,
+                progress, tier, candidates
+            )
 
         # Create safe filename
         safe_company_name = create_safe_filename(company_name)
@@ -71,27 +110,40 @@ def generate_resume_and_cover_letter(form_data):
 
         if json_parse_success and adapted_content:
             # Merge adapted content with base resume
-            final_resume = merge_resume_data(resume_data, adapted_content)
+            final_resume = merge_resume_data(resume_data, adapted_content, pruned if RESTORE_PRUNED else None)
+            cover_letter_resume = final_resume
 
             # Check if company folder exists, create if not
             create_folder_if_not_exists("outputs", safe_company_name)
             # Save files
             resume_json_filename = f"outputs/{safe_company_name}/adapted_resume_{safe_company_name}_{language}.json"
 
-            save_json(resume_json_filename, final_resume)
+            save_json(resume_json_filename, final_resume.to_dict())
             print(f"💾 JSON file saved: {resume_json_filename}")
 
-            # Convert to text
-            adapted_resume_text = json_to_resume_text(final_resume)
+            # Convert to text, ATS-friendly Markdown and the HTML sections in one walk of the resume
+            adapted_resume_text, resume_markdown, html_fragments = render_resume(
+                final_resume, [TextWriter(), MarkdownWriter(), HtmlWriter()]
+            )
             resume_text_filename = f"outputs/{safe_company_name}/adapted_resume_{safe_company_name}_{language}.txt"
             save_text(resume_text_filename, adapted_resume_text)
             print(f"📄 Text file saved: {resume_text_filename}")
+            resume_markdown_filename = f"outputs/{safe_company_name}/adapted_resume_{safe_company_name}_{language}.md"
+            save_text(resume_markdown_filename, resume_markdown)
+            print(f"📝 Markdown file saved: {resume_markdown_filename}")
 
             # Generate HTML
-            html_filename = generate_html_resume(final_resume, company_name, language, country_code, city, adapt_data)
+            _report_stage(progress, "🌐 Rendering HTML resume...")
+            html_filename = generate_html_resume(
+                final_resume, company_name, language, country_code, city, profile.content_hash, html_fragments
+            )
+            resume_pdf_filename = None
             if html_filename:
                 print(f"🌐 HTML file saved: {html_filename}")
-                html_to_pdf(html_filename, f"outputs/{safe_company_name}/{name_person}_resume.pdf")
+                _report_stage(progress, "🖨️ Printing PDF resume...")
+                resume_pdf_filename = f"outputs/{safe_company_name}/{name_person}_resume.pdf"
+                html_to_pdf(html_filename, resume_pdf_filename)
+                pdf_optimizations.append(submit_pdf_optimization(resume_pdf_filename))
                 save_generation(company_name, job_offer, language, country_code, city)
 
         else:
@@ -103,36 +155,63 @@ def generate_resume_and_cover_letter(form_data):
 
             save_text(resume_text_filename, fallback_text)
             adapted_resume_text = fallback_text
+            cover_letter_resume = resume_data
             resume_json_filename = None
+            resume_markdown_filename = None
             html_filename = None
+            resume_pdf_filename = None
 
-        # Generate cover letter
-        cover_letter_file = _generate_cover_letter(
-            company_name, job_offer, adapted_resume_text if 'adapted_resume_text' in locals() else adapt_text,
-            language, safe_company_name, name_person
+        # Generate cover letter from a compact digest of the resume
+        resume_digest = build_resume_digest(cover_letter_resume, job_offer, folder)
+        cover_letter_file, cover_letter_pdf_file = _generate_cover_letter(
+            company_name, offer_text, resume_digest, language, safe_company_name, name_person, progress, tier
         )
+        pdf_optimizations.append(submit_pdf_optimization(cover_letter_pdf_file))
+        finish_pdf_optimizations(pdf_optimizations)
 
         # Prepare response
         files_created = [resume_text_filename, cover_letter_file]
+        compare = str(form_data.get('cover_letter_compare', COVER_LETTER_COMPARE)).lower() in ("1", "true", "yes")
+        if compare:
+            files_created.append(_compare_cover_letters(
+                company_name, offer_text, resume_digest, json_to_resume_text(cover_letter_resume),
+                cover_letter_file, language, safe_company_name, progress, tier
+            ))
+        if resume_markdown_filename:
+            files_created.insert(1, resume_markdown_filename)
         if json_parse_success and resume_json_filename:
             files_created.insert(0, resume_json_filename)
         if json_parse_success and html_filename:
             files_created.append(html_filename)
+        if resume_pdf_filename:
+            files_created.append(resume_pdf_filename)
+        files_created.append(cover_letter_pdf_file)
 
         status_message = "Resume and cover letter generated successfully"
         if not json_parse_success:
             status_message += " (Note: JSON parsing failed, text format used)"
+        if failed_sections:
+            status_message += f" (Note: {len(failed_sections)} sections kept their original content)"
 
         return {
             'status': 'success',
             'resume_file': resume_text_filename,
             'resume_json_file': resume_json_filename if json_parse_success else None,
             'resume_html_file': html_filename if json_parse_success else None,
+            'resume_pdf_file': resume_pdf_filename,
             'cover_letter_file': cover_letter_file,
+            'cover_letter_pdf_file': cover_letter_pdf_file,
             'files_created': files_created,
             'message': f'{status_message} for {company_name} in {language}'
         }
 
+    except GenerationCancelled:
+        print("🛑 Generation cancelled by user")
+        return {
+            'status': 'cancelled',
+            'message': 'Generation cancelled by user'
+        }
+
     except Exception as e:
         print(f"💥 Error in generate_resume_and_cover_letter: {e}")
         print(f"📝 Raw LLM Response: {adapted_content_json}")
@@ -142,12 +221,86 @@ def generate_resume_and_cover_letter(form_data):
         }
 
 
-def _generate_cover_letter(company_name, job_offer, resume_content, language, safe_company_name, name_person):
-    """Generate cover letter using LLM"""
-    cover_prompt, cover_system = create_cover_letter_prompt(company_name, job_offer, resume_content, language)
+def _run_adaptation(adaptation_prompt, system_message, adapt_data, job_offer, company_name, language, max_tokens,
+                    progress=None, tier=None, candidates=1):
+    """
+    Run the adaptation call, validate the result and retry immediately with the errors
+
+    With several candidates, they are sampled in one request, scored locally
+    (validity, job-offer keyword coverage, bullets kept) and the best is used.
+
+    Returns:
+        tuple: (raw response, adapted content or None, success)
+    """
+    prompt = adaptation_prompt
+
+    for attempt in range(MAX_VALIDATION_RETRIES + 1):
+        responses = run_llm_candidates(
+            prompt, system_message, candidates, progress=progress,
+            response_format=build_adaptation_response_format(), max_tokens=max_tokens,
+            temperature=CANDIDATE_TEMPERATURE if candidates > 1 else None,
+            stage=STAGE_ADAPTATION, language=language, tier=tier
+        )
+        if all(is_error_response(response) for response in responses):
+            # Transport failure: not a parse failure, and the errors would not help a retry
+            print(f"❌ Adaptation request failed: {responses[0]}")
+            return responses[0], None, False
+        responses = [response for response in responses if not is_error_response(response)]
 
-    print("📝 Generating cover letter...")
-    cover_letter = run_llm(cover_prompt, cover_system)
+        # False if disabled, or if the server just rejected the schema
+        structured_output = structured_output_available()
+
+        # Parse, validate and score the responses
+        ranked = rank_candidates(responses, job_offer, adapt_data)
+        for candidate in ranked:
+            save_parse_result(language, structured_output, candidate.content is not None)
+        best = ranked[0]
+        response = best.response
+
+        print(f"📝 Raw LLM Response (first 200 chars): {repr(response[:200])}")
+        print(f"📏 Response length: {len(response)}")
+
+        if len(ranked) > 1:
+            print(f"🏅 Using candidate {best.index + 1} of {len(ranked)}: score {best.score:.2f} "
+                  f"(keywords {best.keyword_coverage:.0%}, bullets {best.bullet_ratio:.0%})")
+            save_candidate_scores(company_name, language, [candidate.to_dict() for candidate in ranked], best.index)
+
+        if best.valid:
+            return response, best.content, True
+
+        errors = best.errors
+        print(f"❌ Adapted content is invalid: {'; '.join(errors)}")
+        if attempt < MAX_VALIDATION_RETRIES:
+            _report_stage(progress, "🔁 Retrying the adaptation with the validation errors...")
+            prompt = create_adaptation_retry_prompt(adaptation_prompt, errors)
+
+    return response, None, False
+
+
+def _report_stage(progress, message):
+    """Print a pipeline stage, forward it to the progress channel and stop if cancelled"""
+    print(message)
+    if progress is not None:
+        progress.check_cancelled()
+        progress.stage(message)
+
+
+def _write_cover_letter(company_name, job_offer, resume_content, language, progress=None, tier=None):
+    """
+    Run the cover letter prompt and strip the greeting the template adds
+
+    Returns:
+        tuple: (cover letter text, prompt tokens)
+    """
+    cover_prompt, cover_system = fit_prompt(
+        lambda offer: create_cover_letter_prompt(company_name, offer, resume_content, language),
+        job_offer, COVER_LETTER_MAX_TOKENS
+    )
+    prompt_tokens = count_message_tokens(cover_system, cover_prompt)
+    print(f"📏 Cover letter prompt: {prompt_tokens} tokens")
+
+    cover_letter = run_llm(cover_prompt, cover_system, progress=progress, max_tokens=COVER_LETTER_MAX_TOKENS,
+                           stage=STAGE_COVER_LETTER, language=language, tier=tier)
 
     # Remove any company or person details from the cover letter
     # cover_letter = cover_letter.replace(company_name, "[Company Name]").replace(name_person, "[Applicant Name]")
@@ -160,6 +313,15 @@ def _generate_cover_letter(company_name, job_offer, resume_content, language, sa
         trimmed = match.group(0)
         cover_letter = cover_letter.replace(trimmed.strip(), "")
 
+    return cover_letter, prompt_tokens
+
+
+def _generate_cover_letter(company_name, job_offer, resume_content, language, safe_company_name, name_person,
+                           progress=None, tier=None):
+    """Generate cover letter using LLM"""
+    _report_stage(progress, "📝 Generating cover letter...")
+    cover_letter, _ = _write_cover_letter(company_name, job_offer, resume_content, language, progress, tier)
+
     cover_filename = f"outputs/{safe_company_name}/cover_letter_{safe_company_name}_{language}.txt"
     save_text(cover_filename, cover_letter)
     print(f"💌 Cover letter saved: {cover_filename}")
@@ -171,10 +333,33 @@ def _generate_cover_letter(company_name, job_offer, resume_content, language, sa
     name_person = name_person.replace("_", " ")
     # company_name = company_name.replace("_", " ")
 
+    _report_stage(progress, "📄 Creating cover letter PDF...")
     conversor = TxtToPDF(font="Arial", font_size=9, title_font_size=16)
-    conversor.convert(cover_filename, f"outputs/{safe_company_name}/cover_letter_{safe_person_name}.pdf", title=f"Cover Letter by {name_person}")
-
-    return cover_filename
+    cover_pdf_filename = f"outputs/{safe_company_name}/cover_letter_{safe_person_name}.pdf"
+    conversor.convert(cover_filename, cover_pdf_filename, title=f"Cover Letter by {name_person}")
+
+    return cover_filename, cover_pdf_filename
+
+
+def _compare_cover_letters(company_name, job_offer, resume_digest, resume_text, cover_filename, language,
+                           safe_company_name, progress=None, tier=None):
+    """Write the cover letter generated from the full resume text next to the digest-based one"""
+    _report_stage(progress, "🔍 Generating the full-resume cover letter for comparison...")
+    full_letter, full_tokens = _write_cover_letter(company_name, job_offer, resume_text, language, progress, tier)
+    digest_prompt, digest_system = create_cover_letter_prompt(company_name, job_offer, resume_digest, language)
+    digest_tokens = count_message_tokens(digest_system, digest_prompt)
+
+    comparison = f"COVER LETTER COMPARISON - {company_name} ({language})\n\n"
+    comparison += f"=== FROM RESUME DIGEST (prompt: {digest_tokens} tokens) ===\n\n"
+    comparison += f"{load_text(cover_filename).strip()}\n\n"
+    comparison += f"=== FROM FULL RESUME TEXT (prompt: {full_tokens} tokens) ===\n\n"
+    comparison += f"{full_letter.strip()}\n"
+
+    comparison_filename = f"outputs/{safe_company_name}/cover_letter_comparison_{safe_company_name}_{language}.txt"
+    save_text(comparison_filename, comparison)
+    print(f"🔍 Cover letter comparison saved: {comparison_filename} "
+          f"(digest prompt {digest_tokens} vs full prompt {full_tokens} tokens)")
+    return comparison_filename
 
 
 def test_llm_json():
@@ -0,0 +1,394 @@
+import io
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+
+# Resume sections in the order they are walked
+SECTIONS = ('header', 'profiles', 'summary', 'work', 'skills', 'projects', 'education')
+
+PROFILE_ICONS = {
+    'linkedin': '💼', 'github': '🐱', 'portfolio': '💻',
+    'substack': '🗞️', 'codepen': '🎨'
+}
+
+
+class ResumeWriter(ABC):
+    """
+    Output format of render_resume
+
+    The renderer walks the resume once and calls these hooks on every
+    writer; each hook is a no-op here so a writer only implements the
+    sections it emits, plus getvalue(). start_* hooks are called when the
+    section key exists in the resume, even if its list is empty.
+    """
+
+    def header(self, resume_data):
+        pass
+
+    def profiles(self, profiles):
+        pass
+
+    def summary(self, text):
+        pass
+
+    def start_work(self, jobs):
+        pass
+
+    def job(self, job):
+        pass
+
+    def end_work(self):
+        pass
+
+    def start_skills(self, categories):
+        pass
+
+    def skill_category(self, category):
+        pass
+
+    def end_skills(self):
+        pass
+
+    def start_projects(self, projects):
+        pass
+
+    def project(self, project):
+        pass
+
+    def start_education(self, entries):
+        pass
+
+    def education(self, entry):
+        pass
+
+    @abstractmethod
+    def getvalue(self):
+        """The rendered output"""
+
+
+def render_resume(resume_data, writers, sections=SECTIONS):
+    """
+    Walk a resume once, feeding every writer
+
+    Args:
+        resume_data (dict): Resume, or adapt_info with only work and skills
+        writers (list): ResumeWriter instances
+        sections (tuple): Sections to walk, a subset of SECTIONS
+
+    Returns:
+        list: The getvalue() of each writer, in order
+    """
+    if 'header' in sections:
+        for writer in writers:
+            writer.header(resume_data)
+    if 'profiles' in sections and 'profiles' in resume_data:
+        for writer in writers:
+            writer.profiles(resume_data['profiles'] or [])
+    if 'summary' in sections and 'summary' in resume_data:
+        for writer in writers:
+            writer.summary(resume_data['summary'])
+
+    if 'work' in sections and 'work' in resume_data:
+        jobs = resume_data['work'] or []
+        for writer in writers:
+            writer.start_work(jobs)
+        for job in jobs:
+            for writer in writers:
+                writer.job(job)
+        for writer in writers:
+            writer.end_work()
+
+    if 'skills' in sections and 'skills' in resume_data:
+        categories = resume_data['skills'] or []
+        for writer in writers:
+            writer.start_skills(categories)
+        for category in categories:
+            for writer in writers:
+                writer.skill_category(category)
+        for writer in writers:
+            writer.end_skills()
+
+    if 'projects' in sections and 'projects' in resume_data:
+        projects = resume_data['projects'] or []
+        for writer in writers:
+            writer.start_projects(projects)
+        for project in projects:
+            for writer in writers:
+                writer.project(project)
+
+    if 'education' in sections and 'education' in resume_data:
+        entries = resume_data['education'] or []
+        for writer in writers:
+            writer.start_education(entries)
+        for entry in entries:
+            for writer in writers:
+                writer.education(entry)
+
+    return [writer.getvalue() for writer in writers]
+
+
+def format_date_range(job):
+    """Format date range for a job"""
+    if 'startDate' in job and 'endDate' in job:
+        return f"{job['startDate']} - {job['endDate']}"
+    elif 'dates' in job:
+        return job['dates']
+    return ""
+
+
+def _job_lines(out, job):
+    out.write(f"\n{job['title']} at {job['company']}")
+    if 'startDate' in job and 'endDate' in job:
+        out.write(f" ({job['startDate']} - {job['endDate']})")
+    out.write("\n")
+    for point in job.get('summary', []):
+        out.write(f"• {point}\n")
+
+
+class TextWriter(ResumeWriter):
+    """Plain text resume, saved next to the JSON and used in prompts"""
+
+    def __init__(self):
+        self.out = io.StringIO()
+
+    def header(self, resume_data):
+        contact = resume_data['contactInfo']
+        self.out.write(f"{resume_data['name']}\n{resume_data['label']}\n\n")
+        self.out.write(f"Contact: {contact['email']} | {contact['phone']}\n")
+        self.out.write(f"Location: {contact['location']['city']}, {contact['location']['countryCode']}\n\n")
+
+    def profiles(self, profiles):
+        if profiles:
+            self.out.write("Profiles:\n")
+            for key, value in profiles[0].items():
+                self.out.write(f"{key.capitalize()}: {value}\n")
+            self.out.write("\n")
+
+    def summary(self, text):
+        self.out.write(f"Summary:\n{text}\n\n")
+
+    def start_work(self, jobs):
+        self.out.write("Work Experience:\n")
+
+    def job(self, job):
+        _job_lines(self.out, job)
+
+    def getvalue(self):
+        return self.out.getvalue()
+
+
+class AdaptTextWriter(ResumeWriter):
+    """Work experience and skills to adapt, as sent in the adaptation prompts"""
+
+    def __init__(self):
+        self.out = io.StringIO()
+        self._open = False
+
+    def start_work(self, jobs):
+        self._open = bool(jobs)
+        if self._open:
+            self.out.write("WORK EXPERIENCE TO ADAPT:\n")
+
+    def job(self, job):
+        _job_lines(self.out, job)
+
+    def end_work(self):
+        if self._open:
+            self.out.write("\n")
+
+    def start_skills(self, categories):
+        self._open = bool(categories)
+        if self._open:
+            self.out.write("SKILLS TO ADAPT:\n")
+
+    def skill_category(self, category):
+        if 'category' in category and 'items' in category:
+            self.out.write(f"\n{category['category']}:\n")
+            for skill in category['items']:
+                self.out.write(f"• {skill}\n")
+
+    def end_skills(self):
+        if self._open:
+            self.out.write("\n")
+
+    def getvalue(self):
+        return self.out.getvalue()
+
+
+class HtmlWriter(ResumeWriter):
+    """
+    HTML fragments of the resume template sections
+
+    getvalue() returns a dict: profiles, work, skills, projects, education.
+    Jobs with the same title and company are merged into one entry.
+    """
+
+    def __init__(self):
+        self.parts = {'profiles': [], 'work': [], 'skills': [], 'projects': [], 'education': []}
+        self._jobs = {}
+
+    def profiles(self, profiles):
+        for profile in profiles:
+            for key, value in profile.items():
+                if value and key.lower() in PROFILE_ICONS:
+                    self.parts['profiles'].append(f'''
+                <a href="{value}" class="profile-link" data-type="{key.lower()}">
+                    <span>{PROFILE_ICONS[key.lower()]}</span> {key.capitalize()}
+                </a>''')
+
+    def start_work(self, jobs):
+        self._jobs = {}
+
+    def job(self, job):
+        key = f"{job.get('title', '')}__{job.get('company', '')}"
+        existing = self._jobs.get(key)
+        if existing is None:
+            # Own summary list, so merging never modifies the resume
+            self._jobs[key] = dict(job, summary=list(job.get('summary', [])))
+            return
+
+        for item in job.get('summary', []):
+            if item not in existing['summary']:
+                existing['summary'].append(item)
+        start, end = job.get('startDate', ''), job.get('endDate', '')
+        if start and (not existing.get('startDate', '') or start < existing['startDate']):
+            existing['startDate'] = start
+        if end and (not existing.get('endDate', '') or end > existing['endDate']):
+            existing['endDate'] = end
+
+    def end_work(self):
+        for job in self._jobs.values():
+            summary_html = "".join(f"<li>{item}</li>" for item in job['summary'])
+            self.parts['work'].append(f'''
+                <div class="work-item item">
+                    <div class="work-title titleText">{job.get('title', '')}</div>
+                    <div class="work-company separatedText">
+                        <span class="company-name">{job.get('company', '')}</span>
+                        <span class="company-range">{format_date_range(job)}</span>
+                    </div>
+                    <ul class="regularText work-summary">
+                        {summary_html}
+                    </ul>
+                </div>''')
+            print(f"💼 Generating work experience: {job.get('title', '')} at {job.get('company', '')}")
+
+    def skill_category(self, category):
+        if 'category' not in category or not category.get('items'):
+            return
+        # Filter out empty items
+        items = [item.strip() for item in category['items'] if item and item.strip()]
+        if items:
+            keywords = ' | '.join(f'<span class="keyword">{skill}</span>' for skill in items)
+            self.parts['skills'].append(f'''
+                    <li class="skill-item">
+                        <div class="skill-name allInLine boldText">{category['category']}:</div>
+                        <div class="skill-keywords allInLine regularText">
+                            {keywords}
+                        </div>
+                    </li>''')
+
+    def project(self, project):
+        link = ""
+        if project.get('link'):
+            link = f'<a class="project-link" href="{project["link"]}">View Project →</a>'
+        self.parts['projects'].append(f'''
+                <div class="project-item item">
+                    <div class="project-name boldText">{project.get('name', '')}:
+                        {link}
+                    </div>
+                    <p class="project-description regularText">• {project.get('description', '')}</p>
+                </div>''')
+
+    def education(self, entry):
+        location = entry.get('location', {})
+        if isinstance(location, Mapping):
+            location = f"{location.get('city', '')}, {location.get('countryCode', '')}"
+        self.parts['education'].append(f'''
+                <div class="education-item item">
+                    <div class="studyType boldText allInLine">{entry.get('studyType', '')}</div><span> | </span>
+                    <div class="work-title boldText allInLine">{entry.get('course', '')}</div><span> | </span>
+                    <div class="education-institution regularText allInLine">{entry.get('institution', '')}</div><span> | </span>
+                    <div class="date-range regularText allInLine">{entry.get('startDate', '')} - {entry.get('endDate', '')}</div><span> | </span>
+                    <div class="location regularText allInLine">{location}</div>
+                </div>''')
+
+    def getvalue(self):
+        fragments = {section: "".join(parts) for section, parts in self.parts.items()}
+        if fragments['skills']:
+            fragments['skills'] = f'<ul class="skills-list">{fragments["skills"]}</ul>'
+        return fragments
+
+
+class MarkdownWriter(ResumeWriter):
+    """
+    ATS-friendly Markdown resume
+
+    One column, standard section headings, plain bullets and no icons or
+    tables, so that applicant tracking systems parse every field.
+    """
+
+    def __init__(self):
+        self.out = io.StringIO()
+
+    def header(self, resume_data):
+        contact = resume_data.get('contactInfo', {})
+        location = contact.get('location', {})
+        self.out.write(f"# {resume_data.get('name', '')}\n\n")
+        if resume_data.get('label'):
+            self.out.write(f"**{resume_data['label']}**\n\n")
+        details = [contact.get('email'), contact.get('phone')]
+        if isinstance(location, Mapping):
+            details.append(", ".join(part for part in (location.get('city'), location.get('countryCode')) if part))
+        self.out.write(" | ".join(detail for detail in details if detail) + "\n")
+
+    def profiles(self, profiles):
+        links = [f"{key.capitalize()}: {value}" for profile in profiles for key, value in profile.items() if value]
+        if links:
+            self.out.write("\n" + " | ".join(links) + "\n")
+
+    def summary(self, text):
+        self.out.write(f"\n## Summary\n\n{text}\n")
+
+    def start_work(self, jobs):
+        if jobs:
+            self.out.write("\n## Work Experience\n")
+
+    def job(self, job):
+        self.out.write(f"\n### {job.get('title', '')}, {job.get('company', '')}\n\n")
+        date_range = format_date_range(job)
+        if date_range:
+            self.out.write(f"{date_range}\n\n")
+        for point in job.get('summary', []):
+            self.out.write(f"- {point}\n")
+
+    def start_skills(self, categories):
+        if categories:
+            self.out.write("\n## Skills\n\n")
+
+    def skill_category(self, category):
+        items = [item for item in category.get('items', []) if item and item.strip()]
+        if items:
+            self.out.write(f"- {category.get('category', '')}: {', '.join(items)}\n")
+
+    def start_projects(self, projects):
+        if projects:
+            self.out.write("\n## Projects\n\n")
+
+    def project(self, project):
+        line = f"- {project.get('name', '')}: {project.get('description', '')}"
+        if project.get('link'):
+            line += f" ({project['link']})"
+        self.out.write(line + "\n")
+
+    def start_education(self, entries):
+        if entries:
+            self.out.write("\n## Education\n\n")
+
+    def education(self, entry):
+        degree = ", ".join(part for part in (entry.get('studyType'), entry.get('course')) if part)
+        line = f"- {degree}, {entry.get('institution', '')}"
+        if entry.get('startDate') or entry.get('endDate'):
+            line += f" ({entry.get('startDate', '')} - {entry.get('endDate', '')})"
+        self.out.write(line + "\n")
+
+    def getvalue(self):
+        return self.out.getvalue()
@@ -1,4 +1,3 @@
-from fpdf import FPDF
 # import os
 
 
@@ -14,6 +13,8 @@ class TxtToPDF:
         # if not os.path.exists(txt_path):
         #     raise FileNotFoundError(f"File not found: {txt_path}")
 
+        from fpdf import FPDF  # Deferred to keep the GUI startup fast
+
         pdf = FPDF()
         pdf.add_page()
         pdf.set_auto_page_break(auto=True, margin=15)
@@ -1,39 +1,316 @@
-from openai import OpenAI
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from db.db import save_llm_call
+from utils.endpoint_pool import EndpointPool, parse_endpoints
+from utils.model_routing import (
+    DEFAULT_TIER, LARGE_MODEL, STAGE_ADAPTATION, STAGE_COVER_LETTER, STAGE_OTHER, STAGE_SECTION_ADAPTATION,
+    get_route, tier_models
+)
+from utils.progress import GenerationCancelled
+from utils.token_budget import (
+    DEFAULT_MAX_TOKENS, count_message_tokens, count_tokens, fit_output_budget
+)
 
 SERVER_API_HOST = "localhost:1234"
-MODEL = "llama-3.2-8b-instruct"
+# Default model; the model of each call comes from the routing table in utils/model_routing.py
+MODEL = LARGE_MODEL
 
-client = OpenAI(base_url=f"http://{SERVER_API_HOST}/v1", api_key="lm-studio")
+# Comma-separated LM servers, each "host:port" (any model) or "host:port=model"
+# (e.g. "localhost:1234,gpu-box:1234=qwen2.5-7b-instruct")
+LLM_ENDPOINTS = os.environ.get("RESUME_LLM_ENDPOINTS", SERVER_API_HOST)
+# Seconds before a request without tokens on screen is duplicated on a second
+# endpoint (hedging); unset to disable
+HEDGE_AFTER_SECONDS = float(os.environ.get("RESUME_LLM_HEDGE_AFTER", "0")) or None
 
+# Constrain the adaptation output with a JSON schema (LM Studio supports
+# response_format). Disable with RESUME_STRUCTURED_OUTPUT=0 for servers that
+# misbehave; servers that reject it are detected and skipped automatically.
+STRUCTURED_OUTPUT_ENABLED = os.environ.get("RESUME_STRUCTURED_OUTPUT", "1") != "0"
+_structured_output_supported = True
 
-def run_llm(prompt, system_message="You are a helpful assistant."):
+# Ask streaming responses for a final usage chunk; servers that reject it are
+# skipped and their usage is estimated locally
+_stream_usage_supported = True
+
+# Start of the text returned instead of a response when no server answered
+ERROR_PREFIX = "Error:"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Create the endpoint pool on first use, probing health in the background when there are several"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = EndpointPool(parse_endpoints(LLM_ENDPOINTS), hedge_after=HEDGE_AFTER_SECONDS)
+                if len(pool.endpoints) > 1:
+                    pool.start_health_checks()
+                _pool = pool
+    return _pool
+
+
+def is_error_response(response):
+    """True for the error message run_llm returns when the LLM could not be reached"""
+    return response.startswith(ERROR_PREFIX)
+
+
+def structured_output_available():
+    """True when the adaptation call should send a JSON schema response_format"""
+    return STRUCTURED_OUTPUT_ENABLED and _structured_output_supported
+
+
+def _is_response_format_rejection(error):
+    """Detect servers that reject the response_format parameter"""
+    message = str(error).lower()
+    return 'response_format' in message or 'json_schema' in message
+
+
+def _is_endpoint_failure(error):
+    """True for errors caused by the server being down or broken (not by the request)"""
+    if isinstance(error, GenerationCancelled):
+        return False
+    if isinstance(error, OSError) or type(error).__name__ in ("APIConnectionError", "APITimeoutError"):
+        return True
+    status_code = getattr(error, 'status_code', None)
+    return status_code is not None and status_code >= 500
+
+
+def run_llm(prompt, system_message="You are a helpful assistant.", progress=None, response_format=None,
+            max_tokens=DEFAULT_MAX_TOKENS, temperature=None, stage=STAGE_OTHER, language=None, tier=None):
     """
     Run LLM with the given prompt and system message
 
     Args:
         prompt (str): The user prompt
         system_message (str): The system message to set context
+        progress (ProgressReporter, optional): When given, the response is
+            streamed, each token is reported and the request can be cancelled
+        response_format (dict, optional): OpenAI-style response_format used to
+            constrain the output (sent only if structured output is available)
+        max_tokens (int): Output budget, capped by the route and reduced if the
+            prompt leaves less room in the context window
+        temperature (float, optional): Sampling temperature (the route's by default)
+        stage (str): Pipeline stage; with the tier it selects model, temperature
+            and max_tokens cap from the routing table, and tags the call metrics
+        language (str, optional): Resume language recorded with the call metrics
+        tier (str, optional): 'fast' or 'quality' (DEFAULT_TIER when omitted)
 
     Returns:
         str: The LLM response
     """
+    return run_llm_candidates(
+        prompt, system_message, 1, progress=progress, response_format=response_format,
+        max_tokens=max_tokens, temperature=temperature, stage=stage, language=language, tier=tier
+    )[0]
+
+
+def run_llm_candidates(prompt, system_message, n, progress=None, response_format=None,
+                       max_tokens=DEFAULT_MAX_TOKENS, temperature=None, stage=STAGE_OTHER, language=None,
+                       tier=None):
+    """
+    Sample n responses to the same prompt
+
+    The candidates are requested in one completion with the n parameter, so
+    the prompt is only processed once. Servers that ignore n return fewer
+    choices; the missing ones are requested with parallel calls. Only the
+    first candidate is streamed to progress. Other arguments as in run_llm.
+
+    Returns:
+        list: n responses (a single error message if the server is unreachable)
+    """
+    route = get_route(stage, tier)
+    if route['max_tokens'] is not None:
+        max_tokens = min(max_tokens, route['max_tokens'])
+
+    request = {
+        "model": route['model'],
+        "messages": [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": fit_output_budget(system_message, prompt, max_tokens),
+        "temperature": temperature if temperature is not None else route['temperature']
+    }
+    if n > 1:
+        request["n"] = n
+    if response_format is not None and structured_output_available():
+        request["response_format"] = response_format
+
+    call_info = (stage, language, tier, system_message, prompt)
     try:
-        return client.chat.completions.create(
-            model=MODEL,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=2000,
-            temperature=0.3
-        ).choices[0].message.content.strip()
-        # Connect to the LM Studio client
-        # Using the OpenAI client to connect to LM Studio
+        responses = _complete_and_record(request, progress, call_info)
+        missing = n - len(responses)
+        if missing > 0:
+            print(f"ℹ️ Server returned {len(responses)} of {n} candidates, requesting the rest in parallel")
+            single = {key: value for key, value in request.items() if key != "n"}
+            muted = progress.muted() if progress is not None else None
+            with ThreadPoolExecutor(max_workers=missing) as executor:
+                futures = [executor.submit(_complete_and_record, dict(single), muted, call_info)
+                           for _ in range(missing)]
+                for future in futures:
+                    responses.extend(future.result())
+        return responses
 
+    except GenerationCancelled:
+        raise
     except Exception as e:
+        if progress is not None and progress.cancelled:
+            raise GenerationCancelled("Generation cancelled by user")
         print(f"Error connecting to LM Studio: {e}")
         # Fallback error message
-        return f"Error: Could not generate response. Make sure LM Studio is running on {SERVER_API_HOST}"
+        return [f"{ERROR_PREFIX} Could not generate response. Make sure LM Studio is running on {LLM_ENDPOINTS}"]
+
+
+def _complete_and_record(request, progress, call_info):
+    """Run a completion (without response_format if the server rejects it) and record its metrics"""
+    global _structured_output_supported
+
+    stats = {}
+    started = time.perf_counter()
+    try:
+        responses = _create_completion(request, progress, stats)
+    except GenerationCancelled:
+        raise
+    except Exception as e:
+        if "response_format" not in request or not _is_response_format_rejection(e):
+            raise
+        # The server does not support constrained decoding: remember it and retry once
+        print(f"⚠️ Server rejected response_format, falling back to free text: {e}")
+        _structured_output_supported = False
+        del request["response_format"]
+        started = time.perf_counter()
+        responses = _create_completion(request, progress, stats)
+    _record_call(*call_info, responses, stats, started)
+    return responses
+
+
+def _create_completion(request, progress, stats):
+    """Run the request on the endpoint pool, copy the winning attempt's stats and return the choices"""
+
+    def complete(attempt):
+        # Endpoints pinned to a model answer with it, even if the route asked for another
+        endpoint_request = dict(request, model=attempt.endpoint.model or request['model'])
+        attempt_stats = {'endpoint': attempt.endpoint, 'model': endpoint_request['model']}
+        if progress is not None:
+            texts = _run_llm_streaming(endpoint_request, progress, attempt_stats, attempt)
+        else:
+            completion = attempt.endpoint.client.chat.completions.create(**endpoint_request)
+            attempt_stats['usage'] = completion.usage
+            texts = [(choice.message.content or "").strip() for choice in completion.choices]
+        return texts, attempt_stats
+
+    # A hedged duplicate would print its tokens twice in the progress window
+    hedge = progress is None or not progress.shows_tokens
+    responses, attempt_stats = get_pool().call(
+        complete, hedge=hedge, is_failure=_is_endpoint_failure, model=request['model']
+    )
+    stats.update(attempt_stats)
+    return responses or [""]
+
+
+def _open_stream(client, request):
+    global _stream_usage_supported
+    if _stream_usage_supported:
+        try:
+            return client.chat.completions.create(
+                **request, stream=True, stream_options={"include_usage": True}
+            )
+        except Exception as e:
+            if 'stream_options' not in str(e).lower():
+                raise
+            print(f"⚠️ Server rejected stream_options, estimating token usage locally: {e}")
+            _stream_usage_supported = False
+    return client.chat.completions.create(**request, stream=True)
+
+
+def _run_llm_streaming(request, progress, stats, attempt):
+    """Stream the completion, reporting the first choice's tokens and honouring cancellation"""
+    progress.check_cancelled()
+    stream = _open_stream(attempt.endpoint.client, request)
+    # Closing the stream from the GUI thread aborts the HTTP response
+    progress.add_abort_callback(stream.close)
+    # ...and so does losing a hedged race
+    attempt.add_abort_callback(stream.close)
+    try:
+        progress.check_cancelled()
+        parts = {}
+        for chunk in stream:
+            progress.check_cancelled()
+            if getattr(chunk, 'usage', None):
+                # Sent in a final chunk without choices
+                stats['usage'] = chunk.usage
+            for choice in chunk.choices:
+                text = choice.delta.content
+                if not text:
+                    continue
+                if not parts:
+                    stats['first_token'] = time.perf_counter()
+                index = getattr(choice, 'index', 0) or 0
+                parts.setdefault(index, []).append(text)
+                if index == 0:
+                    progress.token(text)
+        progress.check_cancelled()
+        return ["".join(parts[index]).strip() for index in sorted(parts)]
+    finally:
+        progress.remove_abort_callback(stream.close)
+        stream.close()
+
+
+def _record_call(stage, language, tier, system_message, prompt, responses, stats, started):
+    """
+    Store token usage and timing of a completed call in the llm_calls table
+
+    Time to first token is only known for streamed calls; tokens/sec is the
+    decode rate after the first token (or over the whole call otherwise).
+    """
+    finished = time.perf_counter()
+    usage = stats.get('usage')
+    if usage is not None and usage.completion_tokens is not None:
+        prompt_tokens, completion_tokens, usage_source = usage.prompt_tokens, usage.completion_tokens, "server"
+    else:
+        prompt_tokens = count_message_tokens(system_message, prompt)
+        completion_tokens = sum(count_tokens(response) for response in responses)
+        usage_source = "estimate"
+
+    first_token = stats.get('first_token')
+    ttft = first_token - started if first_token is not None else None
+    decode_time = finished - (first_token if first_token is not None else started)
+    tokens_per_second = completion_tokens / decode_time if decode_time > 0 else None
+
+    try:
+        save_llm_call(
+            stage, language, tier or DEFAULT_TIER, stats['model'], stats['endpoint'].host,
+            prompt_tokens, completion_tokens, usage_source,
+            ttft * 1000 if ttft is not None else None, (finished - started) * 1000, tokens_per_second
+        )
+    except Exception as e:
+        print(f"⚠️ Could not record LLM call metrics: {e}")
+
+
+def warm_up_model(tier=None):
+    """Send a one-token request to every endpoint so that each server loads the tier's models into memory"""
+    errors = []
+    attempts = 0
+    for endpoint in get_pool().endpoints:
+        for model in ([endpoint.model] if endpoint.model else tier_models(tier)):
+            attempts += 1
+            try:
+                endpoint.client.chat.completions.create(
+                    model=model,
+                    messages=[{"role": "user", "content": "Hi"}],
+                    max_tokens=1,
+                    temperature=0
+                )
+            except Exception as e:
+                print(f"⚠️ Could not warm up {model} on LLM endpoint {endpoint.host}: {e}")
+                errors.append(e)
+    if len(errors) == attempts:
+        raise errors[0]
 
 
 # Test function - can be removed in production
@@ -1,6 +1,8 @@
+import argparse
 import sys
 import os
 from db.db import init_db
+from utils.warmup import start_warmup, warmup_enabled
 # from generators.resume_generator import generate_resume_and_cover_letter, test_llm_json
 
 
@@ -8,11 +10,34 @@ from db.db import init_db
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 
-def main():
-    """Main entry point - launches the GUI"""
+def parse_args(argv=None):
+    """Parse the command line options"""
+    parser = argparse.ArgumentParser(description="Resume and cover letter generator")
+    parser.add_argument("--serve", action="store_true",
+                        help="run the headless HTTP generation service instead of the GUI")
+    parser.add_argument("--host", default="127.0.0.1", help="host for --serve (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="port for --serve (default: 8765)")
+    parser.add_argument("--warmup", action="store_true",
+                        help="load the LLM model, PDF engine and profiles in the background at startup")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main entry point - launches the GUI, or the HTTP service with --serve"""
+    args = parse_args(argv)
+
     # Initialize the database
     init_db()
 
+    # Opt-in: prime the slow first-use resources while the user fills the form
+    if args.warmup or warmup_enabled():
+        start_warmup()
+
+    if args.serve:
+        from server import run_server
+        run_server(args.host, args.port)
+        return
+
     try:
         print("🚀 Launching Resume Generator GUI...")
         from view import ResumeGeneratorGUI
@@ -0,0 +1,119 @@
+from collections import Counter
+from processors.resume_processor import parse_llm_json_response
+from processors.resume_validator import validate_adapted_content
+from utils.text_vectors import tokenize
+
+# Sampling temperature with several candidates, so that they actually differ
+CANDIDATE_TEMPERATURE = 0.7
+
+# Score weights; an invalid candidate is only chosen when no candidate is valid
+KEYWORD_WEIGHT = 0.7
+BULLET_WEIGHT = 0.3
+MAX_KEYWORDS = 40
+
+
+def extract_keywords(job_offer, limit=MAX_KEYWORDS):
+    """Most frequent meaningful words of the job offer, lowercased"""
+    counts = Counter(tokenize(job_offer))
+    return [word for word, _ in counts.most_common(limit)]
+
+
+def _entries(value):
+    """The dict entries of a list, tolerating the malformed values of invalid candidates"""
+    return [entry for entry in value if isinstance(entry, dict)] if isinstance(value, list) else []
+
+
+def _strings(value):
+    return [str(item) for item in value] if isinstance(value, list) else []
+
+
+def _content_words(content):
+    """Distinct tokens of the adapted work and skills, so 'java' is not found in 'javascript'"""
+    parts = []
+    for job in _entries(content.get('work')):
+        parts.append(str(job.get('title', '')))
+        parts.extend(_strings(job.get('summary')))
+    for category in _entries(content.get('skills')):
+        parts.append(str(category.get('category', '')))
+        parts.extend(_strings(category.get('items')))
+    return set(tokenize(" ".join(parts)))
+
+
+def _bullet_count(content):
+    return sum(len(_strings(job.get('summary'))) for job in _entries(content.get('work')))
+
+
+class Candidate:
+    """One sampled adaptation response and its local scores"""
+
+    def __init__(self, index, response):
+        self.index = index
+        self.response = response
+        self.content = None
+        self.errors = []
+        self.keyword_coverage = 0.0
+        self.bullet_ratio = 0.0
+        self.score = 0.0
+
+    @property
+    def valid(self):
+        return self.content is not None and not self.errors
+
+    def to_dict(self):
+        return {
+            'index': self.index,
+            'valid': self.valid,
+            'errors': len(self.errors),
+            'keyword_coverage': round(self.keyword_coverage, 4),
+            'bullet_ratio': round(self.bullet_ratio, 4),
+            'score': round(self.score, 4),
+        }
+
+
+def score_candidate(candidate, keywords, adapt_data):
+    """
+    Parse, validate and score a candidate in place
+
+    The score combines the share of job-offer keywords found in the adapted
+    work and skills with how many of the original bullets were kept (up to
+    the original count, so padding does not help).
+    """
+    content, success = parse_llm_json_response(candidate.response)
+    if not success:
+        candidate.errors = ["the response is not a valid JSON object with work and skills"]
+        return candidate
+
+    candidate.content = content
+    candidate.errors = validate_adapted_content(content, len(adapt_data.get('work', [])))
+
+    if keywords:
+        words = _content_words(content)
+        candidate.keyword_coverage = sum(1 for keyword in keywords if keyword in words) / len(keywords)
+    original_bullets = _bullet_count(adapt_data)
+    if original_bullets:
+        candidate.bullet_ratio = min(_bullet_count(content) / original_bullets, 1.0)
+    else:
+        candidate.bullet_ratio = 1.0
+
+    candidate.score = KEYWORD_WEIGHT * candidate.keyword_coverage + BULLET_WEIGHT * candidate.bullet_ratio
+    return candidate
+
+
+def rank_candidates(responses, job_offer, adapt_data):
+    """
+    Score every response and sort them best first
+
+    Valid candidates always rank above invalid ones; invalid ones are ordered
+    by their number of errors.
+
+    Returns:
+        list: Candidate objects, best first
+    """
+    keywords = extract_keywords(job_offer)
+    candidates = [score_candidate(Candidate(index, response), keywords, adapt_data)
+                  for index, response in enumerate(responses)]
+    return sorted(
+        candidates,
+        key=lambda candidate: (candidate.valid, -len(candidate.errors), candidate.score),
+        reverse=True
+    )
@@ -0,0 +1,387 @@
+import json
+import re
+
+# Repairs reported in RepairResult.repairs
+REPAIR_CODE_FENCE = "code_fence"
+REPAIR_SURROUNDING_TEXT = "surrounding_text"
+REPAIR_TRAILING_COMMA = "trailing_comma"
+REPAIR_MISSING_COMMA = "missing_comma"
+REPAIR_MISSING_COLON = "missing_colon"
+REPAIR_STRAY_TOKEN = "stray_token"
+REPAIR_MISSING_CLOSER = "missing_closer"
+REPAIR_TRUNCATED = "truncated"
+REPAIR_CONTROL_CHARACTER = "control_character"
+REPAIR_INVALID_ESCAPE = "invalid_escape"
+REPAIR_SINGLE_QUOTES = "single_quotes"
+REPAIR_UNQUOTED_KEY = "unquoted_key"
+REPAIR_PYTHON_LITERAL = "python_literal"
+REPAIR_MULTIPLE_OBJECTS = "multiple_objects"
+
+_NUMBER = re.compile(r"-?(0|[1-9][0-9]*)(\.[0-9]+)?([eE][+-]?[0-9]+)?\Z")
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+_LITERALS = {"true": "true", "false": "false", "null": "null"}
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_CLOSERS = {"{": "}", "[": "]"}
+_OPENERS = {"}": "{", "]": "["}
+_ESCAPES = set('"\\/bfnrtu')
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+_BARE_CHARS = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_+-.")
+
+# Container states: what the scanner expects next
+_KEY, _COLON, _VALUE, _COMMA = "key", "colon", "value", "comma"
+
+
+class RepairResult:
+    """Outcome of repair_json"""
+
+    def __init__(self, value, repairs, candidates):
+        self.value = value
+        self.repairs = repairs
+        self.candidates = candidates
+
+    @property
+    def success(self):
+        return self.value is not None
+
+
+class _Container:
+    __slots__ = ("kind", "state")
+
+    def __init__(self, kind, state):
+        self.kind = kind
+        self.state = state
+
+
+class _ObjectScanner:
+    """
+    Repairing scanner for one top-level JSON object
+
+    Consumes characters from a start index and writes a repaired JSON text
+    into a list of chunks. Each character is read once, except whitespace
+    skipped by the one-token lookahead used to classify stray closers.
+    """
+
+    def __init__(self, text, start):
+        self.text = text
+        self.pos = start
+        self.out = []
+        self.stack = []
+        self.repairs = set()
+        # (len(out), [(kind, state), ...]) after the last complete value
+        self.checkpoint = None
+
+    def scan(self):
+        """Return (repaired text, end position) or (None, end position)"""
+        text = self.text
+        length = len(text)
+
+        while self.pos < length:
+            char = text[self.pos]
+
+            if char in " \t\r\n":
+                self.pos += 1
+            elif char == '"' or char == "'":
+                self._string(char)
+            elif char in "{[":
+                self._open(char)
+            elif char in "}]":
+                self._close(char)
+                if not self.stack:
+                    return "".join(self.out), self.pos
+            elif char == ":":
+                self.pos += 1
+                top = self.stack[-1] if self.stack else None
+                if top and top.kind == "{" and top.state == _COLON:
+                    self.out.append(":")
+                    top.state = _VALUE
+                else:
+                    self.repairs.add(REPAIR_STRAY_TOKEN)
+            elif char == ",":
+                self.pos += 1
+                top = self.stack[-1] if self.stack else None
+                if top and top.state == _COMMA:
+                    self.out.append(",")
+                    top.state = _KEY if top.kind == "{" else _VALUE
+                else:
+                    # Leading or doubled comma
+                    self.repairs.add(REPAIR_TRAILING_COMMA)
+            elif char in _BARE_CHARS:
+                self._bare_token()
+            else:
+                # Stray characters such as ")" or "`" between tokens
+                self.repairs.add(REPAIR_STRAY_TOKEN)
+                self.pos += 1
+
+            if not self.stack:
+                return "".join(self.out), self.pos
+
+        return self._finish_truncated(), self.pos
+
+    def _before_value(self):
+        """Prepare the output for a value (or key) that is about to start"""
+        top = self.stack[-1] if self.stack else None
+        if top is None:
+            return
+        if top.state == _COMMA:
+            self.out.append(",")
+            self.repairs.add(REPAIR_MISSING_COMMA)
+            top.state = _KEY if top.kind == "{" else _VALUE
+        if top.state == _COLON:
+            # A key followed directly by its value
+            self.out.append(":")
+            self.repairs.add(REPAIR_MISSING_COLON)
+            top.state = _VALUE
+
+    def _after_value(self):
+        """Mark the value just written as complete"""
+        if self.stack:
+            top = self.stack[-1]
+            top.state = _COMMA if top.state == _VALUE else _COLON
+            if top.state == _COMMA:
+                self.checkpoint = (len(self.out), [(c.kind, c.state) for c in self.stack])
+
+    def _open(self, char):
+        self.pos += 1
+        top = self.stack[-1] if self.stack else None
+        if top and top.kind == "{" and top.state == _KEY:
+            # A container cannot be a key: drop it as a stray token
+            self.repairs.add(REPAIR_STRAY_TOKEN)
+            return
+        self._before_value()
+        self.out.append(char)
+        self.stack.append(_Container(char, _KEY if char == "{" else _VALUE))
+
+    def _close(self, char):
+        self.pos += 1
+        top = self.stack[-1]
+
+        if _OPENERS[char] != top.kind:
+            following = self._peek()
+            if following == _CLOSERS[top.kind] or not any(c.kind == _OPENERS[char] for c in self.stack):
+                # e.g. the "])]" of the prompt skeleton: a closer that matches nothing
+                self.repairs.add(REPAIR_STRAY_TOKEN)
+                return
+            # A closer was forgotten: close the inner containers first
+            while self.stack[-1].kind != _OPENERS[char]:
+                self._close_top()
+                self.repairs.add(REPAIR_MISSING_CLOSER)
+            top = self.stack[-1]
+
+        self._close_top()
+
+    def _close_top(self):
+        top = self.stack[-1]
+        if top.state in (_COLON, _VALUE) and top.kind == "{":
+            # Dangling key ("key" or "key":) before the closer
+            self._rollback_member()
+        elif self.out and self.out[-1] == ",":
+            self.out.pop()
+            self.repairs.add(REPAIR_TRAILING_COMMA)
+        self.out.append(_CLOSERS[top.kind])
+        self.stack.pop()
+        self._after_value()
+
+    def _rollback_member(self):
+        """Remove an object member that has a key but no value"""
+        index = len(self.out) - 1
+        while index >= 0 and self.out[index] not in (",", "{"):
+            index -= 1
+        if self.out[index] == ",":
+            del self.out[index:]
+        else:
+            del self.out[index + 1:]
+        self.repairs.add(REPAIR_TRUNCATED)
+
+    def _peek(self):
+        """Next non-whitespace character, or None"""
+        index = self.pos
+        text = self.text
+        while index < len(text) and text[index] in " \t\r\n":
+            index += 1
+        return text[index] if index < len(text) else None
+
+    def _string(self, quote):
+        text = self.text
+        length = len(text)
+        top = self.stack[-1] if self.stack else None
+        is_key = top is not None and top.kind == "{" and top.state in (_KEY, _COMMA)
+
+        self._before_value()
+        if quote == "'":
+            self.repairs.add(REPAIR_SINGLE_QUOTES)
+
+        chunk = ['"']
+        index = self.pos + 1
+        while index < length:
+            char = text[index]
+            if char == quote:
+                chunk.append('"')
+                self.out.append("".join(chunk))
+                self.pos = index + 1
+                if is_key:
+                    top.state = _COLON
+                else:
+                    self._after_value()
+                return
+            if char == "\\":
+                following = text[index + 1] if index + 1 < length else ""
+                if following in _ESCAPES:
+                    chunk.append(char + following)
+                elif following == "'":
+                    chunk.append("'")
+                    self.repairs.add(REPAIR_INVALID_ESCAPE)
+                elif following:
+                    chunk.append("\\\\" + following)
+                    self.repairs.add(REPAIR_INVALID_ESCAPE)
+                index += 2
+                continue
+            if char == '"':
+                # Double quote inside a single-quoted string
+                chunk.append('\\"')
+            elif char in _CONTROL_ESCAPES:
+                chunk.append(_CONTROL_ESCAPES[char])
+                self.repairs.add(REPAIR_CONTROL_CHARACTER)
+            elif char < " ":
+                chunk.append(f"\\u{ord(char):04x}")
+                self.repairs.add(REPAIR_CONTROL_CHARACTER)
+            else:
+                chunk.append(char)
+            index += 1
+
+        # Truncated inside the string: the partial text is dropped with it
+        self.pos = length
+        self.repairs.add(REPAIR_TRUNCATED)
+
+    def _bare_token(self):
+        text = self.text
+        start = self.pos
+        index = start
+        while index < len(text) and text[index] in _BARE_CHARS:
+            index += 1
+        token = text[start:index]
+        self.pos = index
+
+        top = self.stack[-1] if self.stack else None
+        expects_key = top is not None and top.kind == "{" and top.state in (_KEY, _COMMA)
+
+        if expects_key and _IDENTIFIER.match(token) and self._peek() == ":":
+            self._before_value()
+            self.out.append(json.dumps(token))
+            self.repairs.add(REPAIR_UNQUOTED_KEY)
+            top.state = _COLON
+            return
+
+        if expects_key:
+            self.repairs.add(REPAIR_STRAY_TOKEN)
+            return
+
+        if token in _LITERALS:
+            value = token
+        elif token in _PYTHON_LITERALS:
+            value = _PYTHON_LITERALS[token]
+            self.repairs.add(REPAIR_PYTHON_LITERAL)
+        elif _NUMBER.match(token):
+            value = token
+        else:
+            self.repairs.add(REPAIR_STRAY_TOKEN)
+            return
+
+        self._before_value()
+        self.out.append(value)
+        self._after_value()
+
+    def _finish_truncated(self):
+        """Close a document that ended before its closing brace"""
+        if not self.stack:
+            return "".join(self.out)
+
+        self.repairs.add(REPAIR_TRUNCATED)
+        top = self.stack[-1]
+        just_opened = self.out[-1] in ("{", "[")
+        if top.state != _COMMA and not just_opened:
+            # Cut back to the last complete value
+            if self.checkpoint is None:
+                return None
+            length, stack = self.checkpoint
+            del self.out[length:]
+            self.stack = [_Container(kind, state) for kind, state in stack]
+
+        while self.stack:
+            self.out.append(_CLOSERS[self.stack.pop().kind])
+        return "".join(self.out)
+
+
+def _strip_code_fences(text):
+    stripped = text.strip()
+    if stripped.startswith("```"):
+        newline = stripped.find("\n")
+        stripped = stripped[newline + 1:] if newline != -1 else stripped[3:]
+        if stripped.rstrip().endswith("```"):
+            stripped = stripped.rstrip()[:-3]
+        return stripped, True
+    return text, False
+
+
+def _score(candidate, source_length):
+    """Prefer objects with work/skills content, then the largest ones"""
+    relevant = sum(1 for key in ("work", "skills") if candidate.get(key))
+    return relevant, source_length
+
+
+def repair_json(text, required_keys=("work", "skills")):
+    """
+    Extract and repair the best JSON object of an LLM response
+
+    Scans the text once, repairing each top-level object on the fly:
+    trailing or missing commas, stray tokens (like the "])]" of the prompt
+    skeleton), missing closers, output truncated at max_tokens, raw control
+    characters, single quotes, unquoted keys and Python literals.
+
+    Args:
+        text (str): Raw LLM response
+        required_keys (tuple): Keys of which at least one must be present
+            for a candidate to be accepted (empty to accept any object)
+
+    Returns:
+        RepairResult: value is the largest object containing the most
+        required keys (None if nothing was recovered), repairs lists the
+        repairs applied to it
+    """
+    if not text or not text.strip():
+        return RepairResult(None, [], [])
+
+    text, fenced = _strip_code_fences(text)
+    candidates = []
+    position = text.find("{")
+    surrounding = position > 0 and bool(text[:position].strip())
+
+    while position != -1:
+        scanner = _ObjectScanner(text, position)
+        repaired, end = scanner.scan()
+        if repaired is not None:
+            try:
+                value = json.loads(repaired)
+            except ValueError:
+                value = None
+            if isinstance(value, dict):
+                candidates.append((value, end - position, scanner.repairs))
+        position = text.find("{", max(end, position + 1))
+        if candidates and position != -1 and text[end:position].strip():
+            surrounding = True
+
+    if required_keys:
+        accepted = [c for c in candidates if any(key in c[0] for key in required_keys)]
+    else:
+        accepted = candidates
+    if not accepted:
+        return RepairResult(None, [], [c[0] for c in candidates])
+
+    value, _, repairs = max(accepted, key=lambda c: _score(c[0], c[1]))
+    repairs = set(repairs)
+    if fenced:
+        repairs.add(REPAIR_CODE_FENCE)
+    if surrounding:
+        repairs.add(REPAIR_SURROUNDING_TEXT)
+    if len(candidates) > 1:
+        repairs.add(REPAIR_MULTIPLE_OBJECTS)
+    return RepairResult(value, sorted(repairs), [c[0] for c in candidates])
@@ -0,0 +1,138 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from db.db import load_offer_digest, save_offer_digest
+from local_llm_client import is_error_response, run_llm
+from utils.model_routing import STAGE_OFFER_DIGEST
+from utils.prompt_handler import create_offer_chunk_prompt, create_offer_digest_prompt
+from utils.token_budget import count_tokens, trim_to_tokens
+
+# Offers longer than this are replaced by a requirements digest in the prompts
+DIGEST_THRESHOLD_TOKENS = int(os.environ.get("RESUME_DIGEST_THRESHOLD", "1500"))
+# Size of the parts summarized concurrently (map step)
+CHUNK_TOKENS = 1200
+CHUNK_SUMMARY_MAX_TOKENS = 400
+DIGEST_MAX_TOKENS = 700
+# Concurrent map requests; match the parallel slots configured in LM Studio
+DIGEST_PARALLEL_CALLS = 4
+
+_digests = {}
+_digests_lock = threading.Lock()
+
+
+def offer_hash(job_offer):
+    """sha256 of the job offer text, the key of the digest cache"""
+    return hashlib.sha256(job_offer.strip().encode("utf-8")).hexdigest()
+
+
+def split_offer(job_offer, chunk_tokens=CHUNK_TOKENS):
+    """Split an offer into parts of at most chunk_tokens, on paragraph boundaries where possible"""
+    chunks = []
+    current = []
+    current_tokens = 0
+    for paragraph in (part.strip() for part in job_offer.split("\n\n")):
+        if not paragraph:
+            continue
+        tokens = count_tokens(paragraph)
+        # Paragraphs larger than a chunk are cut into chunk-sized pieces
+        while tokens > chunk_tokens:
+            piece = trim_to_tokens(paragraph, chunk_tokens)
+            if current:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            chunks.append(piece)
+            paragraph = paragraph[len(piece):].strip()
+            tokens = count_tokens(paragraph)
+        if not paragraph:
+            continue
+        if current and current_tokens + tokens > chunk_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(paragraph)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _summarize_chunk(chunk, index, total, progress, tier):
+    prompt, system_message = create_offer_chunk_prompt(chunk, index, total)
+    # Parallel streams would interleave in the GUI, so only forward cancellation
+    muted = progress.muted() if progress is not None else None
+    return run_llm(prompt, system_message, progress=muted, max_tokens=CHUNK_SUMMARY_MAX_TOKENS,
+                   stage=STAGE_OFFER_DIGEST, tier=tier)
+
+
+def build_offer_digest(job_offer, progress=None, tier=None):
+    """
+    Summarize the parts of a long offer concurrently and merge them into one digest
+
+    Returns:
+        tuple: (digest text, number of parts)
+    """
+    chunks = split_offer(job_offer)
+    with ThreadPoolExecutor(max_workers=DIGEST_PARALLEL_CALLS) as executor:
+        futures = [executor.submit(_summarize_chunk, chunk, index, len(chunks), progress, tier)
+                   for index, chunk in enumerate(chunks, 1)]
+        summaries = [future.result() for future in futures]
+
+    failed = [summary for summary in summaries if is_error_response(summary)]
+    if failed:
+        raise RuntimeError(failed[0])
+    if len(summaries) == 1:
+        return summaries[0], 1
+
+    prompt, system_message = create_offer_digest_prompt(summaries)
+    digest = run_llm(prompt, system_message, progress=progress, max_tokens=DIGEST_MAX_TOKENS,
+                     stage=STAGE_OFFER_DIGEST, tier=tier)
+    if is_error_response(digest):
+        raise RuntimeError(digest)
+    return digest, len(chunks)
+
+
+def prepare_job_offer(job_offer, progress=None, tier=None):
+    """
+    Return the offer text to embed in the prompts
+
+    Short offers are used as they are. Long ones are replaced by their
+    requirements digest, computed once per offer hash and cached in memory
+    and in generations.db so that both prompts and later runs reuse it. If the
+    digest cannot be built the full offer is used (and trimmed to the context
+    window by the prompt builders).
+    """
+    if count_tokens(job_offer) <= DIGEST_THRESHOLD_TOKENS:
+        return job_offer
+
+    key = offer_hash(job_offer)
+    with _digests_lock:
+        digest = _digests.get(key)
+    if digest is None:
+        try:
+            digest = load_offer_digest(key)
+        except Exception as e:
+            print(f"⚠️ Could not read the offer digest cache: {e}")
+    if digest is not None:
+        print("♻️ Reusing the cached digest of this job offer")
+        with _digests_lock:
+            _digests[key] = digest
+        return digest
+
+    if progress is not None:
+        progress.check_cancelled()
+        progress.stage("📑 Summarizing the long job offer...")
+    print(f"📑 Job offer has {count_tokens(job_offer)} tokens, building a requirements digest...")
+    try:
+        digest, chunks = build_offer_digest(job_offer, progress, tier)
+    except RuntimeError as e:
+        print(f"⚠️ Could not summarize the job offer, using the full text: {e}")
+        return job_offer
+
+    print(f"📑 Digest of {chunks} parts: {count_tokens(digest)} tokens")
+    with _digests_lock:
+        _digests[key] = digest
+    try:
+        save_offer_digest(key, chunks, digest)
+    except Exception as e:
+        print(f"⚠️ Could not cache the offer digest: {e}")
+    return digest
@@ -0,0 +1,334 @@
+import hashlib
+import os
+import threading
+import time
+from processors.resume_model import Resume, freeze
+from processors.resume_processor import (
+    INPUTS_DIR, PROFILE_FOLDERS, load_adapt_info, load_resume_info
+)
+from utils.file_operations import load_json
+from utils.i18n import DEFAULT_LANGUAGE, language_codes
+from utils.text_vectors import TfidfIndex
+
+# Seconds between two scans of inputs/; requests in between use the index as is
+CHECK_INTERVAL_SECONDS = float(os.environ.get("RESUME_PROFILE_CHECK_SECONDS", "2"))
+
+# Profiles suggested in the GUI for a job offer
+TOP_PROFILES = 3
+
+PROFILE_FILES = ("resume.json", "adapt_info.json", "profile.json")
+
+
+class ProfileNotFound(LookupError):
+    """No profile matches the requested name, language, country or tag"""
+
+
+class Profile:
+    """
+    A resume profile folder of inputs/, parsed once
+
+    Attributes:
+        folder (str): Folder name, also the profile name
+        language (str): Language the profile is written in
+        countries (tuple): Country codes the profile targets
+        tags (tuple): Free-form tags (e.g. "backend", "data")
+        default (bool): Preferred profile of its language
+        resume_data (Resume): resume.json as an immutable model, shared with the adapted resumes
+        adapt_data (Record): adapt_info.json, frozen; thaw() it for a copy to prune and adapt
+        mtimes (tuple): Modification times of PROFILE_FILES when loaded
+        content_hash (str): sha256 of resume.json, the cache key of its rendered static sections
+    """
+
+    def __init__(self, folder, language, countries, tags, default, resume_data, adapt_data, mtimes,
+                 content_hash=None):
+        self.folder = folder
+        self.language = language
+        self.countries = countries
+        self.tags = tags
+        self.default = default
+        self.resume_data = resume_data
+        self.adapt_data = adapt_data
+        self.mtimes = mtimes
+        self.content_hash = content_hash
+
+    def to_dict(self):
+        return {
+            'name': self.folder,
+            'language': self.language,
+            'countries': list(self.countries),
+            'tags': list(self.tags),
+            'default': self.default,
+        }
+
+
+def profile_text(profile):
+    """Label, tags, skills and work bullets of a profile, the text matched against job offers"""
+    parts = [profile.resume_data.get('label', ''), " ".join(profile.tags)]
+    for data in (profile.adapt_data, profile.resume_data):
+        for job in data.get('work', []):
+            parts.append(job.get('title', ''))
+            parts.extend(job.get('summary') or [])
+        for category in data.get('skills', []):
+            parts.append(category.get('category', ''))
+            parts.extend(category.get('items') or category.get('keywords') or [])
+    return "\n".join(part for part in parts if isinstance(part, str))
+
+
+def _profile_mtimes(path):
+    mtimes = []
+    for file_name in PROFILE_FILES:
+        file_path = os.path.join(path, file_name)
+        mtimes.append(os.path.getmtime(file_path) if os.path.exists(file_path) else None)
+    return tuple(mtimes)
+
+
+def _infer_language(folder):
+    for language, legacy_folder in PROFILE_FOLDERS.items():
+        if folder == legacy_folder:
+            return language
+    # Folder suffix: the language code of an i18n catalog (it_es -> Spanish)
+    return language_codes().get(folder.rsplit("_", 1)[-1].lower(), DEFAULT_LANGUAGE)
+
+
+def validate_profile(resume_data, adapt_data):
+    """
+    Check the parts of a profile the generation relies on
+
+    Returns:
+        list: Error messages, empty when the profile is usable
+    """
+    errors = []
+    if not isinstance(resume_data, dict):
+        return ["resume.json is not a JSON object"]
+    for key in ('name', 'label'):
+        if not isinstance(resume_data.get(key), str):
+            errors.append(f"resume.json: '{key}' must be a string")
+    if not isinstance(resume_data.get('work'), list):
+        errors.append("resume.json: 'work' must be a list")
+    if not isinstance(resume_data.get('skills'), list) or not resume_data.get('skills'):
+        errors.append("resume.json: 'skills' must be a non-empty list")
+    if not isinstance(adapt_data, dict):
+        errors.append("adapt_info.json is not a JSON object")
+    else:
+        for key in ('work', 'skills'):
+            if not isinstance(adapt_data.get(key, []), list):
+                errors.append(f"adapt_info.json: '{key}' must be a list")
+    return errors
+
+
+def load_profile(folder, inputs_dir=INPUTS_DIR):
+    """
+    Parse and validate a profile folder
+
+    profile.json is optional: {"language": "Spanish", "countries": ["ES"],
+    "tags": ["backend"], "default": true}. Without it the language comes from
+    the folder suffix (it_es -> Spanish) and the country from the resume's
+    contactInfo.location.countryCode.
+
+    Raises:
+        ValueError: If the profile is not valid
+    """
+    path = os.path.join(inputs_dir, folder)
+    mtimes = _profile_mtimes(path)
+    resume_data = load_resume_info(folder, inputs_dir)
+    with open(os.path.join(path, "resume.json"), "rb") as f:
+        content_hash = hashlib.sha256(f.read()).hexdigest()
+    adapt_data = load_adapt_info(folder, inputs_dir)
+    metadata = load_json(os.path.join(path, "profile.json")) if mtimes[2] is not None else {}
+
+    errors = validate_profile(resume_data, adapt_data)
+    if not isinstance(metadata, dict):
+        errors.append("profile.json is not a JSON object")
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    countries = metadata.get('countries')
+    if countries is None:
+        country = resume_data.get('contactInfo', {}).get('location', {}).get('countryCode')
+        countries = [country] if country else []
+    return Profile(
+        folder=folder,
+        language=metadata.get('language') or _infer_language(folder),
+        countries=tuple(code.upper() for code in countries),
+        tags=tuple(tag.lower() for tag in metadata.get('tags', [])),
+        default=bool(metadata.get('default', folder in PROFILE_FOLDERS.values())),
+        resume_data=Resume.from_dict(resume_data),
+        adapt_data=freeze(adapt_data),
+        mtimes=mtimes,
+        content_hash=content_hash,
+    )
+
+
+class ProfileRegistry:
+    """
+    In-memory index of every profile folder in inputs/
+
+    Folders are parsed once and reloaded only when one of their files
+    changes; the folder is rescanned at most every check_interval seconds, so
+    selecting a profile is a dictionary lookup however many profiles exist.
+    Invalid profiles are left out and their errors kept in self.errors.
+    """
+
+    def __init__(self, inputs_dir=INPUTS_DIR, check_interval=CHECK_INTERVAL_SECONDS):
+        self.inputs_dir = inputs_dir
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._profiles = {}
+        self._by_language = {}
+        self._by_tag = {}
+        self._vectors = TfidfIndex([])
+        self._order = []
+        self._checked_at = None
+        self._invalid = {}
+        self.errors = {}
+
+    def refresh(self, force=False):
+        """Rescan inputs/ and reload the changed profiles when the check interval has passed"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return
+            self._checked_at = now
+
+            folders = []
+            if os.path.isdir(self.inputs_dir):
+                folders = sorted(
+                    entry.name for entry in os.scandir(self.inputs_dir)
+                    if entry.is_dir() and os.path.exists(os.path.join(entry.path, "resume.json"))
+                )
+
+            changed = set(self._profiles) - set(folders)
+            profiles = {}
+            for folder in folders:
+                mtimes = _profile_mtimes(os.path.join(self.inputs_dir, folder))
+                current = self._profiles.get(folder)
+                if current is not None and current.mtimes == mtimes:
+                    profiles[folder] = current
+                    continue
+                if self._invalid.get(folder) == mtimes:
+                    continue
+                changed.add(folder)
+                try:
+                    profiles[folder] = load_profile(folder, self.inputs_dir)
+                    self._invalid.pop(folder, None)
+                    self.errors.pop(folder, None)
+                    print(f"📂 Loaded resume profile '{folder}'")
+                except (ValueError, OSError) as e:
+                    # Not parsed again until one of its files changes
+                    self._invalid[folder] = mtimes
+                    self.errors[folder] = str(e)
+                    print(f"⚠️ Skipping invalid resume profile '{folder}': {e}")
+
+            if changed:
+                self._profiles = profiles
+                self._rebuild_index()
+
+    def _rebuild_index(self):
+        by_language = {}
+        by_tag = {}
+        for profile in self._profiles.values():
+            by_language.setdefault(profile.language.lower(), []).append(profile)
+            for tag in profile.tags:
+                by_tag.setdefault(tag, []).append(profile)
+        self._by_language = by_language
+        self._by_tag = by_tag
+        # Rebuilt only when a profile changes; ranking an offer is then one product
+        self._order = sorted(self._profiles)
+        self._vectors = TfidfIndex([profile_text(self._profiles[folder]) for folder in self._order])
+
+    def profiles(self):
+        """Every valid profile, by folder name"""
+        self.refresh()
+        with self._lock:
+            return sorted(self._profiles.values(), key=lambda profile: profile.folder)
+
+    def names(self):
+        return [profile.folder for profile in self.profiles()]
+
+    def get(self, name):
+        """
+        Profile by folder name
+
+        Raises:
+            ProfileNotFound: If there is no valid profile with that name
+        """
+        self.refresh()
+        with self._lock:
+            profile = self._profiles.get(name)
+        if profile is None:
+            reason = self.errors.get(name)
+            raise ProfileNotFound(f"Resume profile '{name}' " + (f"is invalid: {reason}" if reason else "not found"))
+        return profile
+
+    def _pool(self, language, tag):
+        """Profiles of a language (DEFAULT_LANGUAGE when it has none) with the tag; call with the lock held"""
+        pool = self._by_language.get(language) or self._by_language.get(DEFAULT_LANGUAGE.lower(), [])
+        if tag:
+            tagged = {profile.folder for profile in self._by_tag.get(tag.lower(), [])}
+            pool = [profile for profile in pool if profile.folder in tagged]
+        return pool
+
+    def rank(self, job_offer, language=None, tag=None, k=None):
+        """
+        Profiles of a language and tag ordered by similarity to a job offer
+
+        Returns:
+            list: (Profile, score) tuples, best first; scores are cosine
+                similarities of the hashed TF-IDF vectors, between 0 and 1
+        """
+        self.refresh()
+        language = (language or DEFAULT_LANGUAGE).lower()
+        with self._lock:
+            pool = {profile.folder for profile in self._pool(language, tag)}
+            ranked = [(self._profiles[self._order[index]], score)
+                      for index, score in self._vectors.top(job_offer)
+                      if self._order[index] in pool]
+        return ranked if k is None else ranked[:k]
+
+    def select(self, language=None, country=None, tag=None, job_offer=None):
+        """
+        Best profile for a language, country, tag and job offer
+
+        The tag is required when given. With a job offer the profile most
+        similar to it wins; profiles for the country, then the default
+        profile of the language, break ties. Without a profile in the
+        language, DEFAULT_LANGUAGE profiles are used.
+
+        Raises:
+            ProfileNotFound: If no profile matches
+        """
+        self.refresh()
+        language = (language or DEFAULT_LANGUAGE).lower()
+        country = (country or "").upper()
+        with self._lock:
+            pool = self._pool(language, tag)
+        if not pool:
+            raise ProfileNotFound(
+                f"No resume profile for language '{language}'" + (f" and tag '{tag}'" if tag else "")
+            )
+
+        scores = {}
+        if job_offer:
+            scores = {profile.folder: score for profile, score in self.rank(job_offer, language, tag)}
+        return min(pool, key=lambda profile: (-scores.get(profile.folder, 0.0), country not in profile.countries,
+                                              not profile.default, profile.folder))
+
+    def resolve(self, form_data):
+        """Profile named by the form's 'profile' field, or selected from its language, country, tag and job offer"""
+        if form_data.get('profile'):
+            return self.get(form_data['profile'])
+        return self.select(form_data.get('language'), form_data.get('country_code'),
+                           form_data.get('profile_tag'), form_data.get('job_offer'))
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Shared registry of inputs/, created on first use"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ProfileRegistry()
+        return _registry
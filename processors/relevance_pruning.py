@@ -0,0 +1,180 @@
+import os
+from utils.text_vectors import TfidfIndex
+from utils.token_budget import count_tokens
+
+# Set RESUME_PRUNING=0 to send every bullet and skill to the adaptation
+PRUNING_ENABLED = os.environ.get("RESUME_PRUNING", "1") == "1"
+# Set RESUME_RESTORE_PRUNED=1 to append the pruned items, unadapted, to the final resume
+RESTORE_PRUNED = os.environ.get("RESUME_RESTORE_PRUNED", "0") == "1"
+
+MAX_BULLETS_PER_JOB = int(os.environ.get("RESUME_MAX_BULLETS", "5"))
+MAX_SKILLS_PER_CATEGORY = int(os.environ.get("RESUME_MAX_SKILLS", "8"))
+# Items always kept per job or category, however irrelevant
+MIN_ITEMS = 2
+# Token budget of the work and skills items sent for adaptation
+PRUNE_TOKEN_BUDGET = int(os.environ.get("RESUME_PRUNE_BUDGET", "900"))
+# Bullet marker and line break added by adapt_info_to_text
+ITEM_OVERHEAD_TOKENS = 2
+
+
+class _Item:
+    def __init__(self, kind, group, text):
+        self.kind = kind
+        self.group = group
+        self.text = text
+        self.score = 0.0
+        self.tokens = count_tokens(text) + ITEM_OVERHEAD_TOKENS
+        self.kept = True
+
+
+def _collect_items(adapt_data):
+    items = []
+    for group, job in enumerate(adapt_data.get('work', [])):
+        items += [_Item('work', group, point) for point in job.get('summary') or []]
+    for group, category in enumerate(adapt_data.get('skills', [])):
+        items += [_Item('skills', group, skill) for skill in category.get('items') or []]
+    return items
+
+
+def _cap_groups(items):
+    groups = {}
+    for item in items:
+        groups.setdefault((item.kind, item.group), []).append(item)
+    for (kind, _), members in groups.items():
+        limit = MAX_BULLETS_PER_JOB if kind == 'work' else MAX_SKILLS_PER_CATEGORY
+        for item in sorted(members, key=lambda member: member.score, reverse=True)[max(limit, MIN_ITEMS):]:
+            item.kept = False
+    return groups
+
+
+def _fit_budget(items, groups, budget):
+    total = sum(item.tokens for item in items if item.kept)
+    for item in sorted((item for item in items if item.kept), key=lambda item: item.score):
+        if total <= budget:
+            break
+        if sum(1 for member in groups[(item.kind, item.group)] if member.kept) <= MIN_ITEMS:
+            continue
+        item.kept = False
+        total -= item.tokens
+
+
+def prune_adapt_data(adapt_data, job_offer, budget=PRUNE_TOKEN_BUDGET):
+    """
+    Keep the work bullets and skills most relevant to the job offer
+
+    Every bullet and skill item is scored against the offer with the hashed
+    TF-IDF vectors of utils/text_vectors.py. The best MAX_BULLETS_PER_JOB
+    bullets per job and MAX_SKILLS_PER_CATEGORY items per category are kept,
+    then the least relevant ones are dropped until the items fit the token
+    budget. At least MIN_ITEMS stay in every job and category, jobs and
+    categories are never removed, and kept items keep their original order.
+
+    Args:
+        adapt_data (dict): Profile work and skills to adapt (not modified)
+        job_offer (str): Offer text (or its digest) to score against
+        budget (int): Token budget of the kept items
+
+    Returns:
+        tuple: (pruned adapt data, pruned items for merge_resume_data as
+            {'work': [{'title', 'company', 'summary'} per job],
+             'skills': [{'category', 'items'} per category]})
+    """
+    items = _collect_items(adapt_data)
+    if items:
+        for item, score in zip(items, TfidfIndex([item.text for item in items]).scores(job_offer)):
+            item.score = score
+        groups = _cap_groups(items)
+        _fit_budget(items, groups, budget)
+
+    work = [dict(job) for job in adapt_data.get('work', [])]
+    skills = [dict(category) for category in adapt_data.get('skills', [])]
+    pruned = {
+        'work': [{'title': job.get('title'), 'company': job.get('company'), 'summary': []} for job in work],
+        'skills': [{'category': category.get('category'), 'items': []} for category in skills],
+    }
+    for job in work:
+        if 'summary' in job:
+            job['summary'] = []
+    for category in skills:
+        if 'items' in category:
+            category['items'] = []
+
+    for item in items:
+        target = work[item.group]['summary'] if item.kind == 'work' else skills[item.group]['items']
+        if item.kept:
+            target.append(item.text)
+        elif item.kind == 'work':
+            pruned['work'][item.group]['summary'].append(item.text)
+        else:
+            pruned['skills'][item.group]['items'].append(item.text)
+
+    removed = sum(not item.kept for item in items)
+    if removed:
+        before = sum(item.tokens for item in items)
+        after = sum(item.tokens for item in items if item.kept)
+        print(f"✂️ Pruned {removed} of {len(items)} bullets and skills less relevant to the offer "
+              f"(~{before} -> ~{after} tokens)")
+    return dict(adapt_data, work=work, skills=skills), pruned
+
+
+def _restore_target(entries, position, matches):
+    """Index of the first entry matching the pruned one, else the one at its position"""
+    target = next((index for index, entry in enumerate(entries) if matches(entry)), None)
+    if target is None and position < len(entries):
+        target = position
+    return target
+
+
+def restore_pruned_items(final_resume, pruned):
+    """
+    Append the pruned bullets and skills back to a merged resume
+
+    Bullets go back to the job with the same title and company, skills to
+    the category with the same name, or to the entry at the same position
+    when it was renamed. Only the jobs and categories that get items back
+    are rebuilt, the rest are shared with the given resume.
+
+    Args:
+        final_resume (Resume): Merged resume (not modified)
+        pruned (dict): Pruned items returned by prune_adapt_data
+
+    Returns:
+        Resume: The resume with the pruned items restored
+    """
+    work = list(final_resume.work or ())
+    bullets = 0
+    for position, entry in enumerate(pruned.get('work', [])):
+        if not entry['summary']:
+            continue
+        target = _restore_target(work, position, lambda job: (job.title, job.company) ==
+                                 (entry['title'], entry['company']))
+        if target is None:
+            continue
+        summary = work[target].summary or ()
+        missing = tuple(bullet for bullet in entry['summary'] if bullet not in summary)
+        if missing:
+            work[target] = work[target].replace(summary=summary + missing)
+        bullets += len(missing)
+
+    categories = list(final_resume.skills or ())
+    restored = 0
+    for position, entry in enumerate(pruned.get('skills', [])):
+        if not entry['items']:
+            continue
+        target = _restore_target(categories, position, lambda category: category.category == entry['category'])
+        if target is None:
+            continue
+        existing = categories[target].skill_items or ()
+        missing = tuple(item for item in entry['items'] if item not in existing)
+        if missing:
+            categories[target] = categories[target].replace(skill_items=existing + missing)
+        restored += len(missing)
+
+    if bullets or restored:
+        print(f"♻️ Restored {bullets} pruned bullets and {restored} pruned skills")
+    changes = {}
+    if final_resume.work is not None:
+        changes['work'] = tuple(work)
+    if final_resume.skills is not None:
+        changes['skills'] = tuple(categories)
+    return final_resume.replace(**changes)
@@ -0,0 +1,145 @@
+import os
+import re
+import threading
+from processors.candidate_ranking import extract_keywords
+from processors.resume_processor import INPUTS_DIR
+from utils.text_vectors import tokenize
+
+MAX_ACHIEVEMENTS = 5
+MAX_SKILLS = 15
+SUMMARY_SENTENCES = 2
+
+# Profile header (name, label, summary, education, languages) per profile
+# folder, rebuilt only when the folder's resume.json changes
+_header_cache = {}
+_header_lock = threading.Lock()
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def _first_sentences(text, count=SUMMARY_SENTENCES):
+    return " ".join(_SENTENCE_END.split(text.strip())[:count])
+
+
+def _build_header(resume_data):
+    lines = [f"CANDIDATE: {resume_data.get('name', '')} - {resume_data.get('label', '')}"]
+    if resume_data.get('summary'):
+        lines.append(f"PROFILE: {_first_sentences(resume_data['summary'])}")
+
+    education = [
+        ", ".join(part for part in (entry.get('studyType'), entry.get('course'), entry.get('institution')) if part)
+        for entry in resume_data.get('education', [])
+    ]
+    if education:
+        lines.append(f"EDUCATION: {'; '.join(education)}")
+
+    languages = [
+        f"{entry.get('language', '')} ({entry['fluency']})" if entry.get('fluency') else entry.get('language', '')
+        for entry in resume_data.get('languages', [])
+    ]
+    if languages:
+        lines.append(f"LANGUAGES: {', '.join(languages)}")
+    return "\n".join(lines)
+
+
+def profile_header(resume_data, folder=None):
+    """
+    Invariant part of the digest, cached per profile folder
+
+    Args:
+        resume_data (dict): Resume with the profile's name, label and summary
+        folder (str, optional): inputs/ folder of the profile; without it the
+            header is built every time
+    """
+    if folder is None:
+        return _build_header(resume_data)
+
+    path = os.path.join(INPUTS_DIR, folder, "resume.json")
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    with _header_lock:
+        cached = _header_cache.get(folder)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    header = _build_header(resume_data)
+    with _header_lock:
+        _header_cache[folder] = (mtime, header)
+    return header
+
+
+def _achievement_relevance(point, keywords):
+    # Whole tokens, so that 'java' does not match 'javascript'
+    words = set(tokenize(point))
+    relevance = sum(1 for keyword in keywords if keyword in words)
+    if any(char.isdigit() for char in point):
+        # Quantified achievements read best in a cover letter
+        relevance += 0.5
+    return relevance
+
+
+def top_achievements(work, keywords, limit=MAX_ACHIEVEMENTS):
+    """
+    Bullets that match the offer keywords or are quantified, most relevant and recent first
+
+    Falls back to the first bullets of the current role when none is relevant.
+    """
+    scored = []
+    for job_index, job in enumerate(work):
+        for point in job.get('summary') or []:
+            relevance = _achievement_relevance(point, keywords)
+            if relevance:
+                scored.append((relevance + 0.5 / (job_index + 1), point))
+    if not scored:
+        return list((work[0].get('summary') or [])[:limit]) if work else []
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [point for _, point in scored[:limit]]
+
+
+def relevant_skills(skills, keywords, limit=MAX_SKILLS):
+    """Skills mentioned by the offer first, then the rest in resume order"""
+    items = []
+    for category in skills:
+        for item in category.get('items') or category.get('keywords') or []:
+            if item not in items:
+                items.append(item)
+    keywords = set(keywords)
+    matching = [item for item in items if not keywords.isdisjoint(tokenize(item))]
+    return (matching + [item for item in items if item not in matching])[:limit]
+
+
+def build_resume_digest(resume_data, job_offer, folder=None):
+    """
+    Compact resume summary for the cover letter prompt
+
+    Keeps the role, the achievements and the skills most relevant to the
+    offer and leaves out contact details, profile URLs and the other bullets.
+
+    Args:
+        resume_data (dict): Final (adapted) resume
+        job_offer (str): Offer text used to rank achievements and skills
+        folder (str, optional): Profile folder, the cache key of the header
+
+    Returns:
+        str: The digest text
+    """
+    keywords = extract_keywords(job_offer)
+    lines = [profile_header(resume_data, folder)]
+
+    work = resume_data.get('work') or []
+    if work:
+        current = work[0]
+        dates = f" ({current['startDate']} - {current['endDate']})" if current.get('startDate') else ""
+        lines.append(f"CURRENT ROLE: {current.get('title', '')} at {current.get('company', '')}{dates}")
+        previous = [f"{job.get('title', '')} at {job.get('company', '')}" for job in work[1:]]
+        if previous:
+            lines.append(f"PREVIOUS ROLES: {'; '.join(previous)}")
+
+    achievements = top_achievements(work, keywords)
+    if achievements:
+        lines.append("TOP ACHIEVEMENTS:")
+        lines.extend(f"• {point}" for point in achievements)
+
+    skills = relevant_skills(resume_data.get('skills') or [], keywords)
+    if skills:
+        lines.append(f"RELEVANT SKILLS: {', '.join(skills)}")
+    return "\n".join(lines) + "\n"
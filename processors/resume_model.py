@@ -0,0 +1,197 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+
+
+class _Model(Mapping):
+    """
+    Read-only mapping view of a model, by the JSON keys of resume.json
+
+    The renderers, the digest and the prompts read resumes with
+    resume['work'], resume.get('summary') and 'key' in resume; models answer
+    those the same way as the JSON dicts, so they can be passed anywhere a
+    resume dict is read. Attributes set to None are treated as absent keys.
+    Keys the model does not know are kept, frozen, in `extra`.
+    """
+
+    __slots__ = ()
+    # (JSON key, attribute, converter) of the known fields, set on each subclass
+    FIELDS = ()
+
+    def __getitem__(self, key):
+        for json_key, attribute, _ in self.FIELDS:
+            if json_key == key:
+                value = getattr(self, attribute)
+                if value is None:
+                    raise KeyError(key)
+                return value
+        for extra_key, value in self.extra:
+            if extra_key == key:
+                return value
+        raise KeyError(key)
+
+    def __iter__(self):
+        for json_key, attribute, _ in self.FIELDS:
+            if getattr(self, attribute) is not None:
+                yield json_key
+        for extra_key, _ in self.extra:
+            yield extra_key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build the model from its JSON shape"""
+        known = {json_key for json_key, _, _ in cls.FIELDS}
+        values = {attribute: None if data.get(json_key) is None else converter(data[json_key])
+                  for json_key, attribute, converter in cls.FIELDS}
+        extra = tuple((key, freeze(value)) for key, value in data.items() if key not in known)
+        return cls(**values, extra=extra)
+
+    def to_dict(self):
+        """JSON shape of the model, as plain dicts and lists"""
+        return {key: thaw(value) for key, value in self.items()}
+
+    def replace(self, **changes):
+        """Copy with some attributes changed; the others are shared, not copied"""
+        return replace(self, **changes)
+
+
+@dataclass(frozen=True, slots=True)
+class Record(_Model):
+    """Frozen dict of keys the model does not know (profile links, languages, ...)"""
+    extra: tuple = ()
+
+
+def freeze(value):
+    """Frozen copy of a JSON value: dicts become Records and lists tuples"""
+    if isinstance(value, _Model):
+        return value
+    if isinstance(value, Mapping):
+        return Record(extra=tuple((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Plain JSON value of a frozen one"""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def _strings(values):
+    return tuple(values)
+
+
+def _models(model):
+    return lambda values: tuple(model.from_dict(value) for value in values)
+
+
+@dataclass(frozen=True, slots=True)
+class Location(_Model):
+    city: str = None
+    country_code: str = None
+    extra: tuple = ()
+
+    FIELDS = (('city', 'city', str), ('countryCode', 'country_code', str))
+
+
+@dataclass(frozen=True, slots=True)
+class ContactInfo(_Model):
+    email: str = None
+    phone: str = None
+    location: Location = None
+    extra: tuple = ()
+
+    FIELDS = (('email', 'email', str), ('phone', 'phone', str), ('location', 'location', Location.from_dict))
+
+
+@dataclass(frozen=True, slots=True)
+class Job(_Model):
+    title: str = None
+    company: str = None
+    start_date: str = None
+    end_date: str = None
+    location: object = None
+    summary: tuple = None
+    extra: tuple = ()
+
+    FIELDS = (('title', 'title', str), ('company', 'company', str), ('startDate', 'start_date', str),
+              ('endDate', 'end_date', str), ('location', 'location', freeze), ('summary', 'summary', _strings))
+
+
+@dataclass(frozen=True, slots=True)
+class SkillCategory(_Model):
+    category: str = None
+    # Not `items`, which would hide Mapping.items()
+    skill_items: tuple = None
+    extra: tuple = ()
+
+    FIELDS = (('category', 'category', str), ('items', 'skill_items', _strings))
+
+
+@dataclass(frozen=True, slots=True)
+class Project(_Model):
+    name: str = None
+    description: str = None
+    link: str = None
+    extra: tuple = ()
+
+    FIELDS = (('name', 'name', str), ('description', 'description', str), ('link', 'link', str))
+
+
+@dataclass(frozen=True, slots=True)
+class Education(_Model):
+    study_type: str = None
+    course: str = None
+    institution: str = None
+    start_date: str = None
+    end_date: str = None
+    location: object = None
+    extra: tuple = ()
+
+    FIELDS = (('studyType', 'study_type', str), ('course', 'course', str), ('institution', 'institution', str),
+              ('startDate', 'start_date', str), ('endDate', 'end_date', str), ('location', 'location', freeze))
+
+
+@dataclass(frozen=True, slots=True)
+class Resume(_Model):
+    """
+    Immutable resume
+
+    Adapted variants are built with replace(work=..., skills=...), so they
+    share the contact details, profiles, projects, education and any
+    unchanged job or skill category with the base profile instead of
+    copying them.
+    """
+    name: str = None
+    label: str = None
+    summary: str = None
+    contact_info: ContactInfo = None
+    profiles: tuple = None
+    work: tuple = None
+    skills: tuple = None
+    projects: tuple = None
+    education: tuple = None
+    extra: tuple = field(default=())
+
+    FIELDS = (
+        ('name', 'name', str),
+        ('label', 'label', str),
+        ('summary', 'summary', str),
+        ('contactInfo', 'contact_info', ContactInfo.from_dict),
+        ('profiles', 'profiles', freeze),
+        ('work', 'work', _models(Job)),
+        ('skills', 'skills', _models(SkillCategory)),
+        ('projects', 'projects', _models(Project)),
+        ('education', 'education', _models(Education)),
+    )
+
+
+def as_resume(resume_data):
+    """The Resume model of a resume dict, or the model itself"""
+    return resume_data if isinstance(resume_data, Resume) else Resume.from_dict(resume_data)
@@ -1,11 +1,34 @@
 import json
+import os
+from generators.resume_renderer import AdaptTextWriter, TextWriter, render_resume
+from processors.json_repair import repair_json
+from processors.relevance_pruning import restore_pruned_items
+from processors.resume_model import Resume, as_resume
 from utils.file_operations import load_json, save_json, save_text
 
+# Folder holding one sub-folder per resume profile
+INPUTS_DIR = os.environ.get("RESUME_INPUTS_DIR", "inputs")
 
-def load_adapt_info(folder="it_jobs"):
+# Default resume profile folder in inputs/ for each language
+PROFILE_FOLDERS = {
+    'English': "it_en",
+    'Spanish': "it_es",
+    'German': "it_de",
+}
+
+# Job attributes always taken from the base resume, never from the adaptation
+BASE_JOB_FIELDS = ('company', 'title', 'start_date', 'end_date', 'location')
+
+
+def profile_folder_for_language(language):
+    """Return the inputs/ folder of the resume profile for a language"""
+    return PROFILE_FOLDERS.get(language, PROFILE_FOLDERS['English'])
+
+
+def load_adapt_info(folder="it_jobs", inputs_dir=INPUTS_DIR):
     """Load the work experience and skills to adapt from adapt_info.json"""
     try:
-        return load_json("inputs/{folder}/adapt_info.json")
+        return load_json(os.path.join(inputs_dir, folder, "adapt_info.json"))
     except FileNotFoundError:
         # Return default structure if file doesn't exist
         return {
@@ -14,112 +37,87 @@ def load_adapt_info(folder="it_jobs"):
         }
 
 
-def load_resume_info(folder="it_jobs"):
+def load_resume_info(folder="it_jobs", inputs_dir=INPUTS_DIR):
     """Load the base resume data from resume.json"""
+    path = os.path.join(inputs_dir, folder, "resume.json")
     try:
-        return load_json(f"inputs/{folder}/resume.json")
+        return load_json(path)
     except FileNotFoundError:
-        raise FileNotFoundError("Base resume file not found: inputs/it_jobs/resume.json")
+        raise FileNotFoundError(f"Base resume file not found: {path}")
 
 
 def adapt_info_to_text(adapt_data):
     """Convert adapt_info JSON to formatted text for work experience and skills only"""
-    text = ""
-
-    # Work Experience section
-    if 'work' in adapt_data and adapt_data['work']:
-        text += "WORK EXPERIENCE TO ADAPT:\n"
-        for job in adapt_data['work']:
-            text += f"\n{job['title']} at {job['company']}"
-            if 'startDate' in job and 'endDate' in job:
-                text += f" ({job['startDate']} - {job['endDate']})"
-            text += "\n"
-
-            if 'summary' in job:
-                for point in job['summary']:
-                    text += f"• {point}\n"
-        text += "\n"
-
-    # Skills section
-    if 'skills' in adapt_data and adapt_data['skills']:
-        text += "SKILLS TO ADAPT:\n"
-        for skill_category in adapt_data['skills']:
-            if 'category' in skill_category and 'items' in skill_category:
-                text += f"\n{skill_category['category']}:\n"
-                for skill in skill_category['items']:
-                    text += f"• {skill}\n"
-        text += "\n"
-
-    return text
+    return render_resume(adapt_data, [AdaptTextWriter()], sections=('work', 'skills'))[0]
 
 
 def json_to_resume_text(resume_data):
     """Convert resume JSON to formatted text"""
-    resume_text = f"{resume_data['name']}\n{resume_data['label']}\n\n"
-    resume_text += f"Contact: {resume_data['contactInfo']['email']} | {resume_data['contactInfo']['phone']}\n"
-    resume_text += f"Location: {resume_data['contactInfo']['location']['city']}, {resume_data['contactInfo']['location']['countryCode']}\n\n"
+    return render_resume(resume_data, [TextWriter()])[0]
 
-    if 'profiles' in resume_data and resume_data['profiles']:
-        profile = resume_data['profiles'][0]
-        resume_text += "Profiles:\n"
-        for key, value in profile.items():
-            resume_text += f"{key.capitalize()}: {value}\n"
-        resume_text += "\n"
 
-    if 'summary' in resume_data:
-        resume_text += "Summary:\n"
-        resume_text += f"{resume_data['summary']}\n\n"
+def extract_json_object(response_text, required_keys=()):
+    """
+    Extract and parse the JSON object of an LLM response
 
-    if 'work' in resume_data:
-        resume_text += "Work Experience:\n"
-        for job in resume_data['work']:
-            resume_text += f"\n{job['title']} at {job['company']}"
-            if 'startDate' in job and 'endDate' in job:
-                resume_text += f" ({job['startDate']} - {job['endDate']})"
-            resume_text += "\n"
+    Clean responses are parsed directly; anything else goes through the
+    tolerant scanner of processors.json_repair.
 
-            if 'summary' in job:
-                for point in job['summary']:
-                    resume_text += f"• {point}\n"
+    Args:
+        response_text (str): Raw LLM response
+        required_keys (tuple): Keys of which at least one must be present
 
-    return resume_text
+    Raises:
+        ValueError: If the response is empty or no valid object can be recovered
+    """
+    if not response_text or response_text.strip() == "":
+        raise ValueError("Empty response from LLM")
 
+    # Clean the response to extract JSON
+    cleaned_response = response_text.strip()
 
-def parse_llm_json_response(response_text):
-    """Parse LLM response and extract JSON with error handling"""
-    try:
-        if not response_text or response_text.strip() == "":
-            raise ValueError("Empty response from LLM")
+    # Remove common markdown formatting
+    if cleaned_response.startswith('```json'):
+        cleaned_response = cleaned_response[7:]
+    elif cleaned_response.startswith('```'):
+        cleaned_response = cleaned_response[3:]
+
+    if cleaned_response.endswith('```'):
+        cleaned_response = cleaned_response[:-3]
 
-        # Clean the response to extract JSON
-        cleaned_response = response_text.strip()
+    cleaned_response = cleaned_response.strip()
 
-        # Remove common markdown formatting
-        if cleaned_response.startswith('```json'):
-            cleaned_response = cleaned_response[7:]
-        elif cleaned_response.startswith('```'):
-            cleaned_response = cleaned_response[3:]
+    # Try to find JSON in the response if it's mixed with other text
+    if not cleaned_response.startswith('{'):
+        start_idx = cleaned_response.find('{')
+        if start_idx != -1:
+            cleaned_response = cleaned_response[start_idx:]
 
-        if cleaned_response.endswith('```'):
-            cleaned_response = cleaned_response[:-3]
+    if not cleaned_response.endswith('}'):
+        end_idx = cleaned_response.rfind('}')
+        if end_idx != -1:
+            cleaned_response = cleaned_response[:end_idx + 1]
 
-        cleaned_response = cleaned_response.strip()
+    print(f"🧹 Cleaned response (first 200 chars): {repr(cleaned_response[:200])}")
 
-        # Try to find JSON in the response if it's mixed with other text
-        if not cleaned_response.startswith('{'):
-            start_idx = cleaned_response.find('{')
-            if start_idx != -1:
-                cleaned_response = cleaned_response[start_idx:]
+    try:
+        parsed = json.loads(cleaned_response)
+        if isinstance(parsed, dict) and (not required_keys or any(key in parsed for key in required_keys)):
+            return parsed
+    except json.JSONDecodeError as e:
+        print(f"⚠️ Direct JSON parsing failed ({e}), trying to repair the response")
 
-        if not cleaned_response.endswith('}'):
-            end_idx = cleaned_response.rfind('}')
-            if end_idx != -1:
-                cleaned_response = cleaned_response[:end_idx + 1]
+    result = repair_json(response_text, required_keys)
+    if not result.success:
+        raise ValueError("No valid JSON object found in the response")
+    print(f"🔧 JSON recovered with repairs: {', '.join(result.repairs) or 'none'}")
+    return result.value
 
-        print(f"🧹 Cleaned response (first 200 chars): {repr(cleaned_response[:200])}")
 
-        # Parse JSON
-        adapted_content = json.loads(cleaned_response)
+def parse_llm_json_response(response_text):
+    """Parse LLM response and extract JSON with error handling"""
+    try:
+        adapted_content = extract_json_object(response_text, ('work', 'skills'))
         print("✅ JSON parsing successful!")
 
         # Validate required fields
@@ -134,30 +132,45 @@ def parse_llm_json_response(response_text):
         return None, False
 
 
-def merge_resume_data(base_resume, adapted_content):
-    """Merge adapted work/skills with base resume data"""
-    final_resume = base_resume.copy()
+def merge_resume_data(base_resume, adapted_content, pruned=None):
+    """
+    Merge adapted work/skills with base resume data
+
+    The result is a new immutable Resume (processors/resume_model.py) that
+    shares every unchanged section with the base one; nothing is copied or
+    modified, so the base can stay cached in the profile registry.
+
+    Args:
+        base_resume (Resume or dict): Profile resume.json
+        adapted_content (dict): Adapted work and skills
+        pruned (dict, optional): Items left out of the adaptation by
+            prune_adapt_data, appended back unadapted when given
+
+    Returns:
+        Resume: The final resume; to_dict() gives its JSON shape
+    """
+    base_resume = as_resume(base_resume)
+    changes = {}
 
     if 'work' in adapted_content:
-        final_resume['work'] = adapted_content['work']
+        work = list(Resume.from_dict({'work': adapted_content['work']}).work or ())
         print(f"📊 Work experience adapted: {len(adapted_content['work'])} jobs")
-
-    # To keep consistency with the base resume,s
-    # Reset company name and dates in work experience
-    for base_job, final_job in zip(base_resume['work'], final_resume['work']):
-        final_job.update({k: v for k, v in base_job.items() if k in ['company','title', 'startDate', 'endDate', 'location']})
+        # To keep consistency with the base resume,
+        # reset company name, title, dates and location in work experience
+        for index, base_job in enumerate((base_resume.work or ())[:len(work)]):
+            work[index] = work[index].replace(**{attribute: getattr(base_job, attribute) for attribute in BASE_JOB_FIELDS
+                                                 if getattr(base_job, attribute) is not None})
+        changes['work'] = tuple(work)
 
     if 'skills' in adapted_content:
-        final_resume['skills'] = adapted_content['skills']
+        skills = Resume.from_dict({'skills': adapted_content['skills']}).skills or ()
         print(f"🎯 Skills adapted: {len(adapted_content['skills'])} categories")
+        # Add language skills from base resume, shared rather than copied
+        changes['skills'] = skills + base_resume.skills[-1:]
 
-        # Add language skills from base resume if not already present
-        language_skills = base_resume['skills'][-1]
-        # language_skills['category'] = 'Languages'
-        # language_skills['items'] = base_resume['skills'][-1]['items']
-        final_resume['skills'].append(language_skills)
-
-        print(f"🎯 Skills LANGUAGE: {final_resume} ")
+    final_resume = base_resume.replace(**changes)
+    if pruned:
+        final_resume = restore_pruned_items(final_resume, pruned)
 
     return final_resume
 
@@ -0,0 +1,135 @@
+import copy
+from functools import lru_cache
+from utils.response_schema import build_adaptation_json_schema
+
+# Fields the renderers index directly; the rest of the schema stays optional
+RENDER_REQUIRED_FIELDS = {
+    'work': ("title", "company", "summary"),
+    'skills': ("category", "items"),
+}
+
+_TYPES = {
+    "string": (str,),
+    "array": (list,),
+    "object": (dict,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+}
+
+_TYPE_NAMES = {str: "string", list: "array", dict: "object", int: "integer", float: "number",
+               bool: "boolean", type(None): "null"}
+
+
+def _type_name(value):
+    return _TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+def compile_schema(schema):
+    """
+    Compile a JSON-schema subset into a check(value, path, errors) function
+
+    Supports type, properties, required, items, minItems and minLength, which
+    is all the adaptation schema uses. The schema is walked once here so that
+    each validation only runs the prebuilt closures.
+    """
+    kind = schema.get("type")
+    expected = _TYPES[kind]
+
+    if kind == "object":
+        properties = [(name, compile_schema(sub)) for name, sub in schema.get("properties", {}).items()]
+        required = tuple(schema.get("required", ()))
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{path}: expected object, got {_type_name(value)}")
+                return
+            for name in required:
+                if name not in value:
+                    errors.append(f"{path}.{name}: missing")
+            for name, check_property in properties:
+                if name in value:
+                    check_property(value[name], f"{path}.{name}", errors)
+
+    elif kind == "array":
+        check_item = compile_schema(schema["items"]) if "items" in schema else None
+        min_items = schema.get("minItems", 0)
+
+        def check(value, path, errors):
+            if not isinstance(value, list):
+                errors.append(f"{path}: expected array, got {_type_name(value)}")
+                return
+            if len(value) < min_items:
+                errors.append(f"{path}: expected at least {min_items} items, got {len(value)}")
+            if check_item is not None:
+                for index, item in enumerate(value):
+                    check_item(item, f"{path}[{index}]", errors)
+
+    else:
+        min_length = schema.get("minLength", 0)
+
+        def check(value, path, errors):
+            if not isinstance(value, expected) or (isinstance(value, bool) and kind != "boolean"):
+                errors.append(f"{path}: expected {kind}, got {_type_name(value)}")
+            elif min_length and len(value.strip() if isinstance(value, str) else value) < min_length:
+                errors.append(f"{path}: must not be empty")
+
+    return check
+
+
+def _adaptation_schema():
+    """The adaptation response schema with the render-critical fields required"""
+    # The schema shares its property dicts with templates/schema.py
+    schema = copy.deepcopy(build_adaptation_json_schema())
+    schema["required"] = []
+    for section, fields in RENDER_REQUIRED_FIELDS.items():
+        entry = schema["properties"][section]["items"]
+        entry["required"] = list(fields)
+        for field in fields:
+            if entry["properties"][field]["type"] == "string":
+                entry["properties"][field]["minLength"] = 1
+            else:
+                entry["properties"][field]["minItems"] = 1
+    return schema
+
+
+@lru_cache(maxsize=None)
+def _compiled_validators():
+    schema = _adaptation_schema()
+    return {
+        'adaptation': compile_schema(schema),
+        'work': compile_schema(schema["properties"]["work"]["items"]),
+        'skills': compile_schema(schema["properties"]["skills"]["items"]),
+    }
+
+
+def validate_adapted_content(content, expected_work_count=None):
+    """
+    Validate the parsed adaptation response before it is merged and rendered
+
+    Args:
+        content (dict): Parsed LLM response with work and/or skills
+        expected_work_count (int, optional): Number of jobs sent for adaptation
+
+    Returns:
+        list: Error messages such as "work[1].summary[0]: expected string, got null"
+              (empty when the content is valid)
+    """
+    errors = []
+    _compiled_validators()['adaptation'](content, "$", errors)
+    if errors:
+        return [error.replace("$.", "", 1) for error in errors]
+
+    if 'work' not in content and 'skills' not in content:
+        errors.append("response contains neither work nor skills")
+    work = content.get('work')
+    if expected_work_count is not None and work is not None and len(work) != expected_work_count:
+        errors.append(f"work: expected {expected_work_count} entries, got {len(work)}")
+    return errors
+
+
+def validate_section_piece(kind, piece):
+    """Validate one adapted job ('work') or skill category ('skills')"""
+    errors = []
+    _compiled_validators()[kind](piece, kind, errors)
+    return errors
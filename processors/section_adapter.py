@@ -0,0 +1,121 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from local_llm_client import run_llm
+from processors.resume_processor import adapt_info_to_text, extract_json_object
+from processors.resume_validator import validate_section_piece
+from utils.model_routing import STAGE_SECTION_ADAPTATION
+from utils.prompt_handler import create_job_adaptation_prompt, create_skill_adaptation_prompt
+from utils.response_schema import build_job_response_format, build_skill_category_response_format
+from utils.token_budget import adaptation_output_budget, fit_prompt
+
+ADAPTATION_MODE_SINGLE = "single"
+ADAPTATION_MODE_SECTIONS = "sections"
+
+# Default mode when the form does not choose one
+DEFAULT_ADAPTATION_MODE = os.environ.get("RESUME_ADAPTATION_MODE", ADAPTATION_MODE_SINGLE)
+
+# Concurrent requests; match the parallel slots configured in LM Studio
+PARALLEL_SLOTS = 4
+
+# Extra attempts for a section whose response is invalid
+MAX_SECTION_RETRIES = 2
+
+
+class Section:
+    """One independently adapted piece of adapt_info.json (a job or a skill category)"""
+
+    def __init__(self, kind, index, original):
+        self.kind = kind
+        self.index = index
+        self.original = original
+        self.adapted = None
+        self.attempts = 0
+        self.errors = []
+
+    @property
+    def label(self):
+        if self.kind == 'work':
+            return f"{self.original.get('title', '')} at {self.original.get('company', '')}"
+        return self.original.get('category', '')
+
+
+def split_adapt_data(adapt_data):
+    """Split adapt_info.json into one section per job and per skill category"""
+    sections = [Section('work', index, job) for index, job in enumerate(adapt_data.get('work', []))]
+    sections += [Section('skills', index, category) for index, category in enumerate(adapt_data.get('skills', []))]
+    return sections
+
+
+def _adapt_section(section, job_offer, language, progress, tier=None):
+    """Run one LLM request for a section and return the parsed, validated piece"""
+    if progress is not None:
+        progress.check_cancelled()
+
+    section_text = adapt_info_to_text({section.kind: [section.original]})
+    if section.kind == 'work':
+        create_prompt = create_job_adaptation_prompt
+        response_format = build_job_response_format()
+    else:
+        create_prompt = create_skill_adaptation_prompt
+        response_format = build_skill_category_response_format()
+    max_tokens = adaptation_output_budget(section_text)
+    prompt, system_message = fit_prompt(
+        lambda offer: create_prompt(offer, section_text, language), job_offer, max_tokens
+    )
+
+    # Parallel streams would interleave in the GUI, so only forward cancellation
+    muted = progress.muted() if progress is not None else None
+    response = run_llm(prompt, system_message, progress=muted, response_format=response_format,
+                       max_tokens=max_tokens, stage=STAGE_SECTION_ADAPTATION, language=language,
+                       tier=tier)
+
+    piece = extract_json_object(response)
+    errors = validate_section_piece(section.kind, piece)
+    if errors:
+        raise ValueError("; ".join(errors))
+    return piece
+
+
+def adapt_sections(adapt_data, job_offer, language, progress=None, tier=None):
+    """
+    Adapt every job and skill category with concurrent LLM requests
+
+    Sections whose response is invalid are retried on their own, up to
+    MAX_SECTION_RETRIES times, and keep their original content if they
+    still fail.
+
+    Returns:
+        tuple: (adapted content dict with work and skills, list of failed sections)
+    """
+    sections = split_adapt_data(adapt_data)
+    pending = list(sections)
+
+    with ThreadPoolExecutor(max_workers=PARALLEL_SLOTS) as executor:
+        while pending:
+            futures = {
+                section: executor.submit(_adapt_section, section, job_offer, language, progress, tier)
+                for section in pending
+            }
+            retry = []
+            for section, future in futures.items():
+                section.attempts += 1
+                try:
+                    section.adapted = future.result()
+                    if progress is not None:
+                        progress.stage(f"✅ Adapted {section.kind}: {section.label}")
+                except ValueError as e:
+                    section.errors.append(str(e))
+                    print(f"⚠️ Invalid {section.kind} section '{section.label}' (attempt {section.attempts}): {e}")
+                    if section.attempts <= MAX_SECTION_RETRIES:
+                        retry.append(section)
+            pending = retry
+
+    failed = [section for section in sections if section.adapted is None]
+    for section in failed:
+        print(f"❌ Keeping original {section.kind} section '{section.label}' after {section.attempts} attempts")
+
+    adapted_content = {
+        'work': [section.adapted or section.original for section in sections if section.kind == 'work'],
+        'skills': [section.adapted or section.original for section in sections if section.kind == 'skills'],
+    }
+    return adapted_content, failed
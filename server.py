@@ -0,0 +1,264 @@
+import asyncio
+import json
+import os
+import queue
+from urllib.parse import quote, unquote
+from utils.job_queue import JobQueue, PRIORITY_INTERACTIVE, WORKER_COUNT
+from processors.profile_registry import ProfileNotFound, get_registry
+from utils.model_routing import normalize_candidate_count, normalize_tier
+
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+
+# Requests waiting for a worker before POST /generations answers 429
+MAX_PENDING_JOBS = 16
+MAX_BODY_BYTES = 1024 * 1024
+
+FORM_FIELDS = ("company_name", "job_offer", "language", "city", "country_code")
+OPTIONAL_FIELDS = ("adaptation_mode", "tier", "candidates", "cover_letter_compare", "profile", "profile_tag")
+
+STATUS_TEXT = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    429: "Too Many Requests",
+}
+
+CONTENT_TYPES = {
+    ".json": "application/json",
+    ".txt": "text/plain; charset=utf-8",
+    ".html": "text/html; charset=utf-8",
+    ".pdf": "application/pdf",
+    ".md": "text/markdown; charset=utf-8",
+}
+
+
+class HTTPError(Exception):
+    """An error that is answered with the given HTTP status"""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+class GenerationService:
+    """
+    Minimal asyncio HTTP service in front of the job queue
+
+    Endpoints:
+        POST /generations                    Queue a generation (same fields as the GUI form)
+        GET  /generations/{id}               Job status and artifact names
+        GET  /generations/{id}/files/{name}  Download a generated artifact
+    """
+
+    def __init__(self, job_queue):
+        self.job_queue = job_queue
+
+    async def start(self, host=SERVER_HOST, port=SERVER_PORT):
+        """Start listening and return the asyncio server"""
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            try:
+                method, path, body = await self._read_request(reader)
+                status, headers, payload = await self.dispatch(method, path, body)
+            except HTTPError as e:
+                status, headers, payload = e.status, e.headers, _json_body({'error': e.message})
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            except Exception as e:
+                print(f"💥 Error handling request: {e}")
+                status, headers, payload = 500, {}, _json_body({'error': 'Internal server error'})
+
+            try:
+                response = _encode_response(status, headers, payload)
+            except Exception as e:
+                print(f"💥 Error encoding response: {e}")
+                response = _encode_response(500, {}, _json_body({'error': 'Internal server error'}))
+            writer.write(response)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body):
+        """Route a request and return (status, headers, body); disk I/O runs in worker threads"""
+        parts = [unquote(part) for part in path.split("?", 1)[0].strip("/").split("/")]
+
+        if parts[0] != "generations":
+            raise HTTPError(404, "Not found")
+
+        if len(parts) == 1:
+            if method != "POST":
+                raise HTTPError(405, "Use POST to create a generation")
+            return await self.create_generation(body)
+
+        if method != "GET":
+            raise HTTPError(405, "Use GET to read a generation")
+
+        job = self._get_job(parts[1])
+        if len(parts) == 2:
+            return 200, {}, _json_body(self._job_summary(job))
+        if len(parts) == 4 and parts[2] == "files":
+            return await self.download_artifact(job, parts[3])
+        raise HTTPError(404, "Not found")
+
+    async def create_generation(self, body):
+        try:
+            data = json.loads(body or b"{}")
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise HTTPError(400, "Body must be a JSON object")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Body must be a JSON object")
+
+        form_data = {field: str(data.get(field, "")).strip() for field in FORM_FIELDS}
+        form_data['language'] = form_data['language'] or "English"
+        form_data.update({field: str(data[field]) for field in OPTIONAL_FIELDS if data.get(field)})
+
+        # Same validation as the GUI form
+        if not form_data['company_name']:
+            raise HTTPError(400, "company_name is required")
+        if not form_data['job_offer']:
+            raise HTTPError(400, "job_offer is required")
+        try:
+            form_data['tier'] = normalize_tier(form_data.get('tier'))
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        try:
+            form_data['candidates'] = normalize_candidate_count(form_data.get('candidates'))
+        except ValueError:
+            raise HTTPError(400, "candidates must be an integer")
+
+        if form_data.get('profile') or form_data.get('profile_tag'):
+            try:
+                # May reload profiles from disk
+                await asyncio.to_thread(lambda: get_registry().resolve(form_data))
+            except ProfileNotFound as e:
+                raise HTTPError(400, str(e))
+
+        try:
+            job = await asyncio.to_thread(self.job_queue.submit, form_data, priority=PRIORITY_INTERACTIVE)
+        except queue.Full:
+            raise HTTPError(429, "Generation queue is full, retry later", {"Retry-After": "30"})
+
+        headers = {"Location": f"/generations/{job.id}"}
+        return 202, headers, _json_body(self._job_summary(job))
+
+    async def download_artifact(self, job, name):
+        for file_path in self._artifacts(job):
+            if os.path.basename(file_path) != name:
+                continue
+            try:
+                content = await asyncio.to_thread(_read_file, file_path)
+            except (FileNotFoundError, IsADirectoryError):
+                continue
+            content_type = CONTENT_TYPES.get(os.path.splitext(name)[1], "application/octet-stream")
+            headers = {
+                "Content-Type": content_type,
+                "Content-Disposition": _content_disposition(name)
+            }
+            return 200, headers, content
+        raise HTTPError(404, f"Artifact not found: {name}")
+
+    def _get_job(self, job_id):
+        job = self.job_queue.get(int(job_id)) if job_id.isascii() and job_id.isdigit() else None
+        if job is None:
+            raise HTTPError(404, f"Generation not found: {job_id}")
+        return job
+
+    def _artifacts(self, job):
+        if not job.result:
+            return []
+        return [path for path in job.result.get('files_created', []) if path]
+
+    def _job_summary(self, job):
+        summary = {
+            'id': job.id,
+            'status': job.status,
+            'position': self.job_queue.position(job),
+            'message': (job.result or {}).get('message', ''),
+            'files': [],
+        }
+        for file_path in self._artifacts(job):
+            name = os.path.basename(file_path)
+            summary['files'].append({'name': name, 'url': f"/generations/{job.id}/files/{quote(name)}"})
+        return summary
+
+    async def _read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line:
+            raise ConnectionError("Client closed the connection")
+        try:
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        length = headers.get("content-length") or "0"
+        # Only plain ASCII digits: no sign, no spaces, no other Unicode digits
+        if not (length.isascii() and length.isdigit()):
+            raise HTTPError(400, "Invalid Content-Length header")
+        length = int(length)
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path, body
+
+
+def _read_file(file_path):
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+def _json_body(data):
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def _encode_response(status, headers, payload):
+    headers = {"Content-Type": "application/json", **headers}
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Internal Server Error')}"]
+    lines += [f"{key}: {value}" for key, value in headers.items()]
+    lines += [f"Content-Length: {len(payload)}", "Connection: close", "", ""]
+    return "\r\n".join(lines).encode("latin-1") + payload
+
+
+def _content_disposition(name):
+    """Attachment header with an ASCII filename and the exact UTF-8 one (RFC 6266 / RFC 5987)"""
+    fallback = "".join(char if char.isascii() and char.isprintable() and char not in '"\\' else "_"
+                       for char in name)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(name, safe='')}"
+
+
+async def serve(host=SERVER_HOST, port=SERVER_PORT, workers=WORKER_COUNT, max_pending=MAX_PENDING_JOBS):
+    """Run the generation service until cancelled"""
+    job_queue = JobQueue(workers=workers, max_pending=max_pending).start()
+    service = GenerationService(job_queue)
+    server = await service.start(host, port)
+    print(f"🌍 Generation service listening on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        job_queue.shutdown(wait=False)
+
+
+def run_server(host=SERVER_HOST, port=SERVER_PORT):
+    """Blocking entry point for the headless generation service"""
+    try:
+        asyncio.run(serve(host, port))
+    except KeyboardInterrupt:
+        print("👋 Generation service stopped")
@@ -0,0 +1,62 @@
+import json
+import unittest
+
+from processors.candidate_ranking import extract_keywords, rank_candidates
+from utils.model_routing import normalize_candidate_count
+
+
+ADAPT_DATA = {
+    'work': [{'title': 'Developer', 'company': 'Acme', 'summary': ['Built APIs', 'Wrote tests']}],
+    'skills': [{'category': 'Languages', 'items': ['Python']}],
+}
+
+
+def candidate(summary, items):
+    return json.dumps({
+        'work': [{'title': 'Developer', 'company': 'Acme', 'startDate': '2020', 'endDate': '2023',
+                  'summary': summary}],
+        'skills': [{'category': 'Languages', 'items': items}],
+    })
+
+
+class TestCandidateRanking(unittest.TestCase):
+    """Test cases for the local scoring of adaptation candidates"""
+
+    def test_keywords_skip_stopwords(self):
+        keywords = extract_keywords("We are looking for a Python developer with Django and Python experience")
+        self.assertEqual(keywords[0], "python")
+        self.assertIn("django", keywords)
+        self.assertNotIn("with", keywords)
+
+    def test_best_candidate_covers_the_offer(self):
+        job_offer = "Senior Python developer: Django, PostgreSQL, Docker"
+        responses = [
+            candidate(["Built APIs", "Wrote tests"], ["Python"]),
+            candidate(["Built Django APIs on PostgreSQL", "Shipped Docker images"], ["Python", "Django"]),
+            "not json at all",
+            candidate(["Built APIs", None], ["Python"]),
+        ]
+
+        ranked = rank_candidates(responses, job_offer, ADAPT_DATA)
+
+        self.assertEqual([c.index for c in ranked], [1, 0, 3, 2])
+        self.assertTrue(ranked[0].valid)
+        self.assertGreater(ranked[0].keyword_coverage, ranked[1].keyword_coverage)
+        self.assertFalse(ranked[2].valid)
+
+    def test_keywords_match_whole_words(self):
+        ranked = rank_candidates([candidate(["Built JavaScript apps", "Good tests"], ["TypeScript"])],
+                                 "Java, Spring and more Java", ADAPT_DATA)
+
+        self.assertEqual(ranked[0].keyword_coverage, 0)
+
+    def test_candidate_count_is_clamped(self):
+        self.assertEqual(normalize_candidate_count("3"), 3)
+        self.assertEqual(normalize_candidate_count(99), 5)
+        self.assertEqual(normalize_candidate_count(0), 1)
+        with self.assertRaises(ValueError):
+            normalize_candidate_count("many")
+
+
+if __name__ == '__main__':
+    unittest.main()
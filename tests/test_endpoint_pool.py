@@ -0,0 +1,114 @@
+import json
+import threading
+import time
+import unittest
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.endpoint_pool import Endpoint, EndpointPool, NoEndpointAvailable
+
+
+class FakeLLMServer:
+    """Local stand-in for an LM server: GET /v1/models and POST /v1/chat/completions"""
+
+    def __init__(self, name, delay=0.0):
+        self.name = name
+        self.delay = delay
+        self.healthy = True
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if server.healthy and self.path == "/v1/models":
+                    self._reply(200, {'data': [{'id': 'fake-model'}]})
+                else:
+                    self._reply(503, {'error': 'unavailable'})
+
+            def do_POST(self):
+                server.requests += 1
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                time.sleep(server.delay)
+                if server.healthy:
+                    self._reply(200, {'answer': server.name})
+                else:
+                    self._reply(500, {'error': 'broken'})
+
+            def _reply(self, status, data):
+                body = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.host = f"127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def ask(attempt):
+    request = urllib.request.Request(f"{attempt.endpoint.base_url}/chat/completions", data=b"{}", method="POST")
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.loads(response.read())['answer']
+
+
+class TestEndpointPool(unittest.TestCase):
+    """Test cases for routing, ejection and hedging across fake LLM servers"""
+
+    def setUp(self):
+        self.servers = [FakeLLMServer("a"), FakeLLMServer("b")]
+        self.endpoints = [Endpoint(server.host, "fake-model") for server in self.servers]
+
+    def tearDown(self):
+        for server in self.servers:
+            server.close()
+
+    def test_least_outstanding_routing(self):
+        pool = EndpointPool(self.endpoints)
+        first = pool.acquire()
+        second = pool.acquire()
+        self.assertIsNot(first, second)
+
+        pool.release(second)
+        self.assertIs(pool.acquire(), second)
+
+    def test_failing_endpoint_is_ejected_and_readmitted(self):
+        pool = EndpointPool(self.endpoints, eject_after=1, eject_seconds=0)
+        self.servers[0].healthy = False
+
+        answers = [pool.call(ask) for _ in range(3)]
+        self.assertEqual(answers, ["b", "b", "b"])
+        self.assertTrue(self.endpoints[0].ejected)
+
+        self.servers[0].healthy = True
+        self.assertEqual(pool.probe_all(), self.endpoints)
+        self.assertFalse(self.endpoints[0].ejected)
+
+    def test_all_endpoints_failing(self):
+        pool = EndpointPool(self.endpoints)
+        for server in self.servers:
+            server.healthy = False
+        with self.assertRaises(NoEndpointAvailable):
+            pool.call(ask)
+
+    def test_hedged_request_returns_the_fastest_answer(self):
+        self.servers[0].delay = 0.5
+        pool = EndpointPool(self.endpoints, hedge_after=0.05)
+
+        started = time.monotonic()
+        answer = pool.call(ask, hedge=True)
+
+        self.assertEqual(answer, "b")
+        self.assertLess(time.monotonic() - started, 0.45)
+        self.assertEqual([server.requests for server in self.servers], [1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from unittest import mock
+
+from generators import html_generator
+from generators.html_generator import render_resume_html
+from generators.resume_renderer import HtmlWriter, TextWriter, render_resume
+
+
+RESUME = {
+    'name': 'Ana Lopez',
+    'contactInfo': {'email': 'ana@example.com', 'phone': '+34 600', 'location': {'city': 'Madrid', 'countryCode': 'ES'}},
+    'profiles': [{'github': 'https://github.com/ana'}],
+    'projects': [{'name': 'Tracker', 'description': 'Expense tracker'}],
+    'education': [{'studyType': 'BSc', 'course': 'Computer Science', 'institution': 'UCM'}],
+    'work': [{'title': 'Engineer', 'company': 'Acme', 'startDate': '2020', 'endDate': 'present',
+              'summary': ['Built APIs']}],
+    'skills': [{'category': 'Backend', 'items': ['Python']}],
+}
+
+
+class TestStaticSections(unittest.TestCase):
+    """Test cases for the cached static sections of the HTML resume"""
+
+    def setUp(self):
+        html_generator._static_sections_cache.clear()
+
+    def test_static_sections_are_rendered_once_per_profile_and_language(self):
+        other_offer = dict(RESUME, work=[dict(RESUME['work'][0], summary=['Led the payments team'])])
+        with mock.patch.object(html_generator, '_render_sections', wraps=html_generator._render_sections) as render:
+            first = render_resume_html(RESUME, 'English', 'UK', 'London', profile_hash='profile-1')
+            second = render_resume_html(other_offer, 'English', 'ES', 'Madrid', profile_hash='profile-1')
+            render_resume_html(RESUME, 'Spanish', 'ES', 'Madrid', profile_hash='profile-1')
+
+        static_renders = [call for call in render.call_args_list if 'education' in call.args[1]]
+        self.assertEqual(len(static_renders), 2)
+        self.assertIn('Built APIs', first)
+        self.assertIn('Led the payments team', second)
+        self.assertNotIn('Built APIs', second)
+        self.assertIn('London, UK', first)
+        self.assertIn('Madrid, ES', second)
+        self.assertIn('Computer Science', second)
+
+    def test_changed_profile_data_gets_new_static_sections(self):
+        render_resume_html(RESUME, 'English', 'UK', 'London')
+        renamed = dict(RESUME, name='Ana María López')
+        self.assertIn('Ana María López', render_resume_html(renamed, 'English', 'UK', 'London'))
+
+    def test_empty_skills_section_is_removed_in_every_language(self):
+        no_skills = dict(RESUME, skills=[])
+        for language, title in (('English', 'Technical Skills'), ('Spanish', 'Habilidades Técnicas')):
+            html = render_resume_html(no_skills, language, 'ES', 'Madrid')
+            self.assertNotIn(title, html)
+            self.assertIn('Computer Science', html)
+
+    def test_fragments_of_a_shared_walk_are_used_as_rendered(self):
+        _, fragments = render_resume(dict(RESUME, label='Engineer'), [TextWriter(), HtmlWriter()])
+        expected = render_resume_html(RESUME, 'English', 'UK', 'London', profile_hash='profile-1')
+
+        with mock.patch.object(html_generator, '_render_sections') as render:
+            html = render_resume_html(RESUME, 'English', 'UK', 'London', profile_hash='profile-1', fragments=fragments)
+
+        render.assert_not_called()
+        self.assertEqual(html, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from utils import i18n
+
+
+class TestI18nCatalog(unittest.TestCase):
+    """Test cases for the i18n catalog and the one-pass title translation"""
+
+    def tearDown(self):
+        i18n._catalogs = None
+        i18n._title_patterns.clear()
+
+    def test_titles_are_translated_in_one_pass(self):
+        html = "<h2>Work Experience</h2><p>Projects</p><h2>Projects</h2><h2>Education</h2>"
+        self.assertEqual(i18n.translate_titles(html, "Spanish"),
+                         "<h2>Experiencia Laboral</h2><p>Projects</p><h2>Proyectos</h2><h2>Educación</h2>")
+        self.assertEqual(i18n.translate_titles(html, "English"), html)
+
+    def test_missing_entries_fall_back_to_english(self):
+        self.assertEqual(i18n.translate("Spain", "German", "countries"), "Spanien")
+        self.assertEqual(i18n.translate("France", "German", "countries"), "France")
+        self.assertEqual(i18n.system_prompt("cover_letter_system", "Klingon"),
+                         i18n.system_prompt("cover_letter_system", "English"))
+
+    def test_adding_a_catalog_file_adds_the_language(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        for file_name in os.listdir(i18n.I18N_DIR):
+            shutil.copy(os.path.join(i18n.I18N_DIR, file_name), directory)
+        with open(os.path.join(directory, "fr.json"), "w", encoding="utf-8") as f:
+            json.dump({"language": "French", "code": "fr", "titles": {"Projects": "Projets"}}, f)
+
+        with mock.patch.object(i18n, "I18N_DIR", directory):
+            i18n._catalogs = None
+            self.assertEqual(i18n.languages(), ["English", "French", "German", "Spanish"])
+            self.assertEqual(i18n.language_codes()["fr"], "French")
+            self.assertEqual(i18n.translate_titles("<h2>Projects</h2><h2>Education</h2>", "French"),
+                             "<h2>Projets</h2><h2>Education</h2>")
+            self.assertEqual(i18n.document_title("French"), "Resume")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules needed to show the window: main, the GUI and tkinter
+STARTUP_IMPORT = "import main, view, tkinter"
+
+# Cumulative import time budget for STARTUP_IMPORT, in microseconds
+STARTUP_BUDGET_US = 250_000
+
+# Heavy dependencies that must only be imported on first use
+DEFERRED_MODULES = ("openai", "playwright", "fpdf", "httpx", "numpy")
+
+
+def measure_startup_imports():
+    """
+    Run STARTUP_IMPORT under python -X importtime in a fresh interpreter
+
+    Returns:
+        dict: Module name -> (cumulative import time in microseconds, nesting depth)
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_IMPORT],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+
+    timings = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        # Nested imports are indented by two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        timings[name.strip()] = (int(cumulative_us), depth)
+    return timings
+
+
+class TestStartupImportTime(unittest.TestCase):
+    """Guard the time it takes to import everything needed to show the window"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.timings = measure_startup_imports()
+
+    def test_heavy_dependencies_are_deferred(self):
+        """openai, playwright, fpdf and numpy are not imported at startup"""
+        for module in DEFERRED_MODULES:
+            imported = [name for name in self.timings if name.split(".")[0] == module]
+            self.assertEqual(imported, [], f"{module} is imported at startup")
+
+    def test_startup_import_budget(self):
+        """Importing main and the GUI stays within the startup budget"""
+        total_us = sum(us for name, (us, depth) in self.timings.items() if depth == 0 and name != "site")
+        self.assertLess(total_us, STARTUP_BUDGET_US,
+                        f"Startup imports took {total_us / 1000:.1f} ms (budget {STARTUP_BUDGET_US / 1000:.0f} ms)")
+
+
+if __name__ == '__main__':
+    timings = measure_startup_imports()
+    for name, (us, depth) in sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:20]:
+        print(f"{us / 1000:8.1f} ms  {'  ' * depth}{name}")
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import queue
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import db.db
+from utils.job_queue import (
+    JobQueue, PRIORITY_BATCH, PRIORITY_INTERACTIVE,
+    STATUS_CANCELLED, STATUS_DONE, STATUS_FAILED, STATUS_QUEUED
+)
+
+
+class TestJobQueue(unittest.TestCase):
+    """Test cases for the priority job queue"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_patch = patch.object(db.db, 'DB_PATH', os.path.join(self.tmp_dir.name, "test.db"))
+        self.db_patch.start()
+        db.db.init_db()
+
+    def tearDown(self):
+        self.db_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def wait_for(self, jobs):
+        for _ in range(200):
+            if all(job.finished for job in jobs):
+                return
+            threading.Event().wait(0.01)
+        self.fail("Jobs did not finish in time")
+
+    def test_interactive_jobs_run_before_batch_jobs(self):
+        """Interactive jobs submitted later still run before queued batch jobs"""
+        order = []
+
+        def runner(form_data, progress=None):
+            order.append(form_data['company_name'])
+            return {'status': 'success', 'message': 'ok'}
+
+        job_queue = JobQueue(runner=runner, restore=False)
+        jobs = [
+            job_queue.submit({'company_name': 'batch-1'}, priority=PRIORITY_BATCH),
+            job_queue.submit({'company_name': 'batch-2'}, priority=PRIORITY_BATCH),
+            job_queue.submit({'company_name': 'gui'}, priority=PRIORITY_INTERACTIVE),
+        ]
+        job_queue.start()
+        self.wait_for(jobs)
+        job_queue.shutdown()
+
+        self.assertEqual(order, ['gui', 'batch-1', 'batch-2'])
+        self.assertTrue(all(job.status == STATUS_DONE for job in jobs))
+
+    def test_pending_jobs_survive_restart(self):
+        """Jobs left queued are restored by a new queue instance"""
+        first = JobQueue(runner=lambda form_data, progress=None: {'status': 'success'}, restore=False)
+        job = first.submit({'company_name': 'ACME'})
+
+        second = JobQueue(runner=lambda form_data, progress=None: {'status': 'error', 'message': 'boom'})
+        restored = second.get(job.id)
+        self.assertIsNotNone(restored)
+        self.assertEqual(restored.status, STATUS_QUEUED)
+        self.assertEqual(restored.form_data, {'company_name': 'ACME'})
+
+        second.start()
+        self.wait_for([restored])
+        second.shutdown()
+        self.assertEqual(restored.status, STATUS_FAILED)
+        self.assertEqual(db.db.load_jobs((STATUS_QUEUED,)), [])
+
+    def test_cancel_queued_job(self):
+        """A queued job that is cancelled never reaches the runner"""
+        calls = []
+        job_queue = JobQueue(runner=lambda form_data, progress=None: calls.append(form_data), restore=False)
+        job = job_queue.submit({'company_name': 'ACME'})
+
+        self.assertTrue(job_queue.cancel(job.id))
+        job_queue.start()
+        job_queue.shutdown()
+
+        self.assertEqual(job.status, STATUS_CANCELLED)
+        self.assertEqual(calls, [])
+
+    def test_worker_survives_bad_results_and_database_errors(self):
+        """A non-dict result fails its job and a failed status write does not stop the worker"""
+        job_queue = JobQueue(runner=lambda form_data, progress=None: None, restore=False)
+        first = job_queue.submit({'company_name': 'A'})
+        with patch('utils.job_queue.update_job', side_effect=RuntimeError("database is locked")):
+            job_queue.start()
+            self.wait_for([first])
+        second = job_queue.submit({'company_name': 'B'})
+        self.wait_for([second])
+        job_queue.shutdown()
+
+        self.assertEqual(first.status, STATUS_FAILED)
+        self.assertEqual(second.status, STATUS_FAILED)
+        self.assertEqual(second.result['status'], 'error')
+
+    def test_max_pending(self):
+        """Submitting beyond max_pending raises queue.Full"""
+        job_queue = JobQueue(runner=lambda form_data, progress=None: {}, max_pending=1, restore=False)
+        job_queue.submit({'company_name': 'A'})
+        with self.assertRaises(queue.Full):
+            job_queue.submit({'company_name': 'B'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from benchmarks.json_repair_bench import load_corpus
+from processors.json_repair import (
+    repair_json, REPAIR_STRAY_TOKEN, REPAIR_TRAILING_COMMA, REPAIR_TRUNCATED, REPAIR_MULTIPLE_OBJECTS
+)
+
+
+class TestRepairJson(unittest.TestCase):
+    """Test cases for the tolerant JSON extractor"""
+
+    def test_clean_json_needs_no_repairs(self):
+        result = repair_json('{"work": [], "skills": [{"category": "A", "items": ["x"]}]}')
+        self.assertEqual(result.value, {"work": [], "skills": [{"category": "A", "items": ["x"]}]})
+        self.assertEqual(result.repairs, [])
+
+    def test_prompt_skeleton_brackets_are_dropped(self):
+        """The "])]" of the prompt skeleton does not close the work list"""
+        result = repair_json('{"work": [{"summary": ["a", "b"])]\n}, {"summary": ["c"]}], "skills": []}')
+        self.assertEqual(result.value, {"work": [{"summary": ["a", "b"]}, {"summary": ["c"]}], "skills": []})
+        self.assertIn(REPAIR_STRAY_TOKEN, result.repairs)
+
+    def test_trailing_commas(self):
+        result = repair_json('{"work": [{"summary": ["a",],},], "skills": [],}')
+        self.assertEqual(result.value, {"work": [{"summary": ["a"]}], "skills": []})
+        self.assertIn(REPAIR_TRAILING_COMMA, result.repairs)
+
+    def test_truncated_output_keeps_complete_values(self):
+        """Output cut at max_tokens keeps everything up to the last complete value"""
+        result = repair_json('{"work": [{"title": "A", "summary": ["done", "half a sent')
+        self.assertEqual(result.value, {"work": [{"title": "A", "summary": ["done"]}]})
+        self.assertIn(REPAIR_TRUNCATED, result.repairs)
+
+    def test_best_of_multiple_objects(self):
+        result = repair_json('Draft: {"note": 1}\nFinal: {"work": [{"title": "A"}], "skills": []}')
+        self.assertEqual(result.value, {"work": [{"title": "A"}], "skills": []})
+        self.assertIn(REPAIR_MULTIPLE_OBJECTS, result.repairs)
+
+    def test_nothing_to_recover(self):
+        self.assertFalse(repair_json("Sorry, I cannot help with that.").success)
+        self.assertFalse(repair_json('{"unrelated": true}').success)
+
+    def test_corpus_recovery(self):
+        """Every corpus response that contains resume JSON is recovered"""
+        for entry in load_corpus():
+            result = repair_json(entry['response'])
+            if entry['name'] == "no_json":
+                self.assertFalse(result.success)
+            else:
+                self.assertTrue(result.success, entry['name'])
+                self.assertEqual(len(result.value['work']), 2, entry['name'])
+
+
+if __name__ == '__main__':
+    unittest.main()
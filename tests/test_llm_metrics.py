@@ -0,0 +1,134 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import db.db
+import local_llm_client
+from utils.endpoint_pool import Endpoint, EndpointPool
+from utils.model_routing import LARGE_MODEL, SMALL_MODEL
+from utils.progress import ProgressReporter
+
+
+def _chunk(text=None, usage=None, index=0):
+    choices = [SimpleNamespace(index=index, delta=SimpleNamespace(content=text))] if text is not None else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def close(self):
+        pass
+
+
+class FakeCompletions:
+    def __init__(self, chunks, reject_stream_options=False, reject_response_format=False):
+        self.chunks = chunks
+        self.reject_stream_options = reject_stream_options
+        self.reject_response_format = reject_response_format
+        self.requests = []
+
+    def create(self, **request):
+        self.requests.append(dict(request))
+        if self.reject_stream_options and 'stream_options' in request:
+            raise ValueError("unknown parameter: stream_options")
+        if self.reject_response_format and 'response_format' in request:
+            raise ValueError("'response_format.type' must be 'json_schema' or 'text'")
+        return FakeStream(self.chunks)
+
+
+class TestLLMCallMetrics(unittest.TestCase):
+    """Test cases for the per-call usage and timing records"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_patch = patch.object(db.db, 'DB_PATH', os.path.join(self.tmp_dir.name, "test.db"))
+        self.db_patch.start()
+        db.db.init_db()
+
+    def tearDown(self):
+        self.db_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def run_with(self, completions, tier="quality", n=1, progress=None, response_format=None):
+        endpoint = Endpoint("fake:1234")
+        endpoint._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        with patch.object(local_llm_client, 'get_pool', return_value=EndpointPool([endpoint])), \
+                patch.object(local_llm_client, '_stream_usage_supported', True):
+            responses = local_llm_client.run_llm_candidates(
+                "prompt", "system", n, progress=progress or ProgressReporter(),
+                stage="cover_letter", language="German", tier=tier, response_format=response_format
+            )
+        return responses[0] if n == 1 else responses
+
+    def test_server_usage_is_recorded(self):
+        """Token counts reported by the server are stored with the call"""
+        usage = SimpleNamespace(prompt_tokens=120, completion_tokens=3)
+        response = self.run_with(FakeCompletions([_chunk("Sehr "), _chunk("geehrte"), _chunk(usage=usage)]))
+
+        self.assertEqual(response, "Sehr geehrte")
+        [row] = db.db.load_llm_call_stats()
+        self.assertEqual((row['stage'], row['calls'], row['prompt_tokens'], row['completion_tokens']),
+                         ("cover_letter", 1, 120, 3))
+        self.assertEqual((row['tier'], row['model']), ("quality", LARGE_MODEL))
+        self.assertIsNotNone(row['ttft_ms'])
+
+    def test_usage_is_estimated_without_stream_options(self):
+        """Servers without stream usage get estimated token counts"""
+        self.run_with(FakeCompletions([_chunk("Dear "), _chunk("team")], reject_stream_options=True), tier="fast")
+
+        [row] = db.db.load_llm_call_stats()
+        self.assertEqual((row['tier'], row['model']), ("fast", SMALL_MODEL))
+        self.assertGreater(row['prompt_tokens'], 0)
+        self.assertGreater(row['completion_tokens'], 0)
+
+    def test_candidates_share_one_request(self):
+        """Several candidates are sampled with a single n > 1 request"""
+        progress = ProgressReporter()
+        completions = FakeCompletions([_chunk("A", index=0), _chunk("B", index=1), _chunk("a", index=0),
+                                       _chunk("b", index=1)])
+
+        responses = self.run_with(completions, n=2, progress=progress)
+
+        self.assertEqual(responses, ["Aa", "Bb"])
+        self.assertEqual(len(completions.requests), 1)
+        self.assertEqual(completions.requests[0]['n'], 2)
+        self.assertEqual([payload for _, payload in progress.drain()], ["A", "a"])
+
+    def test_missing_candidates_are_requested_in_parallel(self):
+        """Servers that ignore n get one request per missing candidate"""
+        completions = FakeCompletions([_chunk("only one")])
+
+        responses = self.run_with(completions, n=3)
+
+        self.assertEqual(responses, ["only one"] * 3)
+        self.assertEqual(len(completions.requests), 3)
+        self.assertNotIn('n', completions.requests[1])
+
+    def test_rejected_response_format_falls_back_to_free_text(self):
+        """A rejected response_format is dropped, retried once and remembered"""
+        completions = FakeCompletions([_chunk('{"summary": "ok"}')], reject_response_format=True)
+        response_format = {'type': 'json_schema', 'json_schema': {'name': 'resume', 'schema': {}}}
+
+        with patch.object(local_llm_client, 'STRUCTURED_OUTPUT_ENABLED', True), \
+                patch.object(local_llm_client, '_structured_output_supported', True):
+            response = self.run_with(completions, response_format=response_format)
+            available = local_llm_client.structured_output_available()
+
+        self.assertEqual(response, '{"summary": "ok"}')
+        self.assertEqual(len(completions.requests), 2)
+        self.assertEqual(completions.requests[0]['response_format'], response_format)
+        self.assertNotIn('response_format', completions.requests[1])
+        self.assertFalse(available)
+        [row] = db.db.load_llm_call_stats()
+        self.assertEqual(row['calls'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
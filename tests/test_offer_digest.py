@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import db.db
+from processors import offer_digest
+from utils import token_budget
+
+
+@patch.object(token_budget, '_get_encoding', lambda: None)
+class TestOfferDigest(unittest.TestCase):
+    """Test cases for the map-reduce digest of long job offers"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_patch = patch.object(db.db, 'DB_PATH', os.path.join(self.tmp_dir.name, "test.db"))
+        self.db_patch.start()
+        db.db.init_db()
+        offer_digest._digests.clear()
+        self.calls = []
+
+    def tearDown(self):
+        self.db_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def fake_llm(self, prompt, system_message, **kwargs):
+        self.calls.append(prompt)
+        return "REDUCED" if "Merge these" in prompt else f"summary {len(self.calls)}"
+
+    def test_split_keeps_paragraphs_under_the_chunk_size(self):
+        offer = "\n\n".join(["word " * 200] * 5)
+        chunks = offer_digest.split_offer(offer, chunk_tokens=700)
+        self.assertEqual(len(chunks), 3)
+        self.assertTrue(all(token_budget.count_tokens(chunk) <= 700 for chunk in chunks))
+
+    def test_short_offer_is_used_as_is(self):
+        with patch.object(offer_digest, 'run_llm', self.fake_llm):
+            self.assertEqual(offer_digest.prepare_job_offer("Python developer"), "Python developer")
+        self.assertEqual(self.calls, [])
+
+    def test_long_offer_is_digested_once(self):
+        offer = "\n\n".join(f"Requirement {index}: " + "detail " * 300 for index in range(8))
+        with patch.object(offer_digest, 'run_llm', self.fake_llm):
+            digest = offer_digest.prepare_job_offer(offer)
+            map_reduce_calls = len(self.calls)
+            offer_digest._digests.clear()
+            cached = offer_digest.prepare_job_offer(offer)
+
+        self.assertEqual(digest, "REDUCED")
+        self.assertEqual(cached, "REDUCED")
+        self.assertGreater(map_reduce_calls, 2)
+        self.assertEqual(len(self.calls), map_reduce_calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
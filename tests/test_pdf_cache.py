@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+from generators import html_pdf_generator
+from utils.pdf_cache import evict, fetch_pdf, pdf_cache_key, store_pdf
+
+
+class TestPdfCache(unittest.TestCase):
+    """Test cases for the PDF cache keyed by HTML content"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_key_depends_on_html_and_options(self):
+        options = {'format': 'A4', 'print_background': True}
+        key = pdf_cache_key(b"<html></html>", options)
+
+        self.assertEqual(key, pdf_cache_key(b"<html></html>", dict(reversed(options.items()))))
+        self.assertNotEqual(key, pdf_cache_key(b"<html> </html>", options))
+        self.assertNotEqual(key, pdf_cache_key(b"<html></html>", dict(options, format='Letter')))
+
+    def test_hit_puts_the_cached_pdf_at_the_output_path(self):
+        printed = self.write("printed.pdf", b"%PDF-1.4 resume")
+        output = os.path.join(self.tmp.name, "output.pdf")
+
+        self.assertFalse(fetch_pdf("key", output, self.cache_dir))
+        store_pdf("key", printed, self.cache_dir)
+
+        self.assertTrue(fetch_pdf("key", output, self.cache_dir))
+        self.assertEqual(self.read(output), b"%PDF-1.4 resume")
+
+    def test_evicts_the_least_recently_used_pdfs(self):
+        for index, key in enumerate(("old", "used", "new")):
+            store_pdf(key, self.write(f"{key}.pdf", b"x" * 100), self.cache_dir)
+            os.utime(os.path.join(self.cache_dir, f"{key}.pdf"), (index, index))
+        fetch_pdf("used", os.path.join(self.tmp.name, "output.pdf"), self.cache_dir)
+
+        self.assertEqual(evict(self.cache_dir, max_bytes=200), 1)
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ["new.pdf", "used.pdf"])
+
+    def test_html_to_pdf_skips_chromium_on_a_hit(self):
+        html = self.write("resume.html", b"<html><body>Ana</body></html>")
+        key = pdf_cache_key(b"<html><body>Ana</body></html>", html_pdf_generator.PDF_OPTIONS)
+        store_pdf(key, self.write("printed.pdf", b"%PDF-1.4 cached"), self.cache_dir)
+        output = os.path.join(self.tmp.name, "resume.pdf")
+
+        fetch = html_pdf_generator.fetch_pdf
+        html_pdf_generator.fetch_pdf = lambda key, path: fetch(key, path, self.cache_dir)
+        self.addCleanup(setattr, html_pdf_generator, 'fetch_pdf', fetch)
+        html_pdf_generator.html_to_pdf(html, output)
+
+        self.assertEqual(self.read(output), b"%PDF-1.4 cached")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+from concurrent.futures import Future
+
+from utils import pdf_optimizer
+
+
+def done(result=None, error=None):
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+
+class TestPdfOptimizer(unittest.TestCase):
+    """Test cases for the optional PDF post-processing stage"""
+
+    def test_disabled_stage_leaves_the_pdf_as_printed(self):
+        enabled = pdf_optimizer.PDF_OPTIMIZE_ENABLED
+        pdf_optimizer.PDF_OPTIMIZE_ENABLED = False
+        self.addCleanup(setattr, pdf_optimizer, 'PDF_OPTIMIZE_ENABLED', enabled)
+
+        self.assertIsNone(pdf_optimizer.submit_pdf_optimization("outputs/Acme/resume.pdf"))
+
+    def test_reports_the_bytes_saved_and_skips_failures(self):
+        futures = [
+            done(("resume.pdf", 120000, 90000)),
+            None,
+            done(error=ValueError("damaged PDF")),
+            done(("cover_letter.pdf", 3000, 2500)),
+        ]
+
+        self.assertEqual(pdf_optimizer.finish_pdf_optimizations(futures), 30500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from processors.profile_registry import ProfileNotFound, ProfileRegistry
+from processors.relevance_pruning import prune_adapt_data
+from processors.resume_model import thaw
+from processors.resume_processor import load_adapt_info, merge_resume_data
+
+
+def resume(name, country):
+    return {
+        'name': name,
+        'label': 'Engineer',
+        'contactInfo': {'location': {'city': 'Somewhere', 'countryCode': country}},
+        'work': [{'title': 'Engineer', 'company': 'Acme', 'startDate': '2020', 'endDate': 'present',
+                  'summary': ['Built things']}],
+        'skills': [{'category': 'Languages', 'items': ['English']}],
+    }
+
+
+class TestProfileRegistry(unittest.TestCase):
+    """Test cases for the discovery, selection and reload of resume profiles"""
+
+    def setUp(self):
+        self.inputs_dir = tempfile.mkdtemp()
+        self.write_profile("it_en", resume("Ana", "UK"))
+        self.write_profile("it_es", resume("Ana", "ES"))
+        self.write_profile("data_us", resume("Ana", "US"), {'language': 'English', 'tags': ['Data']})
+        self.registry = ProfileRegistry(self.inputs_dir, check_interval=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.inputs_dir)
+
+    def write_profile(self, folder, resume_data, metadata=None, adapt_data=None):
+        path = os.path.join(self.inputs_dir, folder)
+        os.makedirs(path, exist_ok=True)
+        files = {'resume.json': resume_data, 'adapt_info.json': adapt_data, 'profile.json': metadata}
+        for file_name, data in files.items():
+            if data is not None:
+                with open(os.path.join(path, file_name), "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+
+    def test_select_by_language_country_and_tag(self):
+        self.assertEqual(self.registry.select("Spanish").folder, "it_es")
+        self.assertEqual(self.registry.select("English", "UK").folder, "it_en")
+        self.assertEqual(self.registry.select("English", "US").folder, "data_us")
+        self.assertEqual(self.registry.select("English", tag="data").folder, "data_us")
+        # No German profile: the English default is used
+        self.assertEqual(self.registry.select("German").folder, "it_en")
+        with self.assertRaises(ProfileNotFound):
+            self.registry.select("Spanish", tag="data")
+
+    def test_job_offer_picks_the_most_similar_profile(self):
+        data = resume("Ana", "UK")
+        data['work'][0]['summary'] = ['Built Spark and Airflow pipelines', 'Trained pandas forecasting models']
+        self.write_profile("data_en", data, {'tags': ['data']})
+        offer = "Data engineer to build Airflow and Spark pipelines for our forecasting team"
+
+        ranked = self.registry.rank(offer, "English", k=2)
+        self.assertEqual(ranked[0][0].folder, "data_en")
+        self.assertGreater(ranked[0][1], ranked[1][1])
+        self.assertEqual(self.registry.resolve({'language': 'English', 'country_code': 'UK',
+                                                'job_offer': offer}).folder, "data_en")
+
+    def test_profiles_are_parsed_once_and_reloaded_on_change(self):
+        first = self.registry.get("it_en")
+        self.assertIs(self.registry.get("it_en"), first)
+
+        self.write_profile("it_en", resume("Bea", "UK"))
+        os.utime(os.path.join(self.inputs_dir, "it_en", "resume.json"), (0, 0))
+        self.assertEqual(self.registry.get("it_en").resume_data['name'], "Bea")
+
+    def test_invalid_profiles_are_skipped(self):
+        self.write_profile("broken_en", {'name': 'Ana'})
+        self.assertNotIn("broken_en", self.registry.names())
+        with self.assertRaisesRegex(ProfileNotFound, "invalid"):
+            self.registry.get("broken_en")
+
+    def test_load_adapt_info_reads_the_profile_folder(self):
+        self.write_profile("it_de", resume("Ana", "DE"), adapt_data={'work': [], 'skills': [{'category': 'X'}]})
+        self.assertEqual(load_adapt_info("it_de", self.inputs_dir)['skills'], [{'category': 'X'}])
+
+    def test_merge_does_not_modify_the_shared_profile(self):
+        base = self.registry.get("it_en").resume_data
+        adapted = {'work': [{'title': 'Changed', 'company': 'Other', 'summary': ['New']}],
+                   'skills': [{'category': 'Backend', 'items': ['Python']}]}
+
+        final = merge_resume_data(base, adapted)
+
+        self.assertEqual(final['work'][0]['title'], 'Engineer')
+        self.assertEqual(final['work'][0]['summary'], ('New',))
+        self.assertEqual(adapted['work'][0]['title'], 'Changed')
+        self.assertEqual(len(adapted['skills']), 1)
+        self.assertEqual(base['skills'][-1]['items'], ('English',))
+        self.assertIs(final['skills'][-1], base['skills'][-1])
+
+    def test_adapt_data_is_frozen_and_thawed_per_request(self):
+        adapt_data = {'work': [{'title': 'Engineer', 'company': 'Acme', 'summary': ['Built things', 'Ran things']}],
+                      'skills': [{'category': 'Backend', 'items': ['Python']}]}
+        self.write_profile("it_de", resume("Ana", "DE"), adapt_data=adapt_data)
+        shared = self.registry.get("it_de").adapt_data
+
+        with self.assertRaises(TypeError):
+            shared['work'] = []
+        copy = thaw(shared)
+        copy['work'][0]['summary'].append('Changed')
+        prune_adapt_data(copy, "Python", budget=1)
+
+        self.assertEqual(thaw(shared), adapt_data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from utils.progress import GenerationCancelled, ProgressReporter
+
+
+class TestProgressReporter(unittest.TestCase):
+    """Test cases for the progress channel between the pipeline and the GUI"""
+
+    def test_events_are_queued_in_order(self):
+        """Stages and tokens are drained in the order they were reported"""
+        progress = ProgressReporter()
+        progress.stage("🤖 Sending prompt to LLM...")
+        progress.token("Hello")
+        progress.token(" world")
+
+        self.assertEqual(progress.drain(), [('stage', "🤖 Sending prompt to LLM..."),
+                                            ('token', "Hello"), ('token', " world")])
+        self.assertEqual(progress.drain(), [])
+
+    def test_cancel_raises_and_aborts_requests(self):
+        """cancel() makes check_cancelled raise and fires the registered abort callbacks"""
+        progress = ProgressReporter()
+        aborted = []
+        progress.add_abort_callback(lambda: aborted.append("first"))
+        removed = lambda: aborted.append("removed")
+        progress.add_abort_callback(removed)
+        progress.remove_abort_callback(removed)
+        progress.check_cancelled()
+
+        progress.cancel()
+
+        self.assertTrue(progress.cancelled)
+        self.assertEqual(aborted, ["first"])
+        with self.assertRaises(GenerationCancelled):
+            progress.check_cancelled()
+
+    def test_failing_abort_callback_does_not_stop_the_others(self):
+        """An abort callback that raises is logged and the next one still runs"""
+        progress = ProgressReporter()
+        aborted = []
+        progress.add_abort_callback(lambda: 1 / 0)
+        progress.add_abort_callback(lambda: aborted.append(True))
+
+        progress.cancel()
+
+        self.assertEqual(aborted, [True])
+
+    def test_muted_reporter_forwards_only_cancellation(self):
+        """A muted view drops tokens and stages but shares cancellation and abort callbacks"""
+        progress = ProgressReporter()
+        muted = progress.muted()
+        aborted = []
+
+        muted.stage("hidden")
+        muted.token("hidden")
+        muted.add_abort_callback(lambda: aborted.append(True))
+        progress.cancel()
+
+        self.assertFalse(muted.shows_tokens)
+        self.assertIs(muted.muted(), muted)
+        self.assertEqual(progress.drain(), [])
+        self.assertTrue(muted.cancelled)
+        self.assertEqual(aborted, [True])
+        with self.assertRaises(GenerationCancelled):
+            muted.check_cancelled()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+from processors.relevance_pruning import prune_adapt_data, restore_pruned_items
+from processors.resume_model import Resume
+from processors.resume_processor import adapt_info_to_text, merge_resume_data
+from utils.token_budget import count_tokens
+
+
+ADAPT_DATA = {
+    'work': [
+        {'title': 'Engineer', 'company': 'Acme', 'summary': [
+            'Organized the office library', 'Built Django REST APIs', 'Ran the book club',
+            'Tuned PostgreSQL queries', 'Planned team offsites', 'Wrote Python billing jobs',
+            'Decorated the office', 'Hosted lunch talks',
+        ]},
+    ],
+    'skills': [
+        {'category': 'Tools', 'items': ['Photoshop', 'Python', 'Excel', 'Django', 'Figma', 'Word', 'Slack',
+                                        'Trello', 'PostgreSQL', 'Keynote']},
+    ],
+}
+
+BASE_RESUME = {
+    'name': 'Ana',
+    'label': 'Engineer',
+    'work': [{'title': 'Engineer', 'company': 'Acme', 'summary': []}],
+    'skills': [{'category': 'Languages', 'items': ['English']}],
+}
+
+OFFER = "Backend developer: Python, Django REST APIs and PostgreSQL"
+
+
+class TestRelevancePruning(unittest.TestCase):
+    """Test cases for the pruning of irrelevant bullets and skills before the adaptation"""
+
+    def test_keeps_the_relevant_items_in_order(self):
+        pruned_data, pruned = prune_adapt_data(ADAPT_DATA, OFFER)
+
+        bullets = pruned_data['work'][0]['summary']
+        self.assertEqual(len(bullets), 5)
+        self.assertEqual([bullet for bullet in ADAPT_DATA['work'][0]['summary'] if bullet in bullets], bullets)
+        for bullet in ('Built Django REST APIs', 'Tuned PostgreSQL queries', 'Wrote Python billing jobs'):
+            self.assertIn(bullet, bullets)
+        self.assertEqual(len(pruned['work'][0]['summary']), 3)
+        self.assertEqual((pruned['work'][0]['title'], pruned['work'][0]['company']), ('Engineer', 'Acme'))
+        skills = pruned_data['skills'][0]['items']
+        self.assertEqual(len(skills), 8)
+        for skill in ('Python', 'Django', 'PostgreSQL'):
+            self.assertIn(skill, skills)
+        self.assertEqual(len(ADAPT_DATA['work'][0]['summary']), 8)
+        self.assertLess(count_tokens(adapt_info_to_text(pruned_data)), count_tokens(adapt_info_to_text(ADAPT_DATA)))
+
+    def test_token_budget_keeps_a_minimum_per_group(self):
+        pruned_data, _ = prune_adapt_data(ADAPT_DATA, OFFER, budget=1)
+        self.assertEqual(pruned_data['work'][0]['summary'], ['Built Django REST APIs', 'Tuned PostgreSQL queries'])
+        self.assertEqual(len(pruned_data['skills'][0]['items']), 2)
+
+    def test_merge_restores_the_pruned_items(self):
+        pruned_data, pruned = prune_adapt_data(ADAPT_DATA, OFFER)
+
+        final = merge_resume_data(BASE_RESUME, pruned_data, pruned)
+        self.assertCountEqual(final['work'][0]['summary'], ADAPT_DATA['work'][0]['summary'])
+        self.assertCountEqual(final['skills'][0]['items'], ADAPT_DATA['skills'][0]['items'])
+        self.assertEqual(final['skills'][-1]['category'], 'Languages')
+
+    def test_bullets_go_back_to_the_job_with_the_same_title_and_company(self):
+        final = Resume.from_dict({'work': [{'title': 'Lead', 'company': 'Beta', 'summary': ['Led the team']},
+                                           {'title': 'Engineer', 'company': 'Acme', 'summary': ['Built APIs']}]})
+        pruned = {'work': [{'title': 'Engineer', 'company': 'Acme', 'summary': ['Built APIs', 'Ran the book club']}],
+                  'skills': []}
+
+        restored = restore_pruned_items(final, pruned)
+
+        self.assertEqual(restored['work'][1]['summary'], ('Built APIs', 'Ran the book club'))
+        self.assertIs(restored.work[0], final.work[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
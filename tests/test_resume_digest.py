@@ -0,0 +1,52 @@
+import unittest
+
+from processors.resume_digest import build_resume_digest, relevant_skills, top_achievements
+from processors.resume_processor import json_to_resume_text
+
+
+RESUME = {
+    'name': 'Ana Lopez',
+    'label': 'Backend Engineer',
+    'summary': 'Backend engineer with 8 years of experience. Loves APIs. Enjoys hiking.',
+    'contactInfo': {'email': 'ana@example.com', 'phone': '+34 600 000 000',
+                    'location': {'city': 'Madrid', 'countryCode': 'ES'}},
+    'profiles': [{'linkedIn': 'https://linkedin.com/in/ana', 'github': 'https://github.com/ana'}],
+    'work': [
+        {'title': 'Senior Engineer', 'company': 'Acme', 'startDate': '2021', 'endDate': 'present',
+         'summary': ['Cut Django API latency by 40%', 'Mentored 3 engineers', 'Organized team lunches',
+                     'Migrated services to Kubernetes']},
+        {'title': 'Engineer', 'company': 'Beta', 'startDate': '2016', 'endDate': '2021',
+         'summary': ['Built billing in Python', 'Wrote documentation', 'Maintained legacy PHP']},
+    ],
+    'skills': [{'category': 'Backend', 'items': ['PHP', 'Python', 'Django', 'Kubernetes']}],
+    'languages': [{'language': 'Spanish', 'fluency': 'Native'}],
+}
+
+
+class TestResumeDigest(unittest.TestCase):
+    """Test cases for the compact resume digest of the cover letter prompt"""
+
+    def test_digest_keeps_relevant_content_only(self):
+        digest = build_resume_digest(RESUME, "Python Django engineer, Kubernetes a plus")
+
+        self.assertIn("CURRENT ROLE: Senior Engineer at Acme", digest)
+        self.assertIn("• Cut Django API latency by 40%", digest)
+        self.assertNotIn("team lunches", digest)
+        self.assertNotIn("linkedin.com", digest)
+        self.assertNotIn("ana@example.com", digest)
+        self.assertIn("RELEVANT SKILLS: Python, Django, Kubernetes, PHP", digest)
+
+    def test_digest_is_shorter_than_the_resume_text(self):
+        digest = build_resume_digest(RESUME, "Python Django engineer")
+        self.assertLess(len(digest), len(json_to_resume_text(RESUME)))
+
+    def test_keywords_match_whole_words(self):
+        work = [{'summary': ['Built JavaScript dashboards', 'Ported the billing service to Java']}]
+        skills = [{'category': 'Languages', 'items': ['JavaScript', 'Java']}]
+
+        self.assertEqual(top_achievements(work, ['java']), ['Ported the billing service to Java'])
+        self.assertEqual(relevant_skills(skills, ['java']), ['Java', 'JavaScript'])
+
+
+if __name__ == '__main__':
+    unittest.main()
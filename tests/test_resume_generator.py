@@ -0,0 +1,25 @@
+import unittest
+from unittest.mock import patch
+
+from generators import resume_generator
+
+
+class TestAdaptationRun(unittest.TestCase):
+    """Test cases for the adaptation call of the resume pipeline"""
+
+    def test_connection_errors_are_not_parse_failures(self):
+        """An unreachable LLM is reported as is, without parse metrics or a validation retry"""
+        error = "Error: Could not generate response. Make sure LM Studio is running on localhost:1234"
+        with patch.object(resume_generator, 'run_llm_candidates', return_value=[error]) as run, \
+                patch.object(resume_generator, 'save_parse_result') as save_parse_result:
+            response, content, success = resume_generator._run_adaptation(
+                "prompt", "system", {'work': [], 'skills': []}, "Python developer", "ACME", "English", 500
+            )
+
+        self.assertEqual((response, content, success), (error, None, False))
+        self.assertEqual(run.call_count, 1)
+        save_parse_result.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
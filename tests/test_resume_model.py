@@ -0,0 +1,64 @@
+import dataclasses
+import unittest
+
+from generators.resume_renderer import HtmlWriter, MarkdownWriter, TextWriter, render_resume
+from processors.resume_model import Resume
+from processors.resume_processor import merge_resume_data
+
+
+RESUME = {
+    'name': 'Ana Lopez',
+    'label': 'Backend Engineer',
+    'contactInfo': {'email': 'ana@example.com', 'phone': '+34 600',
+                    'location': {'city': 'Madrid', 'countryCode': 'ES', 'region': 'Madrid'}},
+    'profiles': [{'github': 'https://github.com/ana'}],
+    'summary': 'Backend engineer.',
+    'work': [{'title': 'Engineer', 'company': 'Acme', 'startDate': '2021', 'endDate': 'present',
+              'summary': ['Built APIs'], 'highlights': ['Led the API team']}],
+    'skills': [{'category': 'Backend', 'items': ['Python']}, {'category': 'Languages', 'items': ['English']}],
+    'education': [{'studyType': 'BSc', 'course': 'Computer Science', 'institution': 'UCM',
+                   'location': {'city': 'Madrid', 'countryCode': 'ES'}}],
+    'languages': [{'language': 'Spanish', 'fluency': 'Native'}],
+}
+
+
+class TestResumeModel(unittest.TestCase):
+    """Test cases for the immutable resume model"""
+
+    def test_round_trips_the_json_shape(self):
+        resume = Resume.from_dict(RESUME)
+
+        self.assertEqual(resume.to_dict(), RESUME)
+        self.assertEqual(resume['languages'][0]['fluency'], 'Native')
+        self.assertNotIn('projects', resume)
+
+    def test_renders_like_the_dict(self):
+        writers = lambda: [TextWriter(), HtmlWriter(), MarkdownWriter()]
+        self.assertEqual(render_resume(Resume.from_dict(RESUME), writers()), render_resume(RESUME, writers()))
+
+    def test_is_immutable(self):
+        resume = Resume.from_dict(RESUME)
+
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            resume.name = 'Other'
+        with self.assertRaises(TypeError):
+            resume['name'] = 'Other'
+        self.assertFalse(hasattr(resume, '__dict__'))
+
+    def test_merge_shares_the_unchanged_sections(self):
+        base = Resume.from_dict(RESUME)
+        adapted = {'work': [{'title': 'Changed', 'summary': ['Built Python APIs']}],
+                   'skills': [{'category': 'Backend', 'items': ['Python', 'Django']}]}
+
+        final = merge_resume_data(base, adapted)
+
+        self.assertEqual(final['work'][0]['title'], 'Engineer')
+        self.assertEqual(final['work'][0]['summary'], ('Built Python APIs',))
+        self.assertIs(final.contact_info, base.contact_info)
+        self.assertIs(final.education, base.education)
+        self.assertIs(final.skills[-1], base.skills[-1])
+        self.assertEqual(base.to_dict(), RESUME)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from generators.resume_renderer import HtmlWriter, MarkdownWriter, TextWriter, render_resume
+
+
+RESUME = {
+    'name': 'Ana Lopez',
+    'label': 'Backend Engineer',
+    'contactInfo': {'email': 'ana@example.com', 'phone': '+34 600',
+                    'location': {'city': 'Madrid', 'countryCode': 'ES'}},
+    'profiles': [{'github': 'https://github.com/ana'}],
+    'summary': 'Backend engineer.',
+    'work': [
+        {'title': 'Engineer', 'company': 'Acme', 'startDate': '2021', 'endDate': 'present', 'summary': ['Built APIs']},
+        {'title': 'Engineer', 'company': 'Acme', 'startDate': '2019', 'endDate': '2021', 'summary': ['Fixed bugs']},
+    ],
+    'skills': [{'category': 'Backend', 'items': ['Python', ' ', 'Django']}],
+    'education': [{'studyType': 'BSc', 'course': 'Computer Science', 'institution': 'UCM'}],
+}
+
+
+class TestResumeRenderer(unittest.TestCase):
+    """Test cases for the single-walk text, HTML and Markdown renderer"""
+
+    def test_one_walk_feeds_every_writer(self):
+        text, fragments, markdown = render_resume(RESUME, [TextWriter(), HtmlWriter(), MarkdownWriter()])
+
+        self.assertTrue(text.startswith("Ana Lopez\nBackend Engineer\n\nContact: ana@example.com | +34 600\n"))
+        self.assertIn("\nEngineer at Acme (2021 - present)\n• Built APIs\n", text)
+        # Same title and company are merged into one entry in the HTML
+        self.assertEqual(fragments['work'].count('work-item'), 1)
+        self.assertIn('2019 - present', fragments['work'])
+        self.assertIn('<span class="keyword">Python</span> | <span class="keyword">Django</span>', fragments['skills'])
+        self.assertIn("## Work Experience\n\n### Engineer, Acme\n\n2021 - present\n\n- Built APIs\n", markdown)
+        self.assertIn("- Backend: Python, Django\n", markdown)
+        self.assertIn("- BSc, Computer Science, UCM\n", markdown)
+
+    def test_rendering_does_not_modify_the_resume(self):
+        render_resume(RESUME, [HtmlWriter()])
+        self.assertEqual(RESUME['work'][0]['summary'], ['Built APIs'])
+        self.assertEqual(RESUME['work'][0]['startDate'], '2021')
+
+
+if __name__ == '__main__':
+    unittest.main()
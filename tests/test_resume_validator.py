@@ -0,0 +1,45 @@
+import unittest
+
+from processors.resume_validator import validate_adapted_content, validate_section_piece
+from templates.schema import schema as resume_schema
+
+
+class ValidateAdaptedContentTests(unittest.TestCase):
+    def setUp(self):
+        self.content = {
+            'work': [{'title': 'Developer', 'company': 'Acme', 'startDate': '2020',
+                      'endDate': '2023', 'summary': ['Built things']}],
+            'skills': [{'category': 'Languages', 'items': ['Python']}],
+        }
+
+    def test_valid_content(self):
+        self.assertEqual(validate_adapted_content(self.content, expected_work_count=1), [])
+
+    def test_reports_paths_of_render_breaking_fields(self):
+        self.content['work'][0]['summary'].append(None)
+        self.content['work'][0]['title'] = ' '
+        del self.content['skills'][0]['category']
+
+        errors = validate_adapted_content(self.content)
+
+        self.assertEqual(errors, [
+            'work[0].title: must not be empty',
+            'work[0].summary[1]: expected string, got null',
+            'skills[0].category: missing',
+        ])
+
+    def test_dropped_jobs_are_reported(self):
+        errors = validate_adapted_content(self.content, expected_work_count=2)
+        self.assertEqual(errors, ['work: expected 2 entries, got 1'])
+
+    def test_section_piece(self):
+        self.assertEqual(validate_section_piece('skills', {'category': 'Tools', 'items': []}),
+                         ['skills.items: expected at least 1 items, got 0'])
+
+    def test_shared_schema_is_not_modified(self):
+        validate_adapted_content(self.content)
+        self.assertNotIn('minLength', resume_schema['work'][0]['title'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from processors import section_adapter
+from utils.progress import ProgressReporter
+
+ADAPT_DATA = {
+    'work': [
+        {'title': 'Engineer', 'company': 'Acme', 'startDate': '2021', 'endDate': 'present',
+         'summary': ['Built APIs']},
+        {'title': 'Developer', 'company': 'Globex', 'startDate': '2018', 'endDate': '2021',
+         'summary': ['Maintained services']},
+    ],
+    'skills': [{'category': 'Backend', 'items': ['Python']}],
+}
+
+
+class FakeLLM:
+    """Adapts every section by company or category; the Globex job is invalid on its first attempt"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = []
+
+    def __call__(self, prompt, system_message, progress=None, **kwargs):
+        with self.lock:
+            self.calls.append(prompt)
+            globex_attempts = sum('Globex' in call for call in self.calls)
+        if 'Acme' in prompt:
+            # Finishes last, so the merge order cannot come from completion order
+            time.sleep(0.05)
+            return json.dumps({'title': 'Engineer', 'company': 'Acme', 'summary': ['Built Python APIs']})
+        if 'Globex' in prompt:
+            if globex_attempts == 1:
+                return '{"title": "Developer", "company": "Globex", "summary": [null]}'
+            return json.dumps({'title': 'Developer', 'company': 'Globex', 'summary': ['Ran Python services']})
+        return json.dumps({'category': 'Backend', 'items': ['Python', 'Django']})
+
+
+class TestSectionAdapter(unittest.TestCase):
+    """Test cases for the per-section parallel adaptation"""
+
+    def test_invalid_section_is_retried_alone_and_merged_in_order(self):
+        """Only the invalid section is sent again and the pieces keep the adapt_info order"""
+        llm = FakeLLM()
+
+        with patch.object(section_adapter, 'run_llm', llm):
+            adapted, failed = section_adapter.adapt_sections(ADAPT_DATA, "Python backend developer", "English",
+                                                             progress=ProgressReporter())
+
+        self.assertEqual(failed, [])
+        self.assertEqual(len(llm.calls), 4)
+        self.assertEqual(sum('Globex' in call for call in llm.calls), 2)
+        self.assertEqual([job['company'] for job in adapted['work']], ['Acme', 'Globex'])
+        self.assertEqual(adapted['work'][1]['summary'], ['Ran Python services'])
+        self.assertEqual(adapted['skills'], [{'category': 'Backend', 'items': ['Python', 'Django']}])
+
+    def test_section_keeps_its_original_content_after_the_retries(self):
+        """A section that never validates is reported and left as it was"""
+        with patch.object(section_adapter, 'run_llm', return_value="not json at all"):
+            adapted, failed = section_adapter.adapt_sections({'skills': ADAPT_DATA['skills']},
+                                                             "Python backend developer", "English")
+
+        self.assertEqual([section.attempts for section in failed], [section_adapter.MAX_SECTION_RETRIES + 1])
+        self.assertEqual(adapted, {'work': [], 'skills': ADAPT_DATA['skills']})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+
+import db.db
+from server import GenerationService
+from utils.job_queue import JobQueue
+
+
+class TestGenerationService(unittest.TestCase):
+    """Test cases for the headless HTTP generation service"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_patch = patch.object(db.db, 'DB_PATH', os.path.join(self.tmp_dir.name, "test.db"))
+        self.db_patch.start()
+        db.db.init_db()
+
+        self.release = threading.Event()
+        self.job_queue = JobQueue(runner=self.fake_pipeline, max_pending=1, restore=False).start()
+
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(GenerationService(self.job_queue).start("127.0.0.1", 0))
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.release.set()
+        self.job_queue.shutdown()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.server.close()
+        self.loop.run_until_complete(self.server.wait_closed())
+        self.loop.close()
+        self.db_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def fake_pipeline(self, form_data, progress=None):
+        self.release.wait(5)
+        path = os.path.join(self.tmp_dir.name, f"resume_{form_data['company_name']}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(form_data['job_offer'])
+        return {'status': 'success', 'message': 'done', 'files_created': [path]}
+
+    def request(self, method, path, payload=None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(f"http://127.0.0.1:{self.port}{path}", data=data, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+    def raw_request(self, data):
+        with socket.create_connection(("127.0.0.1", self.port), timeout=5) as connection:
+            connection.sendall(data)
+            response = b""
+            while chunk := connection.recv(4096):
+                response += chunk
+        return response
+
+    def wait_for_status(self, job_id, status):
+        for _ in range(200):
+            code, body = self.request("GET", f"/generations/{job_id}")
+            if json.loads(body)['status'] == status:
+                return json.loads(body)
+            threading.Event().wait(0.01)
+        self.fail(f"Job {job_id} never reached {status}")
+
+    def test_generation_lifecycle_and_backpressure(self):
+        """Jobs are accepted, 429 is returned when the queue is full and artifacts download"""
+        status, body = self.request("POST", "/generations", {"company_name": "ACME", "job_offer": "Python"})
+        self.assertEqual(status, 202)
+        first = json.loads(body)
+        self.wait_for_status(first['id'], "running")
+
+        status, body = self.request("POST", "/generations", {"company_name": "Beta", "job_offer": "Go"})
+        self.assertEqual(status, 202)
+
+        status, _ = self.request("POST", "/generations", {"company_name": "Gamma", "job_offer": "Rust"})
+        self.assertEqual(status, 429)
+
+        self.release.set()
+        summary = self.wait_for_status(first['id'], "done")
+        self.assertEqual(summary['files'][0]['name'], "resume_ACME.txt")
+
+        status, content = self.request("GET", summary['files'][0]['url'])
+        self.assertEqual(status, 200)
+        self.assertEqual(content, b"Python")
+
+    def test_validation_and_not_found(self):
+        """Missing fields return 400 and unknown jobs or artifacts return 404"""
+        status, _ = self.request("POST", "/generations", {"company_name": "ACME"})
+        self.assertEqual(status, 400)
+        status, _ = self.request("POST", "/generations", {"company_name": "ACME", "job_offer": "Python",
+                                                           "tier": "turbo"})
+        self.assertEqual(status, 400)
+        status, _ = self.request("GET", "/generations/999")
+        self.assertEqual(status, 404)
+        status, _ = self.request("GET", "/generations/999/files/secret.txt")
+        self.assertEqual(status, 404)
+
+    def test_download_with_non_latin1_name(self):
+        """Artifacts named after any company download with an RFC 5987 filename"""
+        status, body = self.request("POST", "/generations", {"company_name": "Łódź", "job_offer": "Python"})
+        self.release.set()
+        summary = self.wait_for_status(json.loads(body)['id'], "done")
+
+        request = urllib.request.Request(f"http://127.0.0.1:{self.port}{summary['files'][0]['url']}")
+        with urllib.request.urlopen(request, timeout=5) as response:
+            self.assertEqual(response.read(), b"Python")
+            self.assertIn("filename*=UTF-8''resume_%C5%81%C3%B3d%C5%BA.txt", response.headers['Content-Disposition'])
+
+    def test_invalid_content_length(self):
+        """Non-numeric, negative and oversized Content-Length headers are rejected, not 500"""
+        for length, status in (("abc", b"400"), ("-5", b"400"), (str(10 ** 9), b"413")):
+            response = self.raw_request(f"POST /generations HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+            self.assertTrue(response.startswith(b"HTTP/1.1 " + status), response[:40])
+
+
+if __name__ == '__main__':
+    unittest.main()
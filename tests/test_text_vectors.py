@@ -0,0 +1,31 @@
+import unittest
+
+from utils.text_vectors import TfidfIndex, tokenize
+
+
+class TestTfidfIndex(unittest.TestCase):
+    """Test cases for the hashed TF-IDF index used to match job offers"""
+
+    def setUp(self):
+        self.index = TfidfIndex([
+            "Python Django REST APIs and PostgreSQL",
+            "Kubernetes Terraform AWS infrastructure and CI pipelines",
+            "Spark Airflow data pipelines and pandas",
+        ])
+
+    def test_tokenize_keeps_technology_names(self):
+        self.assertEqual(tokenize("Experience with C++, node.js and the AWS cloud"),
+                         ["c++", "node.js", "aws", "cloud"])
+
+    def test_top_ranks_the_most_similar_document_first(self):
+        ranked = self.index.top("We need a DevOps engineer for Kubernetes and Terraform on AWS", k=2)
+        self.assertEqual(ranked[0][0], 1)
+        self.assertAlmostEqual(max(self.index.scores("Kubernetes Terraform AWS infrastructure CI pipelines")),
+                               1.0, places=5)
+
+    def test_unknown_words_score_zero(self):
+        self.assertEqual(self.index.scores("Gardening and cooking"), [0.0, 0.0, 0.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
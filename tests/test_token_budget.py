@@ -0,0 +1,37 @@
+import unittest
+from unittest import mock
+
+from utils import token_budget
+
+
+@mock.patch.object(token_budget, '_get_encoding', lambda: None)
+class TokenBudgetTests(unittest.TestCase):
+    def test_heuristic_count(self):
+        self.assertEqual(token_budget.count_tokens(""), 0)
+        self.assertEqual(token_budget.count_tokens("a" * 35), 10)
+
+    def test_adaptation_budget_follows_profile_size(self):
+        self.assertEqual(token_budget.adaptation_output_budget("short"), token_budget.MIN_OUTPUT_TOKENS)
+        self.assertEqual(token_budget.adaptation_output_budget("x" * 3500),
+                         int(1000 * token_budget.ADAPTATION_OUTPUT_MARGIN) + token_budget.ADAPTATION_OUTPUT_OVERHEAD)
+        self.assertEqual(token_budget.adaptation_output_budget("x" * 100000), token_budget.DEFAULT_MAX_TOKENS)
+
+    @mock.patch.object(token_budget, 'CONTEXT_WINDOW', 1000)
+    def test_fit_prompt_trims_the_job_offer(self):
+        build = lambda offer: (f"Offer:\n{offer}", "system")
+        job_offer = "y" * 7000
+
+        prompt, _ = token_budget.fit_prompt(build, job_offer, max_tokens=500)
+
+        self.assertLess(len(prompt), len(job_offer))
+        self.assertLessEqual(token_budget.count_message_tokens("system", prompt) + 500, 1000)
+
+    @mock.patch.object(token_budget, 'CONTEXT_WINDOW', 1000)
+    def test_fit_output_budget_shrinks_max_tokens(self):
+        self.assertEqual(token_budget.fit_output_budget("", "", 500), 500)
+        prompt_tokens = token_budget.count_message_tokens("", "z" * 2100)
+        self.assertEqual(token_budget.fit_output_budget("", "z" * 2100, 2000), 1000 - prompt_tokens)
+
+
+if __name__ == '__main__':
+    unittest.main()
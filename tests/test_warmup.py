@@ -0,0 +1,62 @@
+import threading
+import time
+import unittest
+
+from utils.warmup import STATE_DONE, STATE_FAILED, Warmup
+
+
+class TestWarmup(unittest.TestCase):
+    """Test cases for the background warm-up at startup"""
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def make_warmup(self):
+        def broken():
+            raise RuntimeError("LM Studio is not running")
+
+        class FakeWarmup(Warmup):
+            STEPS = (
+                ("Templates & profiles", lambda: None),
+                ("LLM model", broken),
+                ("PDF engine", lambda: self.release.wait(5)),
+            )
+
+        return FakeWarmup()
+
+    def wait_until(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_start_does_not_wait_for_slow_steps(self):
+        """start() returns while a step is still running"""
+        warmup = self.make_warmup()
+
+        started = time.monotonic()
+        warmup.start()
+
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertFalse(warmup.finished)
+        self.release.set()
+        self.wait_until(lambda: warmup.finished)
+        self.assertTrue(warmup.finished)
+
+    def test_failures_are_recorded_without_stopping_the_other_steps(self):
+        """A failing step lands in errors and the other steps still finish"""
+        warmup = self.make_warmup()
+        self.release.set()
+
+        warmup.start()
+        self.wait_until(lambda: warmup.finished)
+
+        self.assertEqual(warmup.errors, {"LLM model": "LM Studio is not running"})
+        self.assertEqual(warmup.states, {"Templates & profiles": STATE_DONE,
+                                         "LLM model": STATE_FAILED,
+                                         "PDF engine": STATE_DONE})
+        self.assertIn("⚠️ LLM model", warmup.summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
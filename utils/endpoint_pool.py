@@ -0,0 +1,291 @@
+import threading
+import time
+import urllib.request
+
+# Consecutive failures before an endpoint is taken out of rotation
+EJECT_AFTER_FAILURES = 3
+# Seconds an ejected endpoint waits before it is probed for re-admission
+EJECT_SECONDS = 30
+PROBE_TIMEOUT = 2
+HEALTH_CHECK_INTERVAL = 15
+
+
+class NoEndpointAvailable(Exception):
+    """Raised when every endpoint of the pool failed for a request"""
+
+
+class Endpoint:
+    """
+    One OpenAI-compatible LLM server (LM Studio, llama.cpp, vLLM...)
+
+    An endpoint with a model only serves that model; without one it serves
+    whatever model the request names (LM Studio loads models on demand).
+    """
+
+    def __init__(self, host, model=None):
+        self.host = host
+        self.model = model
+        self.outstanding = 0
+        self.failures = 0
+        self.ejected_until = None
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}/v1"
+
+    @property
+    def ejected(self):
+        return self.ejected_until is not None
+
+    def serves(self, model):
+        return model is None or self.model is None or self.model == model
+
+    @property
+    def client(self):
+        """OpenAI client for this endpoint, created on first use (importing openai is slow)"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    self._client = OpenAI(base_url=self.base_url, api_key="lm-studio")
+        return self._client
+
+    def __repr__(self):
+        return f"Endpoint({self.host!r}, {self.model!r})"
+
+
+class Attempt:
+    """One run of a request on an endpoint; hedged losers are abandoned"""
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self._abandoned = threading.Event()
+        self._abort_callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def abandoned(self):
+        return self._abandoned.is_set()
+
+    def add_abort_callback(self, callback):
+        """Register a callable that closes the HTTP request if the attempt is abandoned"""
+        with self._lock:
+            self._abort_callbacks.append(callback)
+            abandoned = self.abandoned
+        if abandoned:
+            callback()
+
+    def abandon(self):
+        self._abandoned.set()
+        with self._lock:
+            callbacks = list(self._abort_callbacks)
+        for abort in callbacks:
+            try:
+                abort()
+            except Exception as e:
+                print(f"⚠️ Could not abort hedged request on {self.endpoint.host}: {e}")
+
+
+def parse_endpoints(spec):
+    """
+    Parse an endpoint list such as "localhost:1234,gpu-box:1234=qwen2.5-7b-instruct"
+
+    Returns:
+        list: Endpoint objects (model None when the entry names no model)
+    """
+    endpoints = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, model = item.partition("=")
+        endpoints.append(Endpoint(host.strip(), model.strip() or None))
+    return endpoints
+
+
+class EndpointPool:
+    """
+    Routes requests to the endpoint with the fewest outstanding requests
+
+    Endpoints that fail EJECT_AFTER_FAILURES times in a row are ejected and
+    re-admitted once a GET /v1/models probe succeeds again. With hedge_after
+    set, a request still running after that many seconds is duplicated on a
+    second endpoint and the first answer wins.
+    """
+
+    def __init__(self, endpoints, hedge_after=None, eject_after=EJECT_AFTER_FAILURES,
+                 eject_seconds=EJECT_SECONDS):
+        if not endpoints:
+            raise ValueError("The endpoint pool needs at least one endpoint")
+        self.endpoints = list(endpoints)
+        self.hedge_after = hedge_after
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self._lock = threading.Lock()
+        self._health_thread = None
+        self._stop_health = threading.Event()
+
+    def acquire(self, exclude=(), model=None):
+        """Pick the least busy available endpoint (serving model, if any does) and count the request on it"""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [endpoint for endpoint in self.endpoints if endpoint not in exclude]
+            candidates = [endpoint for endpoint in candidates if endpoint.serves(model)] or candidates
+            available = [endpoint for endpoint in candidates if not endpoint.ejected]
+            due = [endpoint for endpoint in candidates if endpoint.ejected and endpoint.ejected_until <= now]
+
+        if not available:
+            # Half-open: give ejected endpoints whose time is up a probe
+            for endpoint in due:
+                if self.probe(endpoint):
+                    available.append(endpoint)
+            if not available and candidates:
+                # Everything is down: trying the next endpoint due back beats failing outright
+                available = [min(candidates, key=lambda candidate: candidate.ejected_until)]
+            if not available:
+                return None
+
+        with self._lock:
+            endpoint = min(available, key=lambda candidate: candidate.outstanding)
+            endpoint.outstanding += 1
+        return endpoint
+
+    def release(self, endpoint, failed=False):
+        """Finish a request, ejecting the endpoint after repeated failures"""
+        with self._lock:
+            endpoint.outstanding -= 1
+            if not failed:
+                endpoint.failures = 0
+                return
+            endpoint.failures += 1
+            if endpoint.failures >= self.eject_after and not endpoint.ejected:
+                endpoint.ejected_until = time.monotonic() + self.eject_seconds
+                print(f"🚫 Ejected LLM endpoint {endpoint.host} after {endpoint.failures} failures")
+
+    def probe(self, endpoint):
+        """GET /v1/models on an endpoint; re-admit it on success, eject it on failure"""
+        try:
+            with urllib.request.urlopen(f"{endpoint.base_url}/models", timeout=PROBE_TIMEOUT) as response:
+                healthy = response.status == 200
+        except Exception:
+            healthy = False
+
+        with self._lock:
+            if healthy:
+                if endpoint.ejected:
+                    print(f"✅ Re-admitted LLM endpoint {endpoint.host}")
+                endpoint.ejected_until = None
+                endpoint.failures = 0
+            elif not endpoint.ejected:
+                endpoint.ejected_until = time.monotonic() + self.eject_seconds
+                print(f"🚫 Ejected LLM endpoint {endpoint.host}: health probe failed")
+            else:
+                endpoint.ejected_until = time.monotonic() + self.eject_seconds
+        return healthy
+
+    def probe_all(self):
+        """Probe every endpoint and return the healthy ones"""
+        return [endpoint for endpoint in self.endpoints if self.probe(endpoint)]
+
+    def start_health_checks(self, interval=HEALTH_CHECK_INTERVAL):
+        """Probe the endpoints periodically from a daemon thread"""
+        if self._health_thread is None:
+            self._health_thread = threading.Thread(target=self._health_loop, args=(interval,), daemon=True)
+            self._health_thread.start()
+        return self
+
+    def stop_health_checks(self):
+        self._stop_health.set()
+
+    def _health_loop(self, interval):
+        while not self._stop_health.wait(interval):
+            self.probe_all()
+
+    def call(self, fn, hedge=False, is_failure=None, model=None):
+        """
+        Run fn(attempt) on the pool, failing over to the other endpoints
+
+        Args:
+            fn (callable): Receives an Attempt (attempt.endpoint is the target)
+            hedge (bool): Allow a hedged duplicate when hedge_after is configured
+            is_failure (callable, optional): Decides whether an exception is the
+                endpoint's fault (counts towards ejection and triggers failover);
+                other exceptions are raised as they are
+            model (str, optional): Prefer the endpoints serving this model
+
+        Returns:
+            The result of the first successful fn call
+        """
+        is_failure = is_failure or (lambda error: True)
+        tried = []
+        last_error = None
+        while True:
+            endpoint = self.acquire(exclude=tried, model=model)
+            if endpoint is None:
+                raise NoEndpointAvailable(f"No LLM endpoint available: {last_error}")
+            tried.append(endpoint)
+            try:
+                if hedge and self.hedge_after is not None and len(self.endpoints) > 1:
+                    return self._call_hedged(fn, endpoint, tried, is_failure, model)
+                return self._call_once(fn, Attempt(endpoint), is_failure)
+            except Exception as e:
+                if not is_failure(e):
+                    raise
+                last_error = e
+                print(f"⚠️ LLM endpoint {endpoint.host} failed, trying another one: {e}")
+
+    def _call_once(self, fn, attempt, is_failure):
+        failed = False
+        try:
+            return fn(attempt)
+        except Exception as e:
+            failed = is_failure(e) and not attempt.abandoned
+            raise
+        finally:
+            self.release(attempt.endpoint, failed)
+
+    def _call_hedged(self, fn, endpoint, tried, is_failure, model):
+        """Run fn on endpoint and, if it is slow, on a second endpoint too"""
+        done = threading.Condition()
+        outcomes = []
+        attempts = []
+
+        def run(attempt):
+            try:
+                outcome = (True, self._call_once(fn, attempt, is_failure))
+            except Exception as e:
+                outcome = (False, e)
+            with done:
+                outcomes.append((attempt, outcome))
+                done.notify_all()
+
+        def start(target):
+            attempt = Attempt(target)
+            attempts.append(attempt)
+            threading.Thread(target=run, args=(attempt,), daemon=True).start()
+
+        start(endpoint)
+        with done:
+            done.wait_for(lambda: outcomes, timeout=self.hedge_after)
+            if not outcomes:
+                backup = self.acquire(exclude=tried, model=model)
+                if backup is not None:
+                    tried.append(backup)
+                    print(f"⏱️ No answer from {endpoint.host} after {self.hedge_after}s, hedging on {backup.host}")
+                    start(backup)
+
+            # First success wins; an error only counts once every attempt failed
+            seen = 0
+            while True:
+                done.wait_for(lambda: len(outcomes) > seen)
+                for attempt, (succeeded, value) in outcomes[seen:]:
+                    if succeeded:
+                        for other in attempts:
+                            if other is not attempt:
+                                other.abandon()
+                        return value
+                seen = len(outcomes)
+                if seen == len(attempts):
+                    raise outcomes[-1][1][1]
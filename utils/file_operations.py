@@ -1,6 +1,9 @@
 import os
 import json
 
+# file_path -> (modification time, content)
+_template_cache = {}
+
 
 def load_text(file_path):
     """Load text content from a file"""
@@ -8,6 +11,18 @@ def load_text(file_path):
         return f.read()
 
 
+def load_template(file_path):
+    """Load a template file, keeping it in memory until the file changes"""
+    mtime = os.path.getmtime(file_path)
+    cached = _template_cache.get(file_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    content = load_text(file_path)
+    _template_cache[file_path] = (mtime, content)
+    return content
+
+
 def load_json(file_path):
     """Load JSON data from a file"""
     with open(file_path, "r", encoding="utf-8") as f:
@@ -0,0 +1,90 @@
+import os
+import re
+import threading
+from utils.file_operations import load_json
+
+# One <code>.json catalog per language; adding a file adds the language
+I18N_DIR = os.environ.get("RESUME_I18N_DIR", "i18n")
+
+# Language of the template and prompts, and fallback of missing entries
+DEFAULT_LANGUAGE = "English"
+
+_catalogs = None
+_catalogs_lock = threading.Lock()
+# language -> (compiled pattern of the <h2> titles, replacement by title)
+_title_patterns = {}
+
+
+def _load_catalogs():
+    """Read every catalog of I18N_DIR once, keyed by language name"""
+    global _catalogs
+    if _catalogs is None:
+        with _catalogs_lock:
+            if _catalogs is None:
+                catalogs = {}
+                for file_name in sorted(os.listdir(I18N_DIR)):
+                    if file_name.endswith(".json"):
+                        catalog = load_json(os.path.join(I18N_DIR, file_name))
+                        catalogs[catalog['language']] = catalog
+                _catalogs = catalogs
+    return _catalogs
+
+
+def languages():
+    """Available languages, the default one first"""
+    names = sorted(_load_catalogs())
+    if DEFAULT_LANGUAGE in names:
+        names.remove(DEFAULT_LANGUAGE)
+        names.insert(0, DEFAULT_LANGUAGE)
+    return names
+
+
+def language_codes():
+    """Language name by short code (en, es, de)"""
+    return {catalog['code']: language for language, catalog in _load_catalogs().items() if catalog.get('code')}
+
+
+def _catalog(language):
+    catalogs = _load_catalogs()
+    return catalogs.get(language) or catalogs[DEFAULT_LANGUAGE]
+
+
+def translate(word, language, group="titles"):
+    """
+    Translation of a catalog entry
+
+    Args:
+        word (str): English entry, e.g. 'Projects' or 'Spain'
+        language (str): Target language
+        group (str): Catalog group: titles or countries
+
+    Returns:
+        str: The translation, or the word itself when the catalog has none
+    """
+    return _catalog(language).get(group, {}).get(word, word)
+
+
+def document_title(language):
+    return _catalog(language).get('document_title') or _catalog(DEFAULT_LANGUAGE)['document_title']
+
+
+def system_prompt(name, language):
+    """System prompt of a pipeline step (adaptation_system, cover_letter_system) in a language"""
+    prompt = _catalog(language).get('prompts', {}).get(name)
+    return prompt or _catalog(DEFAULT_LANGUAGE)['prompts'][name]
+
+
+def _title_pattern(language):
+    cached = _title_patterns.get(language)
+    if cached is None:
+        titles = _catalog(DEFAULT_LANGUAGE)['titles']
+        replacements = {f"<h2>{title}</h2>": f"<h2>{translate(title, language)}</h2>" for title in titles}
+        pattern = re.compile("|".join(re.escape(source) for source in replacements))
+        cached = _title_patterns[language] = (pattern, replacements)
+    return cached
+
+
+def translate_titles(html_content, language):
+    """Translate every <h2> section title of the template in one pass"""
+    pattern, replacements = _title_pattern(language)
+    return pattern.sub(lambda match: replacements[match.group(0)], html_content)
@@ -0,0 +1,217 @@
+import itertools
+import queue
+import threading
+from db.db import save_job, update_job, load_jobs
+from utils.progress import ProgressReporter
+
+# Lower values run first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+# The local LLM server handles one request at a time well, so keep the pool small
+WORKER_COUNT = 1
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+_STOP = object()
+
+
+class Job:
+    """A single generation request waiting in (or processed by) the queue"""
+
+    def __init__(self, job_id, form_data, priority):
+        self.id = job_id
+        self.form_data = form_data
+        self.priority = priority
+        self.status = STATUS_QUEUED
+        self.result = None
+        self.progress = ProgressReporter()
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATUSES
+
+
+class JobQueue:
+    """
+    Priority job queue processed by a fixed pool of worker threads
+
+    Jobs are persisted in the jobs table so that queued work survives a
+    restart of the application.
+
+    Args:
+        runner (callable): Called as runner(form_data, progress=...) and must
+            return the pipeline result dict. Defaults to the resume pipeline.
+        workers (int): Number of worker threads
+        max_pending (int): Maximum number of queued jobs, None for unbounded
+        restore (bool): Requeue the jobs left pending by a previous run
+    """
+
+    def __init__(self, runner=None, workers=WORKER_COUNT, max_pending=None, restore=True):
+        self.runner = runner
+        self.workers = workers
+        self.max_pending = max_pending
+        self._queue = queue.PriorityQueue()
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._threads = []
+        self._sequence = itertools.count()
+
+        if restore:
+            self._restore_pending_jobs()
+
+    def start(self):
+        """Start the worker threads"""
+        for index in range(self.workers - len(self._threads)):
+            thread = threading.Thread(target=self._worker, name=f"job-worker-{index}")
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def shutdown(self, wait=True):
+        """Stop the workers once they finish their current job"""
+        for _ in self._threads:
+            self._queue.put((float('inf'), next(self._sequence), _STOP))
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+    def submit(self, form_data, priority=PRIORITY_INTERACTIVE):
+        """
+        Queue a generation request
+
+        Returns:
+            Job: The queued job
+
+        Raises:
+            queue.Full: If max_pending jobs are already waiting
+        """
+        with self._lock:
+            if self.max_pending is not None and self.pending_count() >= self.max_pending:
+                raise queue.Full(f"Job queue is full ({self.max_pending} pending jobs)")
+
+            job_id = save_job(form_data, priority, STATUS_QUEUED)
+            job = Job(job_id, form_data, priority)
+            self._jobs[job_id] = job
+
+        self._queue.put((priority, next(self._sequence), job))
+        print(f"📥 Job {job_id} queued for {form_data.get('company_name', '')} (priority {priority})")
+        return job
+
+    def get(self, job_id):
+        """Return the job with the given id, or None"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        """Return all known jobs, oldest first"""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.id)
+
+    def pending_count(self):
+        """Number of jobs still waiting for a worker"""
+        return sum(1 for job in self._jobs.values() if job.status == STATUS_QUEUED)
+
+    def position(self, job):
+        """1-based position of a queued job in the processing order, 0 if not queued"""
+        if job.status != STATUS_QUEUED:
+            return 0
+        with self._lock:
+            ahead = [
+                other for other in self._jobs.values()
+                if other.status == STATUS_QUEUED and (other.priority, other.id) < (job.priority, job.id)
+            ]
+        return len(ahead) + 1
+
+    def cancel(self, job_id):
+        """Cancel a queued job, or abort a running one"""
+        result = {'status': 'cancelled', 'message': 'Job cancelled before it started'}
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+            # Under the lock, so a worker cannot start the job in between
+            queued = job.status == STATUS_QUEUED
+            if queued:
+                job.status = STATUS_CANCELLED
+                job.result = result
+
+        job.progress.cancel()
+        if queued:
+            self._persist(job, STATUS_CANCELLED, result)
+        return True
+
+    def _restore_pending_jobs(self):
+        """Requeue jobs that were queued or interrupted while running"""
+        for row in load_jobs((STATUS_QUEUED, STATUS_RUNNING)):
+            job = Job(row['id'], row['form_data'], row['priority'])
+            self._jobs[job.id] = job
+            if row['status'] == STATUS_RUNNING:
+                update_job(job.id, STATUS_QUEUED)
+            self._queue.put((job.priority, next(self._sequence), job))
+        if self._jobs:
+            print(f"♻️ Restored {len(self._jobs)} pending jobs")
+
+    def _set_status(self, job, status, result=None):
+        with self._lock:
+            job.status = status
+            if result is not None:
+                job.result = result
+        self._persist(job, status, result)
+
+    def _claim(self, job):
+        """Mark a queued job as running, unless it was cancelled meanwhile"""
+        with self._lock:
+            if job.status != STATUS_QUEUED:
+                return False
+            job.status = STATUS_RUNNING
+        self._persist(job, STATUS_RUNNING)
+        return True
+
+    def _persist(self, job, status, result=None):
+        # A locked or failing database must not stop the worker thread
+        try:
+            update_job(job.id, status, result)
+        except Exception as e:
+            print(f"⚠️ Could not save the status of job {job.id}: {e}")
+
+    def _run(self, form_data, progress):
+        runner = self.runner
+        if runner is None:
+            from generators.resume_generator import generate_resume_and_cover_letter
+            runner = generate_resume_and_cover_letter
+        return runner(form_data, progress=progress)
+
+    def _worker(self):
+        while True:
+            _, _, job = self._queue.get()
+            if job is _STOP:
+                return
+            if not self._claim(job):
+                # Cancelled while waiting
+                continue
+
+            print(f"⚙️ Job {job.id} started")
+            try:
+                result = self._run(job.form_data, job.progress)
+            except Exception as e:
+                result = {'status': 'error', 'message': f'Unexpected error: {str(e)}'}
+            if not isinstance(result, dict):
+                result = {'status': 'error', 'message': f'Unexpected result: {result!r}'}
+
+            if result.get('status') == 'success':
+                status = STATUS_DONE
+            elif result.get('status') == 'cancelled':
+                status = STATUS_CANCELLED
+            else:
+                status = STATUS_FAILED
+            self._set_status(job, status, result)
+            print(f"🏁 Job {job.id} {status}")
@@ -0,0 +1,92 @@
+import os
+
+# Pipeline stages of the LLM calls (also the stage tags of the llm_calls table)
+STAGE_ADAPTATION = "adaptation"
+STAGE_SECTION_ADAPTATION = "section_adaptation"
+STAGE_COVER_LETTER = "cover_letter"
+STAGE_OFFER_DIGEST = "offer_digest"
+STAGE_OTHER = "other"
+
+TIER_FAST = "fast"
+TIER_QUALITY = "quality"
+TIERS = (TIER_FAST, TIER_QUALITY)
+
+# Tier used when the form, batch entry or HTTP request does not choose one
+DEFAULT_TIER = os.environ.get("RESUME_TIER", TIER_QUALITY)
+
+# Adaptation candidates sampled per request when the form does not choose
+DEFAULT_CANDIDATES = int(os.environ.get("RESUME_CANDIDATES", "1"))
+MAX_CANDIDATES = 5
+
+# Model names as loaded in LM Studio
+LARGE_MODEL = os.environ.get("RESUME_LARGE_MODEL", "llama-3.2-8b-instruct")
+SMALL_MODEL = os.environ.get("RESUME_SMALL_MODEL", "llama-3.2-3b-instruct")
+
+# Model, temperature and max_tokens cap per tier and stage. max_tokens None
+# keeps the budget computed from the prompt (see utils/token_budget.py).
+ROUTES = {
+    TIER_QUALITY: {
+        STAGE_ADAPTATION: {'model': LARGE_MODEL, 'temperature': 0.3, 'max_tokens': None},
+        STAGE_SECTION_ADAPTATION: {'model': LARGE_MODEL, 'temperature': 0.3, 'max_tokens': None},
+        STAGE_COVER_LETTER: {'model': LARGE_MODEL, 'temperature': 0.3, 'max_tokens': None},
+        STAGE_OFFER_DIGEST: {'model': LARGE_MODEL, 'temperature': 0.1, 'max_tokens': None},
+        STAGE_OTHER: {'model': LARGE_MODEL, 'temperature': 0.3, 'max_tokens': None},
+    },
+    TIER_FAST: {
+        # The structured rewrite still needs the large model to stay faithful
+        STAGE_ADAPTATION: {'model': LARGE_MODEL, 'temperature': 0.2, 'max_tokens': None},
+        STAGE_SECTION_ADAPTATION: {'model': SMALL_MODEL, 'temperature': 0.2, 'max_tokens': None},
+        STAGE_COVER_LETTER: {'model': SMALL_MODEL, 'temperature': 0.4, 'max_tokens': 600},
+        STAGE_OFFER_DIGEST: {'model': SMALL_MODEL, 'temperature': 0.1, 'max_tokens': None},
+        STAGE_OTHER: {'model': SMALL_MODEL, 'temperature': 0.3, 'max_tokens': None},
+    },
+}
+
+
+def normalize_tier(tier):
+    """
+    Return a valid tier name for a form value
+
+    Raises:
+        ValueError: If the tier is not one of TIERS
+    """
+    tier = (tier or DEFAULT_TIER).strip().lower()
+    if tier not in ROUTES:
+        raise ValueError(f"Unknown tier '{tier}', expected one of: {', '.join(TIERS)}")
+    return tier
+
+
+def normalize_candidate_count(value):
+    """
+    Number of candidates for a form value, between 1 and MAX_CANDIDATES
+
+    Raises:
+        ValueError: If the value is not an integer
+    """
+    if value in (None, ""):
+        value = DEFAULT_CANDIDATES
+    return max(1, min(int(value), MAX_CANDIDATES))
+
+
+def get_route(stage, tier=None):
+    """
+    Model, temperature and max_tokens cap for an LLM call
+
+    Args:
+        stage (str): One of the STAGE_* constants
+        tier (str, optional): One of TIERS, DEFAULT_TIER when omitted
+
+    Returns:
+        dict: {'model', 'temperature', 'max_tokens'}
+    """
+    routes = ROUTES[normalize_tier(tier)]
+    return routes.get(stage, routes[STAGE_OTHER])
+
+
+def tier_models(tier=None):
+    """Distinct models used by a tier, in stage order"""
+    models = []
+    for route in ROUTES[normalize_tier(tier)].values():
+        if route['model'] not in models:
+            models.append(route['model'])
+    return models
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+# Set RESUME_PDF_CACHE=0 to print every PDF with Chromium
+PDF_CACHE_ENABLED = os.environ.get("RESUME_PDF_CACHE", "1") == "1"
+# Rendered PDFs by hash of their HTML and print options
+PDF_CACHE_DIR = os.environ.get("RESUME_PDF_CACHE_DIR", os.path.join("outputs", ".pdf_cache"))
+# Least recently used PDFs are removed above this size
+PDF_CACHE_MAX_BYTES = int(os.environ.get("RESUME_PDF_CACHE_MAX_MB", "200")) * 1024 * 1024
+
+_cache_lock = threading.Lock()
+
+
+def pdf_cache_key(html_content, options):
+    """
+    Cache key of a PDF
+
+    Args:
+        html_content (bytes): Final HTML document
+        options (dict): Print options (format, margin, print_background)
+
+    Returns:
+        str: sha256 of the HTML and the options
+    """
+    digest = hashlib.sha256(html_content)
+    digest.update(b"\0")
+    digest.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _entry_path(key, cache_dir):
+    return os.path.join(cache_dir, f"{key}.pdf")
+
+
+def link_or_copy(source, target):
+    """
+    Hard-link source to target, or copy it across file systems
+
+    The target is removed first: rendering or writing into a hard-linked
+    file would modify the other copies too.
+    """
+    if os.path.exists(target):
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def fetch_pdf(key, pdf_path, cache_dir=PDF_CACHE_DIR):
+    """
+    Put the cached PDF of a key at pdf_path
+
+    Returns:
+        bool: True on a hit, False when the PDF must be printed
+    """
+    entry = _entry_path(key, cache_dir)
+    try:
+        link_or_copy(entry, pdf_path)
+        # Modification time orders the entries for eviction
+        os.utime(entry)
+    except OSError:
+        return False
+    return True
+
+
+def store_pdf(key, pdf_path, cache_dir=PDF_CACHE_DIR, max_bytes=PDF_CACHE_MAX_BYTES):
+    """Add a printed PDF to the cache, then evict the oldest entries above max_bytes"""
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Linked under a temporary name and renamed, so readers never see a partial entry
+        temporary = os.path.join(cache_dir, f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        link_or_copy(pdf_path, temporary)
+        os.replace(temporary, _entry_path(key, cache_dir))
+        evict(cache_dir, max_bytes)
+    except OSError as e:
+        print(f"⚠️ Could not cache the PDF {pdf_path}: {e}")
+
+
+def evict(cache_dir=PDF_CACHE_DIR, max_bytes=PDF_CACHE_MAX_BYTES):
+    """
+    Remove the least recently used PDFs until the cache fits max_bytes
+
+    Returns:
+        int: Number of PDFs removed
+    """
+    with _cache_lock:
+        entries = []
+        for entry in os.scandir(cache_dir):
+            if entry.name.endswith(".pdf"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+    if removed:
+        print(f"🧹 Removed {removed} old PDFs from the cache")
+    return removed
@@ -0,0 +1,148 @@
+import hashlib
+import importlib.util
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Set RESUME_PDF_OPTIMIZE=1 to rewrite the PDFs smaller (needs pikepdf)
+PDF_OPTIMIZE_ENABLED = os.environ.get("RESUME_PDF_OPTIMIZE", "0") == "1"
+# Set RESUME_PDF_LINEARIZE=1 to also linearize them (fast web view, slightly larger)
+PDF_LINEARIZE = os.environ.get("RESUME_PDF_LINEARIZE", "0") == "1"
+PDF_OPTIMIZE_WORKERS = int(os.environ.get("RESUME_PDF_OPTIMIZE_WORKERS", "2"))
+
+# Descriptor keys of the embedded font programs (Type 1, TrueType, CFF/OpenType)
+FONT_FILE_KEYS = ('/FontFile', '/FontFile2', '/FontFile3')
+
+_pool = None
+_pool_lock = threading.Lock()
+_warned_missing = False
+
+
+def _fonts(pdf):
+    for page in pdf.pages:
+        resources = page.obj.get('/Resources')
+        fonts = resources.get('/Font') if resources is not None else None
+        if fonts is not None:
+            for _, font in fonts.items():
+                yield font
+                for descendant in font.get('/DescendantFonts', []):
+                    yield descendant
+
+
+def _deduplicate_fonts(pdf):
+    """Point every copy of an identical embedded font program to the first one"""
+    programs = {}
+    shared = 0
+    for font in _fonts(pdf):
+        descriptor = font.get('/FontDescriptor')
+        if descriptor is None:
+            continue
+        for key in FONT_FILE_KEYS:
+            program = descriptor.get(key)
+            if program is None:
+                continue
+            first = programs.setdefault(hashlib.sha256(program.read_raw_bytes()).hexdigest(), program)
+            if first.objgen != program.objgen:
+                descriptor[key] = first
+                shared += 1
+    return shared
+
+
+def optimize_pdf(pdf_path, linearize=PDF_LINEARIZE):
+    """
+    Rewrite a PDF smaller, in place
+
+    Identical embedded font programs are shared, unreferenced resources
+    dropped, streams recompressed and small objects packed into object
+    streams. Fonts are not subset here: Chromium already embeds subsets and
+    the FPDF cover letters use the non-embedded core fonts. The file is
+    only replaced when the result is smaller (or linearization is asked
+    for), through a rename, so a PDF hard-linked from the PDF cache is
+    never modified.
+
+    Args:
+        pdf_path (str): PDF to optimize
+        linearize (bool): Write a linearized (fast web view) PDF
+
+    Returns:
+        tuple: (pdf_path, bytes before, bytes after)
+    """
+    import pikepdf  # Optional dependency, only loaded in the worker processes
+
+    before = os.path.getsize(pdf_path)
+    temporary = f"{pdf_path}.{os.getpid()}.tmp"
+    try:
+        with pikepdf.open(pdf_path) as pdf:
+            _deduplicate_fonts(pdf)
+            pdf.remove_unreferenced_resources()
+            pdf.save(
+                temporary,
+                compress_streams=True,
+                recompress_flate=True,
+                object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                linearize=linearize,
+            )
+    except Exception:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    after = os.path.getsize(temporary)
+    if after < before or linearize:
+        os.replace(temporary, pdf_path)
+        return pdf_path, before, after
+    os.remove(temporary)
+    return pdf_path, before, before
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: the GUI and the server fork from threaded processes
+            _pool = ProcessPoolExecutor(max_workers=PDF_OPTIMIZE_WORKERS,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def submit_pdf_optimization(pdf_path):
+    """
+    Start optimizing a PDF in the process pool
+
+    Returns:
+        Future or None: None when the stage is disabled, pikepdf is not
+            installed or there is no PDF
+    """
+    global _warned_missing
+    if not PDF_OPTIMIZE_ENABLED or not pdf_path:
+        return None
+    if importlib.util.find_spec("pikepdf") is None:
+        if not _warned_missing:
+            print("⚠️ pikepdf is not installed, PDFs are left as printed (pip install pikepdf)")
+            _warned_missing = True
+        return None
+    return _get_pool().submit(optimize_pdf, pdf_path)
+
+
+def finish_pdf_optimizations(futures):
+    """
+    Wait for the PDFs being optimized and report the bytes saved per document
+
+    A failed optimization leaves its PDF as printed.
+
+    Returns:
+        int: Total bytes saved
+    """
+    saved = 0
+    for future in futures:
+        if future is None:
+            continue
+        try:
+            pdf_path, before, after = future.result()
+        except Exception as e:
+            print(f"⚠️ Could not optimize a PDF, keeping it as printed: {e}")
+            continue
+        saved += before - after
+        print(f"🗜️ {pdf_path}: {before} -> {after} bytes ({before - after} saved)")
+    return saved
+
@@ -0,0 +1,115 @@
+import queue
+import threading
+
+
+class GenerationCancelled(Exception):
+    """Raised inside the pipeline when the user cancels a running generation"""
+
+
+class ProgressReporter:
+    """
+    Thread-safe progress channel between the generation pipeline and the GUI
+
+    The pipeline (worker thread) pushes events, the GUI drains them from the
+    Tk main loop with root.after. Events are tuples of (kind, payload) where
+    kind is 'stage' or 'token'.
+    """
+
+    # Tokens reach the GUI, so a request must not be duplicated (hedged)
+    shows_tokens = True
+
+    def __init__(self):
+        self.events = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._abort_callbacks = []
+        self._lock = threading.Lock()
+
+    def stage(self, message):
+        """Report the pipeline stage that is starting"""
+        self.events.put(('stage', message))
+
+    def token(self, text):
+        """Report a chunk of streamed LLM output"""
+        self.events.put(('token', text))
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Request cancellation and abort the in-flight LLM request, if any"""
+        self._cancel_event.set()
+        with self._lock:
+            callbacks = list(self._abort_callbacks)
+        for abort in callbacks:
+            try:
+                abort()
+            except Exception as e:
+                print(f"⚠️ Could not abort LLM request: {e}")
+
+    def check_cancelled(self):
+        """Raise GenerationCancelled if cancellation was requested"""
+        if self._cancel_event.is_set():
+            raise GenerationCancelled("Generation cancelled by user")
+
+    def add_abort_callback(self, callback):
+        """Register a callable that closes an in-flight HTTP request"""
+        with self._lock:
+            self._abort_callbacks.append(callback)
+
+    def remove_abort_callback(self, callback):
+        """Unregister a callable once its HTTP request has finished"""
+        with self._lock:
+            if callback in self._abort_callbacks:
+                self._abort_callbacks.remove(callback)
+
+    def muted(self):
+        """Return a view of this reporter that drops tokens (for parallel LLM calls)"""
+        return _MutedProgress(self)
+
+    def drain(self, max_events=500):
+        """Return the pending events without blocking"""
+        events = []
+        while len(events) < max_events:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+
+class _MutedProgress:
+    """
+    View of a ProgressReporter for parallel LLM calls
+
+    Only cancellation is forwarded (cancelled, check_cancelled and the abort
+    callbacks); tokens and stages are dropped so that concurrent calls do not
+    interleave their output in the GUI.
+    """
+
+    shows_tokens = False
+
+    def __init__(self, reporter):
+        self._reporter = reporter
+
+    def stage(self, message):
+        pass
+
+    def token(self, text):
+        pass
+
+    @property
+    def cancelled(self):
+        return self._reporter.cancelled
+
+    def check_cancelled(self):
+        self._reporter.check_cancelled()
+
+    def add_abort_callback(self, callback):
+        self._reporter.add_abort_callback(callback)
+
+    def remove_abort_callback(self, callback):
+        self._reporter.remove_abort_callback(callback)
+
+    def muted(self):
+        return self
@@ -1,4 +1,5 @@
 from .file_operations import load_text, load_schema
+from .i18n import system_prompt
 
 
 def format_prompt(template_path, **kwargs):
@@ -13,13 +14,7 @@ def format_prompt(template_path, **kwargs):
 def create_adaptation_prompt(job_offer, adapt_text, language='English'):
     """Create the adaptation prompt for work experience and skills"""
 
-    language_prompts = {
-        'English': "You are a professional resume editor. You must respond with valid JSON only. Adapt only the work experience and skills sections to match job requirements.",
-        'Spanish': "Eres un editor profesional de currículums. Debes responder solo con JSON válido. Adapta solo las secciones de experiencia laboral y habilidades para coincidir con los requisitos del trabajo.",
-        'German': "Sie sind ein professioneller Lebenslauf-Editor. Sie müssen nur mit gültigem JSON antworten. Passen Sie nur die Abschnitte Berufserfahrung und Fähigkeiten an die Stellenanforderungen an."
-    }
-
-    system_message = language_prompts.get(language, language_prompts['English'])
+    system_message = system_prompt('adaptation_system', language)
 
     adaptation_prompt = f"""
 IMPORTANT: You must respond with valid JSON only. No explanations, no markdown, just pure JSON.
@@ -65,16 +60,132 @@ RESPOND WITH JSON ONLY - NO OTHER TEXT.
     return adaptation_prompt, system_message
 
 
+def create_adaptation_retry_prompt(adaptation_prompt, errors):
+    """Repeat an adaptation prompt with the problems found in the previous answer"""
+    error_lines = "\n".join(f"- {error}" for error in errors)
+    return f"""{adaptation_prompt}
+YOUR PREVIOUS RESPONSE WAS INVALID:
+{error_lines}
+
+Fix these problems and respond again with the complete JSON only.
+"""
+
+
+def create_job_adaptation_prompt(job_offer, job_text, language='English'):
+    """Create the adaptation prompt for a single work experience entry"""
+
+    system_message = system_prompt('adaptation_system', language)
+
+    job_prompt = f"""
+IMPORTANT: You must respond with valid JSON only. No explanations, no markdown, just pure JSON.
+
+ADAPT THIS WORK EXPERIENCE ENTRY FOR THE JOB OFFER:
+
+JOB OFFER:
+{job_offer}
+
+WORK EXPERIENCE TO ADAPT:
+{job_text}
+
+INSTRUCTIONS:
+1. Adapt the description to highlight accomplishments relevant to the job offer in 4 bullet points
+2. Keep the same title, company and dates
+3. Use keywords from the job offer when appropriate
+4. Quantify achievements where possible
+5. Respond with ONLY valid JSON in this exact structure:
+
+{{
+  "title": "Job Title",
+  "company": "Company Name",
+  "startDate": "YYYY-MM",
+  "endDate": "YYYY-MM or present",
+  "summary": ["Adapted bullet point 1", "Adapted bullet point 2", "Adapted bullet point 3", "Adapted bullet point 4"]
+}}
+
+RESPOND WITH JSON ONLY - NO OTHER TEXT.
+"""
+
+    return job_prompt, system_message
+
+
+def create_skill_adaptation_prompt(job_offer, skill_text, language='English'):
+    """Create the adaptation prompt for a single skill category"""
+
+    system_message = system_prompt('adaptation_system', language)
+
+    skill_prompt = f"""
+IMPORTANT: You must respond with valid JSON only. No explanations, no markdown, just pure JSON.
+
+ADAPT THIS SKILL CATEGORY FOR THE JOB OFFER:
+
+JOB OFFER:
+{job_offer}
+
+SKILL CATEGORY TO ADAPT:
+{skill_text}
+
+INSTRUCTIONS:
+1. Keep the category name
+2. Order the skills by relevance to the job offer and drop the irrelevant ones
+3. Use the job offer wording for skills the candidate already has
+4. Respond with ONLY valid JSON in this exact structure:
+
+{{
+  "category": "Category Name",
+  "items": ["Skill 1", "Skill 2"]
+}}
+
+RESPOND WITH JSON ONLY - NO OTHER TEXT.
+"""
+
+    return skill_prompt, system_message
+
+
+OFFER_DIGEST_SYSTEM_PROMPT = "You are a recruiter who extracts job requirements. Be concise and factual."
+
+
+def create_offer_chunk_prompt(chunk, index, total):
+    """Create the prompt that summarizes one part of a long job offer (map step)"""
+
+    chunk_prompt = f"""
+Extract the job requirements from PART {index} OF {total} of a job offer.
+
+JOB OFFER PART:
+{chunk}
+
+List, as short bullet points and in the language of the offer:
+- Role, seniority and responsibilities
+- Required and nice-to-have technical skills, tools and certifications
+- Soft skills, languages, location and working conditions
+- Company, product and domain facts worth mentioning in an application
+
+Skip benefits boilerplate, legal notices and anything not stated in the text.
+"""
+
+    return chunk_prompt, OFFER_DIGEST_SYSTEM_PROMPT
+
+
+def create_offer_digest_prompt(summaries):
+    """Create the prompt that merges the part summaries into one requirements digest (reduce step)"""
+
+    parts = "\n\n".join(f"PART {index}:\n{summary}" for index, summary in enumerate(summaries, 1))
+    digest_prompt = f"""
+Merge these requirement lists, extracted from consecutive parts of one job offer, into a single digest.
+
+{parts}
+
+Write the digest in the language of the lists, with these headings:
+ROLE, RESPONSIBILITIES, REQUIRED SKILLS, NICE TO HAVE, SOFT SKILLS AND LANGUAGES, COMPANY AND CONDITIONS.
+Remove duplicates, keep every concrete technology, number and keyword, and do not add anything new.
+"""
+
+    return digest_prompt, OFFER_DIGEST_SYSTEM_PROMPT
+
+
 def create_cover_letter_prompt(company_name, job_offer, resume_content, language='English'):
     """Create the cover letter generation prompt"""
 
-    language_prompts = {
-        'English': "You are a professional recruiter. Write a compelling cover letter.",
-        'Spanish': "Eres un reclutador profesional. Escribe una carta de presentación convincente.",
-        'German': "Sie sind ein professioneller Personalvermittler. Schreiben Sie ein überzeugendes Anschreiben."
-    }
-
-    system_message = language_prompts.get(language, language_prompts['English'])
+    system_message = system_prompt('cover_letter_system', language)
 
     cover_prompt = f"""
 Write a compelling cover letter for this job application:
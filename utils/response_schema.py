@@ -0,0 +1,48 @@
+from templates.schema import schema as resume_schema
+
+# Structure of one skill category in adapt_info.json (differs from the
+# JSON Resume "skills" entry in templates/schema.py)
+SKILL_CATEGORY_PROPERTIES = {
+    "category": {"type": "string"},
+    "items": {"type": "array", "items": {"type": "string"}},
+}
+
+
+def _object_schema(properties):
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def _response_format(name, schema):
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "strict": True, "schema": schema},
+    }
+
+
+def build_adaptation_json_schema():
+    """Build the JSON schema of the adaptation response (work + skills)"""
+    work_properties = dict(resume_schema['work'][0])
+    return _object_schema({
+        "work": {"type": "array", "items": _object_schema(work_properties)},
+        "skills": {"type": "array", "items": _object_schema(SKILL_CATEGORY_PROPERTIES)},
+    })
+
+
+def build_adaptation_response_format():
+    """OpenAI-compatible response_format constraining the adaptation output"""
+    return _response_format("resume_adaptation", build_adaptation_json_schema())
+
+
+def build_job_response_format():
+    """response_format for the adaptation of a single work entry"""
+    return _response_format("work_entry", _object_schema(dict(resume_schema['work'][0])))
+
+
+def build_skill_category_response_format():
+    """response_format for the adaptation of a single skill category"""
+    return _response_format("skill_category", _object_schema(SKILL_CATEGORY_PROPERTIES))
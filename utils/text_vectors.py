@@ -0,0 +1,118 @@
+import math
+import re
+import zlib
+from collections import Counter
+from functools import lru_cache
+
+# Size of the hashed vocabulary; collisions are rare for resume-sized texts
+DIMENSIONS = 2 ** 14
+
+# Words and technology names such as c++, c# or node.js
+WORD_PATTERN = re.compile(r"[^\W\d_][\w+#.-]*[\w+#]")
+
+# Frequent words of job offers that say nothing about the role (EN/ES/DE)
+STOPWORDS = frozenset("""
+    the and for with you our are will your from this that have has who all can its not but any
+    able more their they what when about into also work team role job company experience years
+    de la el en los las del con para por una que como sus sea ser muy más mas nuestro equipo
+    und der die das mit für von ist ein eine den dem zu auf wir sie sind oder auch bei als ihre
+    werden unser unsere
+""".split())
+
+
+def tokenize(text):
+    """Meaningful lowercased words of a text, in order"""
+    words = (word.lower() for word in WORD_PATTERN.findall(text))
+    return [word for word in words if len(word) > 2 and word not in STOPWORDS]
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """NumPy, imported on first use so that importing this module stays cheap; None when not installed"""
+    try:
+        import numpy
+    except ImportError:
+        # Pure-Python sparse vectors are used instead; fine for dozens of documents
+        return None
+    return numpy
+
+
+@lru_cache(maxsize=65536)
+def _bucket(token):
+    # crc32 rather than hash(), which is salted per process
+    return zlib.crc32(token.encode("utf-8")) % DIMENSIONS
+
+
+def _term_weights(text):
+    """Sublinear term frequencies of a text by hashed bucket"""
+    counts = Counter(_bucket(token) for token in tokenize(text))
+    return {bucket: 1.0 + math.log(count) for bucket, count in counts.items()}
+
+
+class TfidfIndex:
+    """
+    Hashed TF-IDF vectors of a fixed set of documents
+
+    Documents are L2-normalized sparse rows: only the buckets of their own
+    words are stored (as flat NumPy arrays, or dicts without NumPy), so the
+    index grows with the text and not with DIMENSIONS. Ranking a query is one
+    multiply per stored term summed per document.
+    """
+
+    def __init__(self, texts):
+        weights = [_term_weights(text) for text in texts]
+        document_frequency = Counter(bucket for terms in weights for bucket in terms)
+        total = len(texts)
+        self.idf = {bucket: math.log((1 + total) / (1 + count)) + 1.0
+                    for bucket, count in document_frequency.items()}
+        self.size = total
+
+        rows = [self._normalize({bucket: weight * self.idf[bucket] for bucket, weight in terms.items()})
+                for terms in weights]
+        self._np = np = _numpy()
+        if np is not None:
+            # Coordinate format: document, bucket and weight of every stored term
+            self._documents = np.repeat(np.arange(total), [len(vector) for vector in rows])
+            self._buckets = np.array([bucket for vector in rows for bucket in vector], dtype=np.int64)
+            self._weights = np.array([weight for vector in rows for weight in vector.values()],
+                                     dtype=np.float32)
+        else:
+            self._rows = rows
+
+    @staticmethod
+    def _normalize(vector):
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {bucket: weight / norm for bucket, weight in vector.items()} if norm else {}
+
+    def query_vector(self, text):
+        """Normalized vector of a query; words absent from every document are ignored"""
+        return self._normalize({bucket: weight * self.idf[bucket]
+                                for bucket, weight in _term_weights(text).items() if bucket in self.idf})
+
+    def scores(self, text):
+        """
+        Cosine similarity between a query and every document
+
+        Returns:
+            list: One float per document, in document order
+        """
+        vector = self.query_vector(text)
+        if not vector or not self.size:
+            return [0.0] * self.size
+        np = self._np
+        if np is not None:
+            query = np.zeros(DIMENSIONS, dtype=np.float32)
+            query[list(vector)] = list(vector.values())
+            products = self._weights * query[self._buckets]
+            return np.bincount(self._documents, weights=products, minlength=self.size).tolist()
+        return [sum(weight * row.get(bucket, 0.0) for bucket, weight in vector.items()) for row in self._rows]
+
+    def top(self, text, k=None):
+        """
+        Indices and scores of the documents most similar to a query
+
+        Returns:
+            list: (document index, score) tuples, best first
+        """
+        ranked = sorted(enumerate(self.scores(text)), key=lambda item: item[1], reverse=True)
+        return ranked if k is None else ranked[:k]
@@ -0,0 +1,121 @@
+import math
+import os
+import threading
+
+# Context window of the model loaded in LM Studio (n_ctx)
+CONTEXT_WINDOW = int(os.environ.get("RESUME_CONTEXT_WINDOW", "8192"))
+
+DEFAULT_MAX_TOKENS = 2000
+MIN_OUTPUT_TOKENS = 256
+
+# The adaptation rewrites the profile, so its output is about the size of the
+# profile text; the margin covers JSON punctuation and longer rephrasings
+ADAPTATION_OUTPUT_MARGIN = 1.3
+ADAPTATION_OUTPUT_OVERHEAD = 64
+COVER_LETTER_MAX_TOKENS = 800
+
+# Heuristic used when tiktoken is not installed (English/Spanish/German prose)
+CHARS_PER_TOKEN = 3.5
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """Load the tiktoken encoding on first use, or None when tiktoken is unavailable"""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+                    # Close to the Llama 3 tokenizer, which is also BPE-based
+                    _encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    _encoding = None
+                _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text):
+    """Estimate the number of tokens of a text"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def count_message_tokens(system_message, prompt):
+    """Estimate the prompt size of a system + user chat request"""
+    return (count_tokens(system_message) + count_tokens(prompt)
+            + 2 * MESSAGE_OVERHEAD_TOKENS)
+
+
+def trim_to_tokens(text, max_tokens):
+    """Cut a text to at most max_tokens tokens"""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+    return text[:int(max_tokens * CHARS_PER_TOKEN)]
+
+
+def adaptation_output_budget(profile_text):
+    """
+    Output budget for an adaptation call, sized from the profile being rewritten
+
+    Args:
+        profile_text (str): The adapt_info text sent in the prompt
+
+    Returns:
+        int: max_tokens for the request
+    """
+    budget = int(count_tokens(profile_text) * ADAPTATION_OUTPUT_MARGIN) + ADAPTATION_OUTPUT_OVERHEAD
+    return max(MIN_OUTPUT_TOKENS, min(budget, DEFAULT_MAX_TOKENS))
+
+
+def fit_prompt(build_prompt, job_offer, max_tokens):
+    """
+    Build a prompt, trimming the job offer when prompt and output overflow the context
+
+    Args:
+        build_prompt (callable): build_prompt(job_offer) -> (prompt, system_message)
+        job_offer (str): The job offer, the only part of the prompt that can be cut
+        max_tokens (int): Output budget of the request
+
+    Returns:
+        tuple: (prompt, system_message)
+    """
+    prompt, system_message = build_prompt(job_offer)
+    overflow = count_message_tokens(system_message, prompt) + max_tokens - CONTEXT_WINDOW
+    if overflow <= 0:
+        return prompt, system_message
+
+    keep = max(count_tokens(job_offer) - overflow, 0)
+    print(f"⚠️ Prompt exceeds the {CONTEXT_WINDOW}-token context by {overflow} tokens, "
+          f"trimming the job offer to {keep} tokens")
+    return build_prompt(trim_to_tokens(job_offer, keep))
+
+
+def fit_output_budget(system_message, prompt, max_tokens):
+    """
+    Shrink max_tokens so that the request fits the context window
+
+    Returns:
+        int: The max_tokens to send
+    """
+    available = CONTEXT_WINDOW - count_message_tokens(system_message, prompt)
+    if max_tokens <= available:
+        return max_tokens
+    if available < MIN_OUTPUT_TOKENS:
+        print(f"⚠️ Prompt leaves only {max(available, 0)} of {CONTEXT_WINDOW} context tokens "
+              f"for the answer; the response will probably be truncated")
+        return max(available, 1)
+    print(f"⚠️ Reducing max_tokens from {max_tokens} to {available} to fit the context window")
+    return available
@@ -0,0 +1,114 @@
+import os
+import threading
+
+# Set RESUME_WARMUP=1 (or pass --warmup to main.py) to warm up at startup
+WARMUP_ENV_VAR = "RESUME_WARMUP"
+
+STATE_PENDING = "pending"
+STATE_RUNNING = "running"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+
+STATE_ICONS = {
+    STATE_PENDING: "⏳",
+    STATE_RUNNING: "🔄",
+    STATE_DONE: "✅",
+    STATE_FAILED: "⚠️",
+}
+
+_warmup = None
+
+
+def warmup_enabled():
+    """Return True when the warm-up was enabled through the environment"""
+    return os.environ.get(WARMUP_ENV_VAR, "").lower() in ("1", "true", "yes")
+
+
+def _preload_files():
+    """Load the HTML template into memory and read the resume profiles"""
+    from generators.html_generator import RESUME_TEMPLATE_PATH
+    from processors.profile_registry import get_registry
+    from utils.file_operations import load_template
+
+    load_template(RESUME_TEMPLATE_PATH)
+    get_registry().refresh(force=True)
+
+
+def _warm_up_model():
+    from local_llm_client import warm_up_model
+    warm_up_model()
+
+
+def _warm_up_pdf_renderer():
+    from generators.html_generator import RESUME_TEMPLATE_PATH
+    from generators.html_pdf_generator import warm_up_renderer
+    from utils.file_operations import load_template
+
+    # Printing the real template also loads the fonts it uses
+    warm_up_renderer(load_template(RESUME_TEMPLATE_PATH))
+
+
+class Warmup:
+    """
+    Background warm-up of the slow first-use resources
+
+    Each step runs in its own daemon thread so that a slow model load does
+    not delay the PDF engine, and failures never block the application.
+    """
+
+    STEPS = (
+        ("Templates & profiles", _preload_files),
+        ("LLM model", _warm_up_model),
+        ("PDF engine", _warm_up_pdf_renderer),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.states = {name: STATE_PENDING for name, _ in self.STEPS}
+        self.errors = {}
+
+    def start(self):
+        for name, step in self.STEPS:
+            thread = threading.Thread(target=self._run_step, args=(name, step), name=f"warmup-{name}")
+            thread.daemon = True
+            thread.start()
+        return self
+
+    @property
+    def finished(self):
+        with self._lock:
+            return all(state in (STATE_DONE, STATE_FAILED) for state in self.states.values())
+
+    def summary(self):
+        """One-line status of every step, for the GUI"""
+        with self._lock:
+            return " | ".join(f"{STATE_ICONS[state]} {name}" for name, state in self.states.items())
+
+    def _set_state(self, name, state, error=None):
+        with self._lock:
+            self.states[name] = state
+            if error is not None:
+                self.errors[name] = error
+
+    def _run_step(self, name, step):
+        self._set_state(name, STATE_RUNNING)
+        try:
+            step()
+            self._set_state(name, STATE_DONE)
+            print(f"🔥 Warm-up done: {name}")
+        except Exception as e:
+            self._set_state(name, STATE_FAILED, str(e))
+            print(f"⚠️ Warm-up failed for {name}: {e}")
+
+
+def start_warmup():
+    """Start the background warm-up once and return it"""
+    global _warmup
+    if _warmup is None:
+        _warmup = Warmup().start()
+    return _warmup
+
+
+def get_warmup():
+    """Return the running warm-up, or None if it was not enabled"""
+    return _warmup
@@ -1,16 +1,25 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 from tkinter import messagebox
-import threading
+from tkinter import filedialog
 import os
-from generators.resume_generator import generate_resume_and_cover_letter  # , test_llm_json
+import threading
+from batch_runner import load_batch_file
+from utils.job_queue import JobQueue, PRIORITY_INTERACTIVE, PRIORITY_BATCH
+from utils.i18n import languages
+from utils.model_routing import DEFAULT_CANDIDATES, DEFAULT_TIER, MAX_CANDIDATES, TIERS
+from utils.warmup import get_warmup
+
+
+# Profile choice that lets the registry pick from language and country
+AUTO_PROFILE = "Auto"
 
 
 class ResumeGeneratorGUI:
-    def __init__(self, root):
+    def __init__(self, root, job_queue=None):
         self.root = root
         self.root.title("Resume Generator")
-        self.root.geometry("900x700")
+        self.root.geometry("900x850")
         self.root.resizable(True, True)
 
         # Variables to store form data
@@ -18,6 +27,14 @@ class ResumeGeneratorGUI:
         self.language_choice = tk.StringVar(value="English")
         self.country_code = tk.StringVar(value="UK")
         self.city = tk.StringVar(value="London")
+        self.parallel_sections = tk.BooleanVar(value=False)
+        self.compare_cover_letters = tk.BooleanVar(value=False)
+        self.tier = tk.StringVar(value=DEFAULT_TIER)
+        self.candidates = tk.IntVar(value=DEFAULT_CANDIDATES)
+        self.profile = tk.StringVar(value=AUTO_PROFILE)
+
+        # Generations run one by one (interactive first) in the job queue workers
+        self.job_queue = job_queue or JobQueue().start()
 
         self.create_widgets()
 
@@ -104,16 +121,75 @@ class ResumeGeneratorGUI:
         language_frame = ttk.Frame(main_frame)
         language_frame.grid(row=4, column=1, sticky=tk.W, pady=(0, 15))
 
-        languages = ["English", "Spanish", "German"]
-        for lang in languages:
+        languages_row = ttk.Frame(language_frame)
+        languages_row.pack(side=tk.TOP, anchor=tk.W)
+
+        for lang in languages():
             ttk.Radiobutton(
-                language_frame,
+                languages_row,
                 text=lang,
                 variable=self.language_choice,
                 value=lang,
                 command=self.on_language_change
             ).pack(side=tk.LEFT, padx=(0, 20))
 
+        ttk.Checkbutton(
+            languages_row,
+            text="Adapt sections in parallel",
+            variable=self.parallel_sections
+        ).pack(side=tk.LEFT, padx=(20, 0))
+
+        # Generation options
+        options_row = ttk.Frame(language_frame)
+        options_row.pack(side=tk.TOP, anchor=tk.W, pady=(8, 0))
+
+        ttk.Label(options_row, text="Tier:").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Combobox(
+            options_row,
+            textvariable=self.tier,
+            values=TIERS,
+            state="readonly",
+            width=8
+        ).pack(side=tk.LEFT)
+
+        ttk.Label(options_row, text="Candidates:").pack(side=tk.LEFT, padx=(20, 5))
+        ttk.Spinbox(
+            options_row,
+            from_=1,
+            to=MAX_CANDIDATES,
+            textvariable=self.candidates,
+            state="readonly",
+            width=3
+        ).pack(side=tk.LEFT)
+
+        ttk.Checkbutton(
+            options_row,
+            text="Compare cover letters",
+            variable=self.compare_cover_letters
+        ).pack(side=tk.LEFT, padx=(20, 0))
+
+        ttk.Label(options_row, text="Profile:").pack(side=tk.LEFT, padx=(20, 5))
+        self.profile_combobox = ttk.Combobox(
+            options_row,
+            textvariable=self.profile,
+            values=[AUTO_PROFILE],
+            state="readonly",
+            width=14,
+            postcommand=self.refresh_profiles
+        )
+        self.profile_combobox.pack(side=tk.LEFT)
+
+        self.match_button = ttk.Button(
+            options_row,
+            text="Match offer",
+            command=self.suggest_profiles
+        )
+        self.match_button.pack(side=tk.LEFT, padx=(5, 0))
+
+        # Best profiles for the job offer, with their similarity scores
+        self.profile_matches_label = ttk.Label(language_frame, text="", font=("Arial", 9), foreground="gray")
+        self.profile_matches_label.pack(side=tk.TOP, anchor=tk.W, pady=(5, 0))
+
         # Job Offer Input (Large text area)
         ttk.Label(main_frame, text="Job Offer Description:", font=("Arial", 12)).grid(
             row=5, column=0, sticky=(tk.W, tk.N), pady=(0, 5)
@@ -154,6 +230,107 @@ class ResumeGeneratorGUI:
             command=self.root.quit
         ).pack(side=tk.LEFT)
 
+        self.create_queue_panel(main_frame)
+
+        # Warm-up status (only when the warm-up was enabled at startup)
+        self.warmup_label = ttk.Label(main_frame, text="", font=("Arial", 9), foreground="gray")
+        self.warmup_label.grid(row=9, column=0, columnspan=2, sticky=tk.W, pady=(10, 0))
+        self.refresh_warmup_status()
+
+    def refresh_warmup_status(self):
+        """Show the warm-up progress until every step has finished"""
+        warmup = get_warmup()
+        if warmup is None:
+            return
+
+        self.warmup_label.config(text=f"Warm-up: {warmup.summary()}")
+        if not warmup.finished:
+            self.root.after(500, self.refresh_warmup_status)
+
+    def run_in_background(self, work, on_done):
+        """
+        Run work() in a worker thread and pass its outcome to on_done on the Tk thread
+
+        The thread is polled with root.after, like the job progress, so the
+        window stays responsive while profiles are reloaded or ranked.
+
+        Args:
+            work (callable): Called without arguments in the worker thread
+            on_done (callable): Called as on_done(result, error) on the Tk thread
+        """
+        outcome = {}
+
+        def target():
+            try:
+                outcome['result'] = work()
+            except Exception as e:
+                outcome['error'] = e
+
+        thread = threading.Thread(target=target, name="gui-worker", daemon=True)
+        thread.start()
+
+        def poll():
+            if thread.is_alive():
+                self.root.after(50, poll)
+            else:
+                on_done(outcome.get('result'), outcome.get('error'))
+
+        self.root.after(50, poll)
+
+    def refresh_profiles(self):
+        """Reload the profiles of inputs/ in the background when the profile list opens"""
+        def work():
+            # Imported here so that opening the window does not load the pipeline
+            from processors.profile_registry import get_registry
+            return get_registry().names()
+
+        def on_done(names, error):
+            if error is not None:
+                print(f"⚠️ Could not list the resume profiles: {error}")
+            elif self.profile_combobox.winfo_exists():
+                self.profile_combobox.config(values=[AUTO_PROFILE] + names)
+
+        self.run_in_background(work, on_done)
+
+    def suggest_profiles(self):
+        """Rank the profiles of the selected language against the job offer and select the best"""
+        job_offer = self.job_offer_text.get("1.0", tk.END).strip()
+        if not job_offer:
+            messagebox.showwarning("Missing Information", "Please enter a job offer description.")
+            return
+
+        language = self.language_choice.get()
+
+        def work():
+            from processors.profile_registry import TOP_PROFILES, get_registry
+            registry = get_registry()
+            return registry.rank(job_offer, language, k=TOP_PROFILES), registry.names()
+
+        def on_done(result, error):
+            self.match_button.config(state=tk.NORMAL)
+            if error is not None:
+                self.profile_matches_label.config(text=f"Could not rank the profiles: {error}")
+                return
+            matches, names = result
+            if not matches:
+                self.profile_matches_label.config(text="No resume profile found in inputs/")
+                return
+
+            self.profile_combobox.config(values=[AUTO_PROFILE] + names)
+            self.profile.set(matches[0][0].folder)
+            self.profile_matches_label.config(
+                text="Best profiles: " + " | ".join(f"{profile.folder} ({score:.2f})" for profile, score in matches)
+            )
+
+        self.match_button.config(state=tk.DISABLED)
+        self.profile_matches_label.config(text="Ranking profiles...")
+        self.run_in_background(work, on_done)
+
+    def selected_profile(self):
+        """Profile folder chosen in the form, empty for automatic selection"""
+        profile = self.profile.get()
+        return "" if profile == AUTO_PROFILE else profile
+
     def on_language_change(self):
         """Handle language selection change"""
         selected_lang = self.language_choice.get()
@@ -182,49 +359,173 @@ class ResumeGeneratorGUI:
             "job_offer": job_offer,
             "language": language,
             "city": city,
-            "country_code": country_code
+            "country_code": country_code,
+            "adaptation_mode": self.adaptation_mode(),
+            "tier": self.tier.get(),
+            "candidates": self.candidates.get(),
+            "cover_letter_compare": self.compare_cover_letters.get(),
+            "profile": self.selected_profile()
         }
 
-        # Show progress message
+        # Queue the job; its progress channel feeds the progress window
+        job = self.job_queue.submit(form_data, priority=PRIORITY_INTERACTIVE)
+
+        # Show progress window
         progress_window = tk.Toplevel(self.root)
-        progress_window.title("Generating Documents...")
-        progress_window.geometry("400x100")
+        progress_window.title(f"Generating Documents... (job {job.id})")
+        progress_window.geometry("600x400")
         progress_window.transient(self.root)
-        progress_window.grab_set()
+        progress_window.protocol("WM_DELETE_WINDOW", lambda: self.cancel_generation(job, stage_label))
 
-        progress_label = ttk.Label(progress_window, text="Generating resume and cover letter...\nThis may take a few moments.")
-        progress_label.pack(expand=True)
+        stage_label = ttk.Label(progress_window, text="Generating resume and cover letter...\nThis may take a few moments.")
+        stage_label.pack(fill=tk.X, padx=20, pady=(10, 0))
 
         progress_bar = ttk.Progressbar(progress_window, mode='indeterminate')
         progress_bar.pack(fill=tk.X, padx=20, pady=10)
         progress_bar.start()
 
-        def generate_in_background():
-            """Run the generation in a separate thread"""
-            try:
-                result = generate_resume_and_cover_letter(form_data)
+        # Live view of the tokens streamed by the LLM
+        token_text = scrolledtext.ScrolledText(
+            progress_window,
+            height=12,
+            font=("Consolas", 9),
+            wrap=tk.WORD,
+            state=tk.DISABLED
+        )
+        token_text.pack(fill=tk.BOTH, expand=True, padx=20)
 
-                # Update UI in main thread
-                self.root.after(0, lambda: self.handle_generation_result(result, progress_window))
+        ttk.Button(
+            progress_window,
+            text="Cancel",
+            command=lambda: self.cancel_generation(job, stage_label)
+        ).pack(pady=10)
 
-            except Exception as e:
-                error_result = {
-                    'status': 'error',
-                    'message': f'Unexpected error: {str(e)}'
-                }
-                self.root.after(0, lambda: self.handle_generation_result(error_result, progress_window))
-
-        # Start generation in background thread
-        thread = threading.Thread(target=generate_in_background)
-        thread.daemon = True
-        thread.start()
+        self.poll_progress(job, progress_window, stage_label, token_text)
+
+    def poll_progress(self, job, progress_window, stage_label, token_text):
+        """Drain pipeline events into the progress window until the job finishes"""
+        if not progress_window.winfo_exists():
+            return
+
+        progress = job.progress
+        position = self.job_queue.position(job)
+        if position and not progress.cancelled:
+            stage_label.config(text=f"⏳ Waiting in queue (position {position})...")
+
+        tokens = []
+        for kind, payload in progress.drain():
+            if kind == 'stage':
+                if not progress.cancelled:
+                    stage_label.config(text=payload)
+                # Separate the output of consecutive LLM calls
+                if token_text.index('end-1c') != '1.0':
+                    tokens.append("\n\n")
+            elif kind == 'token':
+                tokens.append(payload)
+
+        if tokens:
+            token_text.config(state=tk.NORMAL)
+            token_text.insert(tk.END, "".join(tokens))
+            token_text.see(tk.END)
+            token_text.config(state=tk.DISABLED)
+
+        if job.finished:
+            self.handle_generation_result(job.result, progress_window)
+            return
+
+        self.root.after(100, lambda: self.poll_progress(job, progress_window, stage_label, token_text))
+
+    def cancel_generation(self, job, stage_label):
+        """Abort the in-flight LLM request and skip the remaining stages"""
+        if job.progress.cancelled:
+            return
+        stage_label.config(text="🛑 Cancelling... waiting for the current stage to stop.")
+        self.job_queue.cancel(job.id)
+
+    def load_batch(self):
+        """Queue every request of a batch file as background jobs"""
+        path = filedialog.askopenfilename(
+            title="Select batch file",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+
+        try:
+            requests = load_batch_file(path, self.tier.get())
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not load batch file: {e}")
+            return
+
+        for form_data in requests:
+            self.job_queue.submit(form_data, priority=PRIORITY_BATCH)
+        messagebox.showinfo("Batch queued", f"{len(requests)} jobs added to the queue.")
+
+    def create_queue_panel(self, parent):
+        """Create the panel listing queued, running and finished jobs"""
+        queue_frame = ttk.LabelFrame(parent, text="Job Queue", padding="10")
+        queue_frame.grid(row=8, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(15, 0))
+        queue_frame.columnconfigure(0, weight=1)
+
+        columns = ("id", "company", "language", "priority", "status")
+        self.queue_tree = ttk.Treeview(queue_frame, columns=columns, show="headings", height=5)
+        for column, width in zip(columns, (50, 300, 100, 100, 100)):
+            self.queue_tree.heading(column, text=column.capitalize())
+            self.queue_tree.column(column, width=width, anchor=tk.W)
+        self.queue_tree.grid(row=0, column=0, sticky=(tk.W, tk.E))
+
+        queue_buttons = ttk.Frame(queue_frame)
+        queue_buttons.grid(row=0, column=1, sticky=tk.N, padx=(10, 0))
+
+        ttk.Button(
+            queue_buttons,
+            text="Cancel Job",
+            command=self.cancel_selected_job
+        ).pack(fill=tk.X, pady=(0, 5))
+
+        ttk.Button(
+            queue_buttons,
+            text="Load Batch...",
+            command=self.load_batch
+        ).pack(fill=tk.X)
+
+        self.refresh_queue_panel()
+
+    def refresh_queue_panel(self):
+        """Refresh the job list every second"""
+        priority_names = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BATCH: "batch"}
+        selection = self.queue_tree.selection()
+        self.queue_tree.delete(*self.queue_tree.get_children())
+
+        for job in self.job_queue.jobs():
+            self.queue_tree.insert("", tk.END, iid=str(job.id), values=(
+                job.id,
+                job.form_data.get('company_name', ''),
+                job.form_data.get('language', ''),
+                priority_names.get(job.priority, job.priority),
+                job.status
+            ))
+
+        existing = [iid for iid in selection if self.queue_tree.exists(iid)]
+        if existing:
+            self.queue_tree.selection_set(existing)
+
+        self.root.after(1000, self.refresh_queue_panel)
+
+    def cancel_selected_job(self):
+        """Cancel the job selected in the queue panel"""
+        for iid in self.queue_tree.selection():
+            self.job_queue.cancel(int(iid))
 
     def handle_generation_result(self, result, progress_window):
         """Handle the result of resume generation"""
         # Close progress window
         progress_window.destroy()
 
-        if result['status'] == 'success':
+        if result['status'] == 'cancelled':
+            messagebox.showinfo("Cancelled", result['message'])
+
+        elif result['status'] == 'success':
             # Show success message with file paths
             files_list = "\n".join([f"• {os.path.basename(f)}" for f in result.get('files_created', [])])
 
@@ -283,6 +584,8 @@ class ResumeGeneratorGUI:
         self.language_choice.set("English")
         self.city.set("")
         self.country_code.set("")
+        self.profile.set(AUTO_PROFILE)
+        self.profile_matches_label.config(text="")
 
     def get_form_data(self):
         """Get current form data as a dictionary"""
@@ -291,9 +594,18 @@ class ResumeGeneratorGUI:
             "job_offer": self.job_offer_text.get("1.0", tk.END).strip(),
             "language": self.language_choice.get(),
             "city": self.city.get().strip(),
-            "country_code": self.country_code.get().strip()
+            "country_code": self.country_code.get().strip(),
+            "adaptation_mode": self.adaptation_mode(),
+            "tier": self.tier.get(),
+            "candidates": self.candidates.get(),
+            "cover_letter_compare": self.compare_cover_letters.get(),
+            "profile": self.selected_profile()
         }
 
+    def adaptation_mode(self):
+        """Adaptation mode selected in the form"""
+        return "sections" if self.parallel_sections.get() else "single"
+
 
 def main():
     """Main function to run the GUI application"""